@@ -105,6 +105,25 @@ DATABASES = {
     }
 }
 
+# Cache
+# The jobs taxonomy version and readiness results live here. Use a backend
+# shared by all workers (e.g. django.core.cache.backends.redis.RedisCache or
+# memcached) in production so taxonomy edits reach every process.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Readiness scoring
+# 'decimal' (default) scores with exact Decimal arithmetic. 'float' is
+# faster and matches Decimal to 2 decimal places; benchmark it with
+# `python manage.py benchmark_scoring`.
+
+READINESS_NUMERIC_MODE = os.getenv('READINESS_NUMERIC_MODE', 'decimal')
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -1,12 +1,18 @@
 ﻿from django.core.management.base import BaseCommand
 
 from jobs.models import JobRole, JobPillarWeight, Pillar
+from jobs.taxonomy import deferred_invalidation
 
 
 class Command(BaseCommand):
     help = "Seed default pillars, job roles, and weights"
 
     def handle(self, *args, **options):
+        # Rebuild the shared taxonomy snapshot once, not once per saved row
+        with deferred_invalidation():
+            self.seed()
+
+    def seed(self):
         pillars = [
             ("Technical", "Technical depth and engineering skills"),
             ("Cognitive", "Problem-solving and analytical thinking"),
@@ -3,12 +3,18 @@ Django management command to seed pillars, sub-pillars, and job-pillar weighting
 """
 from django.core.management.base import BaseCommand
 from jobs.models import JobRole, Pillar, Skill, JobPillarWeight
+from jobs.taxonomy import deferred_invalidation
 
 
 class Command(BaseCommand):
     help = 'Seed pillars, sub-pillars, and job-pillar weightings for IRI System'
 
     def handle(self, *args, **options):
+        # Rebuild the shared taxonomy snapshot once, not once per saved row
+        with deferred_invalidation():
+            self.seed()
+
+    def seed(self):
         self.stdout.write(self.style.HTTP_INFO('Starting pillar seeding...'))
 
         # Define 4 Core Pillars
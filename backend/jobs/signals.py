@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import Pillar, SubPillar, Skill, JobRole, JobPillarWeight, JobSubPillarWeight
+from .taxonomy import invalidate_on_commit
+
+
+TAXONOMY_MODELS = (Pillar, SubPillar, Skill, JobRole, JobPillarWeight, JobSubPillarWeight)
+
+
+def invalidate_taxonomy(sender, **kwargs):
+    invalidate_on_commit()
+
+
+for model in TAXONOMY_MODELS:
+    post_save.connect(invalidate_taxonomy, sender=model, dispatch_uid=f'taxonomy_save_{model.__name__}')
+    post_delete.connect(invalidate_taxonomy, sender=model, dispatch_uid=f'taxonomy_delete_{model.__name__}')
@@ -0,0 +1,192 @@
+"""
+Process-wide, versioned snapshot of the jobs taxonomy.
+
+Pillars, sub-pillars, job roles, job weights and the skill -> sub-pillar
+mapping are reference data that almost never change, yet every readiness
+calculation needs all of them. The snapshot loads them once per process and
+is shared by the calculation engine, the jobs viewsets and the seed commands.
+
+Invalidation: post_save/post_delete on any jobs model (see jobs/signals.py)
+bumps a version number stored in the Django cache. Each process compares its
+snapshot's version against the cached one and rebuilds when they differ, so
+an admin edit reaches every worker that shares the cache backend.
+"""
+
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Pillar, SubPillar, Skill, JobRole, JobPillarWeight, JobSubPillarWeight
+
+
+VERSION_KEY = 'jobs_taxonomy_version'
+
+_lock = threading.Lock()
+_snapshot = None
+_deferred = threading.local()
+
+
+def _freeze(mapping):
+    return MappingProxyType({key: MappingProxyType(dict(value)) for key, value in mapping.items()})
+
+
+def _fingerprint(values):
+    """
+    Content hash of everything that affects scoring.
+
+    Unlike `version`, it is identical in every process that sees the same
+    data, so it can be persisted next to computed scores.
+    """
+    parts = [
+        [(sp.id, sp.pillar_id, sp.name, str(sp.weight)) for sp in values['sub_pillars']],
+        [pillar.id for pillar in values['pillars']],
+        [job.id for job in values['active_job_roles']],
+        sorted(
+            (job_id, pillar_id, str(weight))
+            for job_id, weights in values['job_pillar_weights'].items()
+            for pillar_id, weight in weights.items()
+        ),
+        sorted(
+            (job_id, sub_pillar_id, str(weight))
+            for job_id, weights in values['job_sub_pillar_weights'].items()
+            for sub_pillar_id, weight in weights.items()
+        ),
+        sorted(values['skill_sub_pillar'].items()),
+    ]
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+class TaxonomySnapshot:
+    """
+    Immutable view of the jobs taxonomy at one version.
+
+    Collections are tuples and read-only mappings; the model instances they
+    hold must be treated as read-only.
+    """
+
+    __slots__ = (
+        'version', 'fingerprint', 'pillars', 'sub_pillars', 'sub_pillars_by_pillar', 'sub_pillar_by_name',
+        'skills', 'skill_sub_pillar', 'job_roles', 'active_job_roles',
+        'job_pillar_weights', 'job_sub_pillar_weights',
+    )
+
+    def __init__(self, version):
+        object.__setattr__(self, 'version', version)
+
+        pillars = tuple(Pillar.objects.order_by('id'))
+        sub_pillars = tuple(SubPillar.objects.select_related('pillar').order_by('id'))
+        skills = tuple(Skill.objects.select_related('pillar').order_by('id'))
+        job_roles = tuple(JobRole.objects.order_by('id'))
+
+        by_pillar = defaultdict(list)
+        for sub_pillar in sub_pillars:
+            by_pillar[sub_pillar.pillar_id].append(sub_pillar)
+
+        pillar_weights = defaultdict(dict)
+        for weight in JobPillarWeight.objects.all():
+            pillar_weights[weight.job_role_id][weight.pillar_id] = weight.weight_percent
+
+        sub_pillar_weights = defaultdict(dict)
+        for weight in JobSubPillarWeight.objects.all():
+            sub_pillar_weights[weight.job_role_id][weight.sub_pillar_id] = weight.weight_percent
+
+        values = {
+            'pillars': pillars,
+            'sub_pillars': sub_pillars,
+            'sub_pillars_by_pillar': MappingProxyType(
+                {pillar_id: tuple(group) for pillar_id, group in by_pillar.items()}
+            ),
+            'sub_pillar_by_name': MappingProxyType({sp.name: sp for sp in sub_pillars}),
+            'skills': skills,
+            'skill_sub_pillar': MappingProxyType(
+                {skill.id: skill.sub_pillar_id for skill in skills if skill.sub_pillar_id}
+            ),
+            'job_roles': job_roles,
+            'active_job_roles': tuple(job for job in job_roles if job.is_active),
+            'job_pillar_weights': _freeze(pillar_weights),
+            'job_sub_pillar_weights': _freeze(sub_pillar_weights),
+        }
+        values['fingerprint'] = _fingerprint(values)
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('TaxonomySnapshot is immutable')
+
+    def pillar_weights_for(self, job_role_id):
+        """Pillar weights (weight_percent) of a job role, keyed by pillar id."""
+        return self.job_pillar_weights.get(job_role_id, MappingProxyType({}))
+
+    def sub_pillar_weights_for(self, job_role_id):
+        """Job-specific sub-pillar weights of a job role, keyed by sub-pillar id."""
+        return self.job_sub_pillar_weights.get(job_role_id, MappingProxyType({}))
+
+
+def current_version():
+    """Shared taxonomy version, initialising it if the cache has none."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # A time-based seed can't collide with a version an existing process holds
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_taxonomy():
+    """Return the taxonomy snapshot, rebuilding it if the version moved."""
+    global _snapshot
+    version = current_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = TaxonomySnapshot(version)
+        return _snapshot
+
+
+def bump_version():
+    """Invalidate the snapshot in this process and every process sharing the cache."""
+    global _snapshot
+    if getattr(_deferred, 'depth', 0):
+        _deferred.pending = True
+        return
+
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+    _snapshot = None
+
+
+def invalidate_on_commit():
+    """
+    Drop this process's snapshot now and bump the shared version once the
+    current transaction commits, so other workers never rebuild from
+    uncommitted rows.
+    """
+    global _snapshot
+    _snapshot = None
+    transaction.on_commit(bump_version)
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    Collapse the version bumps of a bulk edit (e.g. a seed command) into one.
+    """
+    _deferred.depth = getattr(_deferred, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _deferred.depth -= 1
+        if not _deferred.depth and getattr(_deferred, 'pending', False):
+            _deferred.pending = False
+            bump_version()
@@ -1,21 +1,41 @@
 ﻿from rest_framework import viewsets, permissions
+from rest_framework.response import Response
 from .models import JobRole, Pillar, Skill
 from .serializers import JobRoleSerializer, PillarSerializer, SkillSerializer
+from .taxonomy import get_taxonomy
 
 
-class JobRoleViewSet(viewsets.ReadOnlyModelViewSet):
+class TaxonomySnapshotListMixin:
+    """Serve list requests from the in-process taxonomy snapshot instead of the database."""
+    snapshot_attr = None
+
+    def list(self, request, *args, **kwargs):
+        records = getattr(get_taxonomy(), self.snapshot_attr)
+        page = self.paginate_queryset(records)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(records, many=True)
+        return Response(serializer.data)
+
+
+class JobRoleViewSet(TaxonomySnapshotListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = JobRole.objects.filter(is_active=True)
     serializer_class = JobRoleSerializer
     permission_classes = [permissions.AllowAny]
+    snapshot_attr = 'active_job_roles'
 
 
-class PillarViewSet(viewsets.ReadOnlyModelViewSet):
+class PillarViewSet(TaxonomySnapshotListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Pillar.objects.all()
     serializer_class = PillarSerializer
     permission_classes = [permissions.AllowAny]
+    snapshot_attr = 'pillars'
 
 
-class SkillViewSet(viewsets.ReadOnlyModelViewSet):
+class SkillViewSet(TaxonomySnapshotListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [permissions.AllowAny]
+    snapshot_attr = 'skills'
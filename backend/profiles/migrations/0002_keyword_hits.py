@@ -0,0 +1,31 @@
+# Generated by Django 4.2.28 on 2026-10-17 06:54
+
+from django.db import migrations, models
+
+# Schema only: existing items start with empty hits. Index them afterwards with
+# `python manage.py reindex_keywords`, which uses the live keyword tables.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certification',
+            name='keyword_hits',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='keyword_hits',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='keyword_hits',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_keyword_hits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='revision',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_profile_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certification',
+            name='verification_score',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='verification_score',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='verification_score',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=5),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 from jobs.models import Skill
+from readiness.keywords import index_item
 
 
 class StudentProfile(models.Model):
@@ -16,10 +17,22 @@ class StudentProfile(models.Model):
     summary = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped by every change to scored content (see profiles/signals.py)
+    revision = models.PositiveBigIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.full_name or self.user.username
 
+    def save(self, *args, **kwargs):
+        # revision only moves through bump_revision(); never write back a
+        # stale in-memory copy of it
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'revision'
+            ]
+        super().save(*args, **kwargs)
+
 
 class Education(models.Model):
     class Level(models.TextChoices):
@@ -60,10 +73,19 @@ class Project(models.Model):
     live_link = models.URLField(blank=True)
     github_link = models.URLField(blank=True)
     skills = models.ManyToManyField(Skill, blank=True, related_name="project_entries")
+    # {sub_pillar_id: keyword matches}, computed on save (see readiness.keywords)
+    keyword_hits = models.JSONField(default=dict, blank=True, editable=False)
+    # Blended confidence of the item's approved verifications (0-100),
+    # kept up to date by the verification views
+    verification_score = models.DecimalField(max_digits=5, decimal_places=2, default=0, editable=False)
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.keyword_hits = index_item(self)
+        super().save(*args, **kwargs)
+
 
 class Experience(models.Model):
     profile = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="experiences")
@@ -76,10 +98,19 @@ class Experience(models.Model):
     referral_name = models.CharField(max_length=200, blank=True)
     referral_email = models.EmailField(blank=True)
     skills = models.ManyToManyField(Skill, blank=True, related_name="experience_entries")
+    # {sub_pillar_id: keyword matches}, computed on save (see readiness.keywords)
+    keyword_hits = models.JSONField(default=dict, blank=True, editable=False)
+    # Blended confidence of the item's approved verifications (0-100),
+    # kept up to date by the verification views
+    verification_score = models.DecimalField(max_digits=5, decimal_places=2, default=0, editable=False)
 
     def __str__(self):
         return f"{self.role_title} at {self.company}"
 
+    def save(self, *args, **kwargs):
+        self.keyword_hits = index_item(self)
+        super().save(*args, **kwargs)
+
 
 class Certification(models.Model):
     profile = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="certifications")
@@ -88,10 +119,19 @@ class Certification(models.Model):
     issue_date = models.DateField(null=True, blank=True)
     expiry_date = models.DateField(null=True, blank=True)
     credential_url = models.URLField(blank=True)
+    # {sub_pillar_id: keyword matches}, computed on save (see readiness.keywords)
+    keyword_hits = models.JSONField(default=dict, blank=True, editable=False)
+    # Blended confidence of the item's approved verifications (0-100),
+    # kept up to date by the verification views
+    verification_score = models.DecimalField(max_digits=5, decimal_places=2, default=0, editable=False)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.keyword_hits = index_item(self)
+        super().save(*args, **kwargs)
+
 
 class Volunteering(models.Model):
     profile = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="volunteering")
@@ -10,6 +10,7 @@ from .models import (
     Volunteering,
     ProfileSkill,
 )
+from .services import SECTION_NAMES
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -27,6 +28,7 @@ class ProfileSkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProfileSkill
         fields = ['id', 'skill', 'skill_id', 'source', 'proficiency', 'verification_score', 'is_primary']
+        read_only_fields = ['verification_score']
 
 
 class EducationSerializer(serializers.ModelSerializer):
@@ -54,8 +56,9 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'organization', 'start_date', 'end_date', 'contribution',
             'description', 'technologies', 'tools', 'referral_name', 'referral_email',
-            'live_link', 'github_link', 'skills', 'skill_ids'
+            'live_link', 'github_link', 'skills', 'skill_ids', 'verification_score'
         ]
+        read_only_fields = ['verification_score']
 
 
 class ExperienceSerializer(serializers.ModelSerializer):
@@ -68,14 +71,16 @@ class ExperienceSerializer(serializers.ModelSerializer):
         model = Experience
         fields = [
             'id', 'role_title', 'company', 'start_date', 'end_date', 'is_current',
-            'description', 'referral_name', 'referral_email', 'skills', 'skill_ids'
+            'description', 'referral_name', 'referral_email', 'skills', 'skill_ids', 'verification_score'
         ]
+        read_only_fields = ['verification_score']
 
 
 class CertificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Certification
-        fields = ['id', 'name', 'issuer', 'issue_date', 'expiry_date', 'credential_url']
+        fields = ['id', 'name', 'issuer', 'issue_date', 'expiry_date', 'credential_url', 'verification_score']
+        read_only_fields = ['verification_score']
 
 
 class VolunteeringSerializer(serializers.ModelSerializer):
@@ -98,5 +103,24 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'user', 'full_name', 'date_of_birth', 'location', 'headline', 'summary',
             'educations', 'projects', 'experiences', 'certifications', 'volunteering', 'profile_skills',
-            'created_at', 'updated_at'
+            'revision', 'created_at', 'updated_at'
         ]
+        read_only_fields = ['revision']
+
+
+class ProfileSyncSerializer(serializers.Serializer):
+    """Sections a client edited, as create-profile items, with the hashes its copy was based on."""
+    base_hashes = serializers.DictField(child=serializers.CharField())
+    sections = serializers.DictField(child=serializers.ListField(child=serializers.DictField()))
+
+    def validate_sections(self, value):
+        unknown = sorted(set(value) - set(SECTION_NAMES))
+        if unknown:
+            raise serializers.ValidationError(f'Unknown sections: {unknown}')
+        return value
+
+    def validate(self, attrs):
+        missing = sorted(set(attrs['sections']) - set(attrs['base_hashes']))
+        if missing:
+            raise serializers.ValidationError({'base_hashes': f'Missing hashes for: {missing}'})
+        return attrs
@@ -0,0 +1,368 @@
+"""
+Diff-based write path for the create-profile and sync payloads.
+
+Each section of the payload is matched against the profile's existing rows,
+first by "id" and then by a natural key, so an unchanged resave touches
+nothing and rows keep their primary keys (VerificationRequest points at
+them through a generic FK). Changes are applied with one delete, one
+bulk_update and one bulk_create per section, and skill names are resolved
+with one query plus one bulk insert.
+
+bulk_create and bulk_update skip Model.save() and signals, so keyword hits
+are indexed here and the profile revision is bumped explicitly.
+
+Each section also has a content hash (section_hashes()), cached under the
+profile revision. The sync endpoint compares the hash of every section the
+client sends against it and leaves equal sections untouched. The hash a
+client's copy of a section was based on is also its concurrency token: a
+write conflicts only when that section itself changed, not when a
+verification or another section moved the profile revision. Payload values
+are converted to their model field types first (normalize_values()), so a
+proficiency of "3" matches a stored 3 in both the hash and the row diff.
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from jobs.models import Skill
+from jobs.taxonomy import get_taxonomy, invalidate_on_commit
+from readiness.keywords import index_item
+
+from .models import StudentProfile, Education, Experience, Project, Certification, ProfileSkill
+from .signals import bump_revision, deferred_revision_bumps
+
+
+def parse_date(date_string):
+    """Convert various date formats to date object"""
+    if not date_string:
+        return None
+    try:
+        # Try YYYY-MM format (month picker)
+        if len(date_string) == 7 and '-' in date_string:
+            return datetime.strptime(date_string + '-01', '%Y-%m-%d').date()
+        # Try YYYY-MM-DD format
+        return datetime.strptime(date_string, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return None
+
+
+def education_values(data):
+    return {
+        'institution': data.get('institution', ''),
+        'level': data.get('level', 'other'),
+        'field_of_study': data.get('field_of_study', ''),
+        'start_date': parse_date(data.get('start_date')),
+        'end_date': parse_date(data.get('end_date')),
+        'is_current': data.get('currently_studying', False),
+        'grade': data.get('grade_gpa', ''),
+        'description': data.get('description', ''),
+    }
+
+
+def experience_values(data):
+    return {
+        'role_title': data.get('job_title', ''),
+        'company': data.get('company', ''),
+        'start_date': parse_date(data.get('start_date')),
+        'end_date': parse_date(data.get('end_date')),
+        'is_current': data.get('currently_working', False),
+        'description': data.get('description', ''),
+        'referral_name': data.get('referral_name', ''),
+        'referral_email': data.get('referral_email', ''),
+    }
+
+
+def project_values(data):
+    return {
+        'title': data.get('title', ''),
+        'description': data.get('description', ''),
+        'technologies': data.get('technologies', ''),
+        'github_link': data.get('github_link', ''),
+        'live_link': data.get('live_url', ''),
+        'contribution': data.get('your_contribution', ''),
+        'start_date': parse_date(data.get('start_date')),
+        'end_date': parse_date(data.get('end_date')),
+    }
+
+
+def certification_values(data):
+    return {
+        'name': data.get('name', ''),
+        'issuer': data.get('issuer', ''),
+        'issue_date': parse_date(data.get('issue_date')),
+        'expiry_date': parse_date(data.get('expiry_date')),
+        'credential_url': data.get('credential_url', ''),
+    }
+
+
+# payload key: (model, related name, payload -> field values, natural key fields)
+SECTIONS = {
+    'educations': (Education, 'educations', education_values, ('institution', 'level', 'field_of_study')),
+    'experiences': (Experience, 'experiences', experience_values, ('role_title', 'company', 'start_date')),
+    'projects': (Project, 'projects', project_values, ('title',)),
+    'certifications': (Certification, 'certifications', certification_values, ('name', 'issuer')),
+}
+
+SKILLS_SECTION = 'skills'
+SECTION_NAMES = (*SECTIONS, SKILLS_SECTION)
+
+# Models whose keyword_hits Model.save() would recompute
+INDEXED_MODELS = (Experience, Project, Certification)
+
+SECTION_HASH_TIMEOUT = 60 * 60 * 24
+
+PROFICIENCY_FIELD = ProfileSkill._meta.get_field('proficiency')
+
+
+class SectionConflict(Exception):
+    """Sections changed since the copy the client edited."""
+
+    def __init__(self, profile, sections):
+        super().__init__(f'Sections changed since your copy: {", ".join(sections)}')
+        self.profile = profile
+        self.sections = sections
+
+
+def normalize_value(field, value):
+    """A payload value as the field stores it; values the field rejects are kept as sent."""
+    if value is None and not field.null:
+        return field.get_default()
+    try:
+        return field.to_python(value)
+    except ValidationError:
+        return value
+
+
+def normalize_values(model, values):
+    """normalize_value() of every {field name: value}."""
+    return {name: normalize_value(model._meta.get_field(name), value) for name, value in values.items()}
+
+
+def taxonomy_sub_pillar_ids():
+    return {name: sub_pillar.id for name, sub_pillar in get_taxonomy().sub_pillar_by_name.items()}
+
+
+def sync_section(profile, section, items, sub_pillar_ids):
+    """
+    Make one section of a profile match the payload items.
+
+    Returns:
+        True if any row was created, updated or deleted
+    """
+    model, related_name, to_values, natural_key = SECTIONS[section]
+    existing = list(getattr(profile, related_name).order_by('id'))
+    by_id = {row.id: row for row in existing}
+    by_key = defaultdict(list)
+    for row in existing:
+        by_key[tuple(getattr(row, field) for field in natural_key)].append(row)
+
+    matched = set()
+    created, updated, update_fields = [], [], set()
+    for item in items:
+        values = normalize_values(model, to_values(item))
+        row = by_id.get(item.get('id'))
+        if row is None or row.id in matched:
+            candidates = [
+                r for r in by_key[tuple(values[field] for field in natural_key)] if r.id not in matched
+            ]
+            row = candidates[0] if candidates else None
+
+        if row is None:
+            row = model(profile=profile, **values)
+            if model in INDEXED_MODELS:
+                row.keyword_hits = index_item(row, sub_pillar_ids)
+            created.append(row)
+            continue
+
+        matched.add(row.id)
+        changed = [field for field, value in values.items() if getattr(row, field) != value]
+        if changed:
+            for field in changed:
+                setattr(row, field, values[field])
+            if model in INDEXED_MODELS:
+                row.keyword_hits = index_item(row, sub_pillar_ids)
+                changed.append('keyword_hits')
+            update_fields.update(changed)
+            updated.append(row)
+
+    stale = [row.id for row in existing if row.id not in matched]
+    if stale:
+        model.objects.filter(id__in=stale).delete()
+    if updated:
+        model.objects.bulk_update(updated, sorted(update_fields))
+    if created:
+        model.objects.bulk_create(created)
+    return bool(stale or updated or created)
+
+
+def resolve_skills(names):
+    """
+    {name: Skill} for the given names, creating the missing skills with
+    one bulk insert.
+    """
+    names = set(names)
+    skills = {skill.name: skill for skill in Skill.objects.filter(name__in=names)}
+    missing = names - skills.keys()
+    if missing:
+        # Another request may create the same names concurrently
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        skills.update({skill.name: skill for skill in Skill.objects.filter(name__in=missing)})
+        # bulk_create does not send the signals that invalidate the taxonomy
+        invalidate_on_commit()
+    return skills
+
+
+def skill_proficiencies(items):
+    """{skill name: proficiency} of payload skill items; the last duplicate wins."""
+    proficiencies = {}
+    for item in items:
+        name = item.get('name', '').strip()
+        if name:
+            proficiencies[name] = normalize_value(PROFICIENCY_FIELD, item.get('proficiency', 3))
+    return proficiencies
+
+
+def sync_skills(profile, items):
+    """
+    Make the profile's skills match the payload items ({name, proficiency}).
+
+    Returns:
+        True if any ProfileSkill was created, updated or deleted
+    """
+    proficiencies = skill_proficiencies(items)
+    skills = resolve_skills(proficiencies)
+
+    existing = {row.skill_id: row for row in profile.profile_skills.all()}
+    wanted = {}
+    for name, proficiency in proficiencies.items():
+        wanted[skills[name].id] = proficiency
+
+    created, updated = [], []
+    for skill_id, proficiency in wanted.items():
+        row = existing.get(skill_id)
+        if row is None:
+            created.append(ProfileSkill(
+                profile=profile, skill_id=skill_id, proficiency=proficiency, source=ProfileSkill.Source.MANUAL
+            ))
+        elif row.proficiency != proficiency:
+            row.proficiency = proficiency
+            updated.append(row)
+
+    stale = [row.id for skill_id, row in existing.items() if skill_id not in wanted]
+    if stale:
+        ProfileSkill.objects.filter(id__in=stale).delete()
+    if updated:
+        ProfileSkill.objects.bulk_update(updated, ['proficiency'])
+    if created:
+        ProfileSkill.objects.bulk_create(created)
+    return bool(stale or updated or created)
+
+
+def sync_profile_sections(profile, data):
+    """
+    Apply the sections of a create-profile payload to a profile.
+
+    Sections missing from the payload are treated as empty, like the
+    full replace this replaces. Must run inside a transaction.
+
+    Returns:
+        True if any scored or revisioned row changed
+    """
+    return bool(apply_sections(profile, {name: data.get(name, []) for name in SECTION_NAMES}))
+
+
+def apply_sections(profile, sections):
+    """
+    Sync the given {section name: payload items} and bump the profile
+    revision once if anything changed.
+
+    Returns:
+        Names of the sections that changed
+    """
+    ids = taxonomy_sub_pillar_ids()
+    changed = []
+    with deferred_revision_bumps():
+        for name, items in sections.items():
+            if name == SKILLS_SECTION:
+                section_changed = sync_skills(profile, items)
+            else:
+                section_changed = sync_section(profile, name, items, ids)
+            if section_changed:
+                changed.append(name)
+        if changed:
+            bump_revision(profile.id)
+    return changed
+
+
+def content_hash(values):
+    """Hex digest of a section's field values in canonical JSON."""
+    payload = json.dumps(values, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def incoming_section_hash(name, items):
+    """content_hash of a section as the payload would store it."""
+    if name == SKILLS_SECTION:
+        return content_hash(sorted(skill_proficiencies(items).items()))
+    model, _, to_values, _ = SECTIONS[name]
+    return content_hash([normalize_values(model, to_values(item)) for item in items])
+
+
+def stored_section_hash(profile, name):
+    if name == SKILLS_SECTION:
+        rows = profile.profile_skills.values_list('skill__name', 'proficiency')
+        return content_hash(sorted(rows))
+    _, related_name, to_values, _ = SECTIONS[name]
+    fields = list(to_values({}))
+    rows = getattr(profile, related_name).order_by('id').values(*fields)
+    return content_hash([{field: row[field] for field in fields} for row in rows])
+
+
+def section_hashes(profile):
+    """{section name: content hash} of a profile, cached under its revision."""
+    key = f'profiles:section_hashes:{profile.pk}:{profile.revision}'
+    hashes = cache.get(key)
+    if hashes is None:
+        hashes = {name: stored_section_hash(profile, name) for name in SECTION_NAMES}
+        cache.set(key, hashes, SECTION_HASH_TIMEOUT)
+    return hashes
+
+
+def sync_sections(profile_id, base_hashes, sections):
+    """
+    Apply the sections a client edited, skipping every section whose
+    content hash is unchanged.
+
+    Args:
+        profile_id: StudentProfile id
+        base_hashes: {section name: hash} of the client's copy of every
+            edited section, as returned by section_hashes()
+        sections: {section name: payload items}, only the edited sections
+
+    Returns:
+        (profile with its new revision, names of the sections that changed)
+
+    Raises:
+        SectionConflict: an edited section changed since `base_hashes`
+    """
+    with transaction.atomic():
+        # Locking the profile serializes concurrent syncs of the same profile
+        profile = StudentProfile.objects.select_for_update().get(pk=profile_id)
+        hashes = section_hashes(profile)
+        edited = {
+            name: items for name, items in sections.items()
+            if incoming_section_hash(name, items) != hashes[name]
+        }
+        stale = [name for name in edited if base_hashes[name] != hashes[name]]
+        if stale:
+            raise SectionConflict(profile, stale)
+        changed = apply_sections(profile, edited) if edited else []
+    if changed:
+        profile.refresh_from_db(fields=['revision'])
+    return profile, changed
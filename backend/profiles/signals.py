@@ -0,0 +1,50 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+
+from .models import StudentProfile, Education, Experience, Project, Certification, ProfileSkill
+
+
+REVISIONED_MODELS = (Education, Experience, Project, Certification, ProfileSkill)
+
+_deferred = threading.local()
+
+
+def bump_revision(profile_id):
+    """Advance a profile's revision so caches keyed on it miss."""
+    pending = getattr(_deferred, 'profile_ids', None)
+    if pending is not None:
+        pending.add(profile_id)
+        return
+    StudentProfile.objects.filter(pk=profile_id).update(revision=F('revision') + 1)
+
+
+@contextmanager
+def deferred_revision_bumps():
+    """
+    Collapse the revision bumps of a bulk edit into one per profile, issued
+    when the block exits without an error.
+    """
+    if getattr(_deferred, 'profile_ids', None) is not None:
+        yield
+        return
+
+    _deferred.profile_ids = set()
+    try:
+        yield
+        profile_ids = _deferred.profile_ids
+    finally:
+        _deferred.profile_ids = None
+    if profile_ids:
+        StudentProfile.objects.filter(pk__in=profile_ids).update(revision=F('revision') + 1)
+
+
+def bump_profile_revision(sender, instance, **kwargs):
+    bump_revision(instance.profile_id)
+
+
+for model in REVISIONED_MODELS:
+    post_save.connect(bump_profile_revision, sender=model, dispatch_uid=f'revision_save_{model.__name__}')
+    post_delete.connect(bump_profile_revision, sender=model, dispatch_uid=f'revision_delete_{model.__name__}')
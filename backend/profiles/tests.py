@@ -1,3 +1,167 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import Client, TestCase
 
-# Create your tests here.
+from jobs.taxonomy import get_taxonomy
+from readiness import tests as readiness_tests
+from verification.models import VerificationRequest
+from .models import StudentProfile, Project, ProfileSkill
+from .signals import bump_revision
+
+
+def profile_payload():
+    """A create-profile payload with one item in every section."""
+    return {
+        'basic_info': {'full_name': 'Sam Student', 'headline': 'Backend developer'},
+        'educations': [{
+            'institution': 'City University', 'level': 'bachelor', 'field_of_study': 'Computer Science',
+            'start_date': '2019-09', 'end_date': '2023-06',
+        }],
+        'experiences': [{
+            'job_title': 'Python developer', 'company': 'Acme Labs', 'start_date': '2023-07',
+            'currently_working': True, 'description': 'Built django services on aws',
+        }],
+        'projects': [{
+            'title': 'Booking app', 'description': 'A react and django app', 'technologies': 'python, django',
+            'github_link': 'https://github.com/example/booking', 'start_date': '2022-01-15',
+        }],
+        'certifications': [{'name': 'AWS Cloud Practitioner', 'issuer': 'AWS', 'issue_date': '2023-03'}],
+        'skills': [{'name': 'Python', 'proficiency': 4}, {'name': 'Django', 'proficiency': 3}],
+    }
+
+
+class ProfileSyncTests(TestCase):
+    """The sync endpoint only writes edited sections of an up-to-date copy."""
+
+    @classmethod
+    def setUpTestData(cls):
+        readiness_tests.seed_taxonomy()
+        cls.user = User.objects.create_user('synced', password='x')
+
+    def setUp(self):
+        # Hashes are cached under profile id and revision, which tests reuse
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.client.post('/api/profiles/create-profile/', profile_payload(), content_type='application/json')
+        self.profile = StudentProfile.objects.get(user=self.user)
+
+    def hashes(self):
+        return self.client.get('/api/profiles/sync/').json()['sections']
+
+    def sync(self, sections, base_hashes=None):
+        base_hashes = self.hashes() if base_hashes is None else base_hashes
+        return self.client.post(
+            '/api/profiles/sync/', {'base_hashes': base_hashes, 'sections': sections},
+            content_type='application/json',
+        )
+
+    def test_only_the_sync_endpoint_exposes_section_hashes(self):
+        self.assertEqual(sorted(self.hashes()), ['certifications', 'educations', 'experiences', 'projects', 'skills'])
+        self.assertNotIn('section_hashes', self.client.get('/api/profiles/me/').json())
+
+    def test_reading_hashes_does_not_create_a_profile(self):
+        client = Client()
+        client.force_login(User.objects.create_user('reader', password='x'))
+
+        self.assertEqual(client.get('/api/profiles/sync/').status_code, 404)
+        self.assertFalse(StudentProfile.objects.filter(user__username='reader').exists())
+
+    def test_an_edited_section_that_changed_conflicts_and_writes_nothing(self):
+        base_hashes = self.hashes()
+        # Another client's edit of the same section
+        ProfileSkill.objects.filter(profile=self.profile, skill__name='Django').update(proficiency=5)
+        bump_revision(self.profile.id)
+
+        response = self.sync({'skills': [{'name': 'Rust', 'proficiency': 5}]}, base_hashes=base_hashes)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['conflicts'], ['skills'])
+        self.assertEqual(response.json()['sections'], self.hashes())
+        self.assertEqual(
+            sorted(self.profile.profile_skills.values_list('skill__name', flat=True)), ['Django', 'Python']
+        )
+
+    def test_a_verification_does_not_conflict(self):
+        base_hashes = self.hashes()
+        project = self.profile.projects.first()
+        VerificationRequest.objects.create(
+            profile=self.profile, content_type=ContentType.objects.get_for_model(project), object_id=project.id,
+            method='referral',
+        )
+        self.assertGreater(StudentProfile.objects.get(pk=self.profile.pk).revision, self.profile.revision)
+
+        response = self.sync({'skills': [{'name': 'Rust', 'proficiency': 5}]}, base_hashes=base_hashes)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['changed_sections'], ['skills'])
+
+    def test_unchanged_sections_are_skipped(self):
+        project_ids = list(Project.objects.filter(profile=self.profile).values_list('id', flat=True))
+        payload = profile_payload()
+        payload['skills'].append({'name': 'Docker', 'proficiency': 2})
+
+        response = self.sync({'projects': payload['projects'], 'skills': payload['skills']})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['changed_sections'], ['skills'])
+        self.assertEqual(response.json()['revision'], self.profile.revision + 1)
+        self.assertEqual(list(Project.objects.filter(profile=self.profile).values_list('id', flat=True)), project_ids)
+
+    def test_values_are_compared_as_stored(self):
+        payload = profile_payload()
+        payload['skills'] = [{'name': 'Python', 'proficiency': '4'}, {'name': 'Django', 'proficiency': '3'}]
+        payload['experiences'][0]['currently_working'] = 1
+        payload['certifications'][0]['credential_url'] = None
+
+        response = self.sync({name: payload[name] for name in ('skills', 'experiences', 'certifications')})
+
+        self.assertEqual(response.json()['changed_sections'], [])
+        self.assertEqual(response.json()['revision'], self.profile.revision)
+
+        # The create-profile diff compares the same converted values
+        self.client.post('/api/profiles/create-profile/', payload, content_type='application/json')
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.revision, response.json()['revision'])
+
+
+class CreateProfileResaveTests(TestCase):
+    """Posting the same create-profile payload again changes nothing."""
+
+    @classmethod
+    def setUpTestData(cls):
+        readiness_tests.seed_taxonomy()
+        cls.user = User.objects.create_user('resaved', password='x')
+
+    def snapshot(self, profile):
+        return {
+            'revision': StudentProfile.objects.get(pk=profile.pk).revision,
+            'rows': {
+                related_name: sorted(getattr(profile, related_name).values_list('id', flat=True))
+                for related_name in ('educations', 'experiences', 'projects', 'certifications', 'profile_skills')
+            },
+            'verified': sorted(VerificationRequest.objects.values_list('content_type_id', 'object_id')),
+        }
+
+    def test_unchanged_resave_keeps_rows_and_revision(self):
+        client = Client()
+        client.force_login(self.user)
+        client.post('/api/profiles/create-profile/', profile_payload(), content_type='application/json')
+        profile = StudentProfile.objects.get(user=self.user)
+        for item in (profile.profile_skills.first(), profile.projects.first(), profile.experiences.first()):
+            VerificationRequest.objects.create(
+                profile=profile, content_type=ContentType.objects.get_for_model(item), object_id=item.id,
+                method='self',
+            )
+        before = self.snapshot(profile)
+        # Loaded once per taxonomy version, not per request
+        get_taxonomy()
+
+        # Session and user, savepoint and release, the profile, one read per
+        # section and one skill name lookup; no writes
+        with self.assertNumQueries(11):
+            response = client.post('/api/profiles/create-profile/', profile_payload(), content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.snapshot(profile), before)
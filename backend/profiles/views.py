@@ -2,8 +2,7 @@
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import transaction
-from jobs.models import Skill
-from datetime import datetime
+from readiness.services import request_recompute
 
 from .models import (
     StudentProfile,
@@ -14,6 +13,13 @@ from .models import (
     Volunteering,
     ProfileSkill,
 )
+from .services import (
+    SectionConflict,
+    parse_date,
+    section_hashes,
+    sync_profile_sections,
+    sync_sections,
+)
 from .serializers import (
     StudentProfileSerializer,
     EducationSerializer,
@@ -22,21 +28,26 @@ from .serializers import (
     CertificationSerializer,
     VolunteeringSerializer,
     ProfileSkillSerializer,
+    ProfileSyncSerializer,
 )
 
 
-def parse_date(date_string):
-    """Convert various date formats to date object"""
-    if not date_string:
-        return None
-    try:
-        # Try YYYY-MM format (month picker)
-        if len(date_string) == 7 and '-' in date_string:
-            return datetime.strptime(date_string + '-01', '%Y-%m-%d').date()
-        # Try YYYY-MM-DD format
-        return datetime.strptime(date_string, '%Y-%m-%d').date()
-    except (ValueError, TypeError):
-        return None
+class ReadinessRecomputeMixin:
+    """Queue a readiness recompute whenever a scored profile item changes."""
+
+    def perform_create(self, serializer):
+        profile, _ = StudentProfile.objects.get_or_create(user=self.request.user)
+        serializer.save(profile=profile)
+        request_recompute(profile)
+
+    def perform_update(self, serializer):
+        instance = serializer.save()
+        request_recompute(instance.profile)
+
+    def perform_destroy(self, instance):
+        profile = instance.profile
+        instance.delete()
+        request_recompute(profile)
 
 
 class StudentProfileViewSet(viewsets.ModelViewSet):
@@ -71,97 +82,29 @@ class StudentProfileViewSet(viewsets.ModelViewSet):
         """
         try:
             with transaction.atomic():
-                # Extract data from request
                 basic_info = request.data.get('basic_info', {})
-                educations_data = request.data.get('educations', [])
-                experiences_data = request.data.get('experiences', [])
-                projects_data = request.data.get('projects', [])
-                skills_data = request.data.get('skills', [])
-                certifications_data = request.data.get('certifications', [])
 
                 # Create or update StudentProfile
                 profile, created = StudentProfile.objects.get_or_create(user=request.user)
-                profile.full_name = basic_info.get('full_name', profile.full_name)
-                profile.date_of_birth = parse_date(basic_info.get('date_of_birth')) or profile.date_of_birth
-                profile.location = basic_info.get('location', profile.location)
-                profile.headline = basic_info.get('headline', profile.headline)
-                profile.summary = basic_info.get('summary', profile.summary)
-                profile.save()
-
-                # Clear existing related data
-                profile.educations.all().delete()
-                profile.experiences.all().delete()
-                profile.projects.all().delete()
-                profile.certifications.all().delete()
-                profile.profile_skills.all().delete()
-
-                # Create Education entries
-                for edu_data in educations_data:
-                    Education.objects.create(
-                        profile=profile,
-                        institution=edu_data.get('institution', ''),
-                        level=edu_data.get('level', 'other'),
-                        field_of_study=edu_data.get('field_of_study', ''),
-                        start_date=parse_date(edu_data.get('start_date')),
-                        end_date=parse_date(edu_data.get('end_date')),
-                        is_current=edu_data.get('currently_studying', False),
-                        grade=edu_data.get('grade_gpa', ''),
-                        description=edu_data.get('description', '')
-                    )
-
-                # Create Experience entries
-                for exp_data in experiences_data:
-                    Experience.objects.create(
-                        profile=profile,
-                        role_title=exp_data.get('job_title', ''),
-                        company=exp_data.get('company', ''),
-                        start_date=parse_date(exp_data.get('start_date')),
-                        end_date=parse_date(exp_data.get('end_date')),
-                        is_current=exp_data.get('currently_working', False),
-                        description=exp_data.get('description', ''),
-                        referral_name=exp_data.get('referral_name', ''),
-                        referral_email=exp_data.get('referral_email', '')
-                    )
-
-                # Create Project entries
-                for proj_data in projects_data:
-                    Project.objects.create(
-                        profile=profile,
-                        title=proj_data.get('title', ''),
-                        description=proj_data.get('description', ''),
-                        technologies=proj_data.get('technologies', ''),
-                        github_link=proj_data.get('github_link', ''),
-                        live_link=proj_data.get('live_url', ''),
-                        contribution=proj_data.get('your_contribution', ''),
-                        start_date=parse_date(proj_data.get('start_date')),
-                        end_date=parse_date(proj_data.get('end_date'))
-                    )
-
-                # Create Skill entries (ProfileSkill)
-                for skill_data in skills_data:
-                    skill_name = skill_data.get('name', '').strip()
-                    if skill_name:
-                        # Get or create the Skill in jobs.models
-                        skill, _ = Skill.objects.get_or_create(name=skill_name)
-                        
-                        # Create ProfileSkill with proficiency
-                        ProfileSkill.objects.create(
-                            profile=profile,
-                            skill=skill,
-                            proficiency=skill_data.get('proficiency', 3),
-                            source='manual'
-                        )
-
-                # Create Certification entries
-                for cert_data in certifications_data:
-                    Certification.objects.create(
-                        profile=profile,
-                        name=cert_data.get('name', ''),
-                        issuer=cert_data.get('issuer', ''),
-                        issue_date=parse_date(cert_data.get('issue_date')),
-                        expiry_date=parse_date(cert_data.get('expiry_date')),
-                        credential_url=cert_data.get('credential_url', '')
-                    )
+                basic_values = {
+                    'full_name': basic_info.get('full_name', profile.full_name),
+                    'date_of_birth': parse_date(basic_info.get('date_of_birth')) or profile.date_of_birth,
+                    'location': basic_info.get('location', profile.location),
+                    'headline': basic_info.get('headline', profile.headline),
+                    'summary': basic_info.get('summary', profile.summary),
+                }
+                # An unchanged resave skips the UPDATE
+                if any(getattr(profile, field) != value for field, value in basic_values.items()):
+                    for field, value in basic_values.items():
+                        setattr(profile, field, value)
+                    profile.save()
+
+                # Diff every section against the stored rows, so an unchanged
+                # resave keeps row ids (and the verifications pointing at them)
+                changed = sync_profile_sections(profile, request.data)
+
+                if changed or created:
+                    request_recompute(profile)
 
                 return Response({
                     'profile_id': profile.id,
@@ -180,6 +123,55 @@ class StudentProfileViewSet(viewsets.ModelViewSet):
             )
 
 
+    @action(detail=False, methods=['get', 'post'])
+    def sync(self, request):
+        """
+        Delta sync of profile sections.
+
+        GET returns the profile revision and the content hash of every
+        section (404 before the profile exists). POST applies only the
+        sections the client edited, with the hashes its copy of them had:
+        {
+            "base_hashes": {"projects": "3f2a...", "skills": "9c41..."},
+            "sections": {"projects": [...], "skills": [...]}
+        }
+        Items use the create-profile format. Sections whose hash matches
+        the stored one are skipped. If an edited section changed since its
+        base hash, nothing is written and 409 lists the conflicting sections
+        with the current hashes.
+        """
+        if request.method == 'GET':
+            profile = StudentProfile.objects.filter(user=request.user).first()
+            if profile is None:
+                return Response({'detail': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'revision': profile.revision, 'sections': section_hashes(profile)})
+        
+        serializer = ProfileSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        profile, _ = StudentProfile.objects.get_or_create(user=request.user)
+        
+        try:
+            profile, changed = sync_sections(
+                profile.id, serializer.validated_data['base_hashes'], serializer.validated_data['sections']
+            )
+        except SectionConflict as e:
+            return Response({
+                'detail': str(e),
+                'conflicts': e.sections,
+                'revision': e.profile.revision,
+                'sections': section_hashes(e.profile),
+            }, status=status.HTTP_409_CONFLICT)
+        
+        if changed:
+            request_recompute(profile)
+        
+        return Response({
+            'revision': profile.revision,
+            'changed_sections': changed,
+            'sections': section_hashes(profile),
+        })
+
+
 class EducationViewSet(viewsets.ModelViewSet):
     serializer_class = EducationSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -192,41 +184,29 @@ class EducationViewSet(viewsets.ModelViewSet):
         serializer.save(profile=profile)
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReadinessRecomputeMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Project.objects.filter(profile__user=self.request.user)
 
-    def perform_create(self, serializer):
-        profile, _ = StudentProfile.objects.get_or_create(user=self.request.user)
-        serializer.save(profile=profile)
-
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class ExperienceViewSet(ReadinessRecomputeMixin, viewsets.ModelViewSet):
     serializer_class = ExperienceSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Experience.objects.filter(profile__user=self.request.user)
 
-    def perform_create(self, serializer):
-        profile, _ = StudentProfile.objects.get_or_create(user=self.request.user)
-        serializer.save(profile=profile)
-
 
-class CertificationViewSet(viewsets.ModelViewSet):
+class CertificationViewSet(ReadinessRecomputeMixin, viewsets.ModelViewSet):
     serializer_class = CertificationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Certification.objects.filter(profile__user=self.request.user)
 
-    def perform_create(self, serializer):
-        profile, _ = StudentProfile.objects.get_or_create(user=self.request.user)
-        serializer.save(profile=profile)
-
 
 class VolunteeringViewSet(viewsets.ModelViewSet):
     serializer_class = VolunteeringSerializer
@@ -240,13 +220,9 @@ class VolunteeringViewSet(viewsets.ModelViewSet):
         serializer.save(profile=profile)
 
 
-class ProfileSkillViewSet(viewsets.ModelViewSet):
+class ProfileSkillViewSet(ReadinessRecomputeMixin, viewsets.ModelViewSet):
     serializer_class = ProfileSkillSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return ProfileSkill.objects.filter(profile__user=self.request.user)
-
-    def perform_create(self, serializer):
-        profile, _ = StudentProfile.objects.get_or_create(user=self.request.user)
-        serializer.save(profile=profile)
@@ -8,39 +8,196 @@ Calculates readiness scores based on:
 4. Company level adjustments (startup, corporate, leading)
 """
 
+import threading
+from collections import defaultdict
 from decimal import Decimal
-from django.db.models import Sum, Q
+
+import numpy as np
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
-from django.contrib.auth.models import User
-from jobs.models import Pillar, SubPillar, JobPillarWeight, Skill
+from jobs.taxonomy import get_taxonomy
 from profiles.models import StudentProfile, Experience, Project, Certification, ProfileSkill
-from verification.models import VerificationRequest
+from verification.models import VerificationRequest, VerificationCounter, VerificationMethod, VerificationStatus
+from .job_matrix import JobWeightMatrix
+from .kernel import (
+    ScoringKernel, ProfileRecords, TaxonomyRecords, JobRecord, ALL_LEVELS, combine_levels,
+    ExperienceRecord, ProjectRecord, CertificationRecord, VerificationRecord,
+)
+
+class ProfileSnapshot:
+    """
+    In-memory copy of everything the engine reads for one profile.
+
+    Loaded with a fixed number of queries (skills, experiences, projects,
+    certifications, verifications, verification counter) on top of the
+    shared taxonomy snapshot, so that scoring cost no longer depends on
+    profile or taxonomy size.
+    load_many() does the same for a whole batch of profiles.
+    """
+
+    def __init__(self, profile, taxonomy=None, rows=None):
+        self.profile = profile
+        self.taxonomy = taxonomy or get_taxonomy()
+        self.today = timezone.now().date()
+        if rows is None:
+            rows = self._load_rows([profile.id])[profile.id]
+
+        self.pillars = self.taxonomy.pillars
+        self.sub_pillars_by_pillar = self.taxonomy.sub_pillars_by_pillar
+
+        # ProfileSkill is unique per (profile, skill), so skills are distinct
+        self.skills_by_sub_pillar = defaultdict(list)
+        self.skill_confidence = {}
+        skill_sub_pillar = self.taxonomy.skill_sub_pillar
+        for skill_id, verification_score in rows['skills']:
+            sub_pillar_id = skill_sub_pillar.get(skill_id)
+            if sub_pillar_id:
+                self.skills_by_sub_pillar[sub_pillar_id].append(skill_id)
+            if verification_score:
+                self.skill_confidence[skill_id] = verification_score
+        # ProfileSkill id -> skill id, to tell which skill a verification targets
+        self.profile_skill_ids = rows['profile_skill_ids']
+
+        self.experiences = rows['experiences']
+        self.projects = rows['projects']
+        self.certifications = rows['certifications']
+        self.verifications = rows['verifications']
+        self.verification_counts = rows['verification_counts']
+
+    @classmethod
+    def load_many(cls, profiles, taxonomy=None):
+        """Snapshots for many profiles with the same fixed number of queries."""
+        taxonomy = taxonomy or get_taxonomy()
+        rows = cls._load_rows([profile.id for profile in profiles])
+        return {profile.id: cls(profile, taxonomy, rows[profile.id]) for profile in profiles}
+
+    @staticmethod
+    def _load_rows(profile_ids):
+        """Profile rows the engine reads, grouped by profile id."""
+        rows = defaultdict(lambda: {
+            'skills': [],
+            'profile_skill_ids': {},
+            'experiences': [],
+            'projects': [],
+            'certifications': [],
+            'verifications': [],
+            'verification_counts': {},
+        })
+
+        profile_skills = ProfileSkill.objects.filter(profile_id__in=profile_ids).values_list(
+            'profile_id', 'id', 'skill_id', 'verification_score'
+        )
+        for profile_id, profile_skill_id, skill_id, verification_score in profile_skills:
+            rows[profile_id]['skills'].append((skill_id, verification_score))
+            rows[profile_id]['profile_skill_ids'][profile_skill_id] = skill_id
+
+        for key, model in (
+            ('experiences', Experience),
+            ('projects', Project),
+            ('certifications', Certification),
+        ):
+            for item in model.objects.filter(profile_id__in=profile_ids).order_by('id'):
+                rows[item.profile_id][key].append(item)
+
+        # Only what blend_confidence, the planner and simulation ids read
+        verifications = VerificationRequest.objects.filter(profile_id__in=profile_ids).order_by('id').values_list(
+            'profile_id', 'id', 'method', 'status', 'score', 'content_type_id', 'object_id', named=True
+        )
+        for verification in verifications:
+            rows[verification.profile_id]['verifications'].append(verification)
+
+        # verification_impact reads the denormalized counts, one row per profile
+        for counter in VerificationCounter.objects.filter(pk__in=profile_ids):
+            rows[counter.pk]['verification_counts'] = {
+                (method, status): counter.count(method, status)
+                for method in VerificationMethod.values
+                for status in VerificationStatus.values
+            }
+
+        return rows
+    
+    def records(self):
+        """This snapshot as kernel ProfileRecords."""
+        skill_type_id = ContentType.objects.get_for_model(ProfileSkill).id
+        return ProfileRecords(
+            skills_by_sub_pillar=dict(self.skills_by_sub_pillar),
+            skill_confidence=dict(self.skill_confidence),
+            experiences=[
+                ExperienceRecord(
+                    exp.company, exp.start_date, exp.end_date, exp.is_current, exp.keyword_hits,
+                    exp.verification_score,
+                )
+                for exp in self.experiences
+            ],
+            projects=[
+                ProjectRecord(
+                    project.description, project.github_link, project.live_link, project.keyword_hits,
+                    project.verification_score,
+                )
+                for project in self.projects
+            ],
+            certifications=[
+                CertificationRecord(cert.issuer, cert.expiry_date, cert.keyword_hits, cert.verification_score)
+                for cert in self.certifications
+            ],
+            verifications=[
+                VerificationRecord(
+                    v.method, v.status, v.score,
+                    self.profile_skill_ids.get(v.object_id) if v.content_type_id == skill_type_id else None,
+                )
+                for v in self.verifications
+            ],
+            verification_counts=dict(self.verification_counts),
+            today=self.today,
+        )
 
 
 class ReadinessCalculator:
-    """Core calculation engine for IRI scores."""
+    """
+    Loads a profile's records and scores them with the ScoringKernel.
     
-    # Verification level weights (impact on score)
-    VERIFICATION_WEIGHTS = {
-        'self': Decimal('0.60'),          # 60% weight for self-verification (quiz)
-        'referral': Decimal('0.30'),      # 30% weight for referral verification
-        'link': Decimal('0.10')           # 10% weight for link/portfolio verification
-    }
+    All arithmetic lives in readiness.kernel; this class only turns the
+    profile snapshot and taxonomy snapshot into kernel records.
+    """
     
-    # Company level multipliers
-    COMPANY_LEVEL_MULTIPLIERS = {
-        'startup': Decimal('1.0'),        # Base level
-        'corporate': Decimal('1.15'),     # 15% higher expectations
-        'leading': Decimal('1.30')        # 30% higher expectations (FAANG-level)
-    }
+    VERIFICATION_WEIGHTS = ScoringKernel.VERIFICATION_WEIGHTS
+    COMPANY_LEVEL_MULTIPLIERS = ScoringKernel.COMPANY_LEVEL_MULTIPLIERS
     
-    def __init__(self, user):
-        """Initialize calculator with user profile."""
+    def __init__(self, user, profile=None, snapshot=None, numeric_mode=None):
+        """
+        Initialize calculator with user profile (looked up unless given).
+        
+        numeric_mode overrides settings.READINESS_NUMERIC_MODE ('decimal' or 'float').
+        """
         self.user = user
-        try:
-            self.profile = StudentProfile.objects.get(user=user)
-        except StudentProfile.DoesNotExist:
-            self.profile = None
+        self.numeric_mode = numeric_mode or settings.READINESS_NUMERIC_MODE
+        if profile is None:
+            try:
+                profile = StudentProfile.objects.get(user=user)
+            except StudentProfile.DoesNotExist:
+                profile = None
+        self.profile = profile
+        self._snapshot = snapshot
+        self._kernel = None
+    
+    @property
+    def snapshot(self):
+        """Profile snapshot, loaded once and reused across calculations."""
+        if self._snapshot is None:
+            self._snapshot = ProfileSnapshot(self.profile)
+        return self._snapshot
+    
+    @property
+    def kernel(self):
+        """ScoringKernel over this profile's records (memoizes sub-pillar scores)."""
+        if self._kernel is None:
+            self._kernel = ScoringKernel(
+                self.snapshot.records(),
+                taxonomy_records(self.snapshot.taxonomy),
+                numeric_mode=self.numeric_mode,
+            )
+        return self._kernel
     
     def calculate_iri(self, job_role, company_level='startup'):
         """
@@ -48,7 +205,8 @@ class ReadinessCalculator:
         
         Args:
             job_role: JobRole instance
-            company_level: 'startup', 'corporate', or 'leading'
+            company_level: 'startup', 'corporate', 'leading', or 'all' (every
+                level from one base computation, see kernel.combine_levels)
         
         Returns:
             {
@@ -67,506 +225,124 @@ class ReadinessCalculator:
             }
         """
         if not self.profile:
-            return self._empty_result(company_level)
-        
-        # Step 1: Get job-pillar weights for this role
-        job_weights = self._get_job_weights(job_role)
-        if not job_weights:
-            return self._empty_result(company_level)
-        
-        # Step 2: Calculate pillar scores
-        pillars = Pillar.objects.all()
-        pillar_scores = {}
-        total_weighted_score = Decimal('0')
-        
-        for pillar in pillars:
-            pillar_score = self._calculate_pillar_score(pillar)
-            weight = job_weights.get(pillar.id, Decimal('0'))
-            weighted_contribution = (pillar_score * weight) / Decimal('100')
-            
-            pillar_scores[pillar.id] = {
-                'name': pillar.name,
-                'score': float(pillar_score),
-                'weight_percent': float(weight),
-                'weighted_contribution': float(weighted_contribution)
-            }
-            
-            total_weighted_score += weighted_contribution
-        
-        # Step 3: Apply company level adjustment
-        company_multiplier = self.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0'))
-        adjusted_score = min(total_weighted_score * company_multiplier, Decimal('100'))
-        
-        # Step 4: Identify strengths and gaps
-        strengths, gaps = self._identify_strengths_gaps(pillar_scores)
-        
-        # Step 5: Build verification impact summary
-        verification_impact = self._calculate_verification_impact()
-        
-        return {
-            'iri_score': float(adjusted_score),
-            'base_score': float(total_weighted_score),
-            'breakdown': pillar_scores,
-            'verification_impact': verification_impact,
-            'company_level': company_level,
-            'company_multiplier': float(company_multiplier),
-            'strengths': strengths,
-            'gaps': gaps,
-            'recommendations': self._generate_recommendations(gaps, job_role)
-        }
-    
-    def _calculate_pillar_score(self, pillar):
-        """
-        Calculate score for a single pillar.
-        
-        Formula: Pillar_Score = Σ(SubPillar_Score × SubPillar_Weight) / Σ(SubPillar_Weight)
-        
-        SubPillar_Score is derived from:
-        - Skills matching this sub-pillar (with verification levels applied)
-        - Experiences relevant to this sub-pillar
-        - Projects demonstrating this sub-pillar
-        - Certifications in this sub-pillar
-        """
-        sub_pillars = SubPillar.objects.filter(pillar=pillar)
-        
-        if not sub_pillars.exists():
-            return Decimal('0')
-        
-        total_weighted_score = Decimal('0')
-        total_weight = Decimal('0')
-        
-        for sub_pillar in sub_pillars:
-            sub_score = self._calculate_sub_pillar_score(sub_pillar)
-            weight = sub_pillar.weight
-            
-            total_weighted_score += sub_score * weight
-            total_weight += weight
+            if company_level == ALL_LEVELS:
+                return combine_levels(self._empty_levels())
+            return ScoringKernel.empty_result(company_level)
         
-        if total_weight == 0:
-            return Decimal('0')
-        
-        pillar_score = total_weighted_score / total_weight
-        return pillar_score
+        return self.kernel.calculate_iri(JobRecord(job_role.id, job_role.name), company_level)
     
-    def _calculate_sub_pillar_score(self, sub_pillar):
-        """
-        Calculate score for a sub-pillar (0-100).
-        
-        Components:
-        1. Skills score (40% weight)
-        2. Experience score (30% weight)
-        3. Project score (20% weight)
-        4. Certification score (10% weight)
-        """
+    def calculate_iri_levels(self, job_role, company_levels=None):
+        """{company_level: calculate_iri result} from one base computation."""
         if not self.profile:
-            return Decimal('0')
+            return self._empty_levels(company_levels)
         
-        # Get component scores
-        skills_score = self._calculate_skills_score(sub_pillar)
-        experience_score = self._calculate_experience_score(sub_pillar)
-        project_score = self._calculate_project_score(sub_pillar)
-        certification_score = self._calculate_certification_score(sub_pillar)
-        
-        # Weighted average
-        total_score = (
-            (skills_score * Decimal('0.40')) +
-            (experience_score * Decimal('0.30')) +
-            (project_score * Decimal('0.20')) +
-            (certification_score * Decimal('0.10'))
-        )
-        
-        return min(total_score, Decimal('100'))
+        return self.kernel.calculate_iri_levels(JobRecord(job_role.id, job_role.name), company_levels)
     
-    def _calculate_skills_score(self, sub_pillar):
-        """
-        Calculate skill-based score for a sub-pillar.
-        
-        Scores each skill by verification level:
-        - Self-verified (quiz): 60 points base
-        - Referral-verified: 30 points
-        - Link-verified (GitHub, portfolio): 10 points
-        """
-        skills = Skill.objects.filter(
-            profileskill__profile=self.profile,
-            sub_pillar=sub_pillar
-        ).distinct()
-        
-        if not skills.exists():
-            return Decimal('0')
-        
-        total_score = Decimal('0')
-        
-        for skill in skills:
-            verification = VerificationRequest.objects.filter(
-                profile=self.profile,
-                ).first()
-            
-            if not verification:
-                # Unverified skill: 20 points
-                total_score += Decimal('20')
-            elif verification.method == 'self':
-                # Self-verified: 60 points if approved, 30 if pending
-                score = Decimal('60') if verification.status == 'approved' else Decimal('30')
-                total_score += score
-            elif verification.method == 'referral':
-                # Referral-verified: 30 points
-                total_score += Decimal('30') if verification.status == 'approved' else Decimal('15')
-            elif verification.method == 'link':
-                # Link-verified: 10 + credibility analysis
-                if verification.status == 'approved':
-                    credibility_bonus = Decimal(verification.score or 0)
-                    total_score += Decimal('10') + credibility_bonus
-                else:
-                    total_score += Decimal('5')
-        
-        # Average across all skills (normalize to 0-100)
-        avg_score = total_score / skills.count()
-        return min(avg_score, Decimal('100'))
+    def _empty_levels(self, company_levels=None):
+        return {
+            level: ScoringKernel.empty_result(level)
+            for level in company_levels or self.COMPANY_LEVEL_MULTIPLIERS
+        }
     
-    def _calculate_experience_score(self, sub_pillar):
+    def score_all_jobs(self, company_level='startup'):
         """
-        Calculate experience-based score for a sub-pillar.
+        Score every active job role from one profile score vector.
         
-        Considers:
-        - Years of relevant experience
-        - Job titles matching sub-pillar keywords
-        - Company tier/prestige
-        - Responsibilities listed
-        """
-        experiences = Experience.objects.filter(profile=self.profile)
-        
-        if not experiences.exists():
-            return Decimal('0')
-        
-        total_score = Decimal('0')
-        relevant_count = 0
-        
-        for exp in experiences:
-            # Match experience based on title and description keywords
-            relevance_score = self._calculate_experience_relevance(exp, sub_pillar)
-            
-            if relevance_score > 0:
-                # Calculate years of experience
-                years = self._calculate_years(exp.start_date, exp.end_date, exp.is_current)
-                years_score = min(Decimal(years) * Decimal('10'), Decimal('50'))
-                
-                # Company tier bonus
-                company_bonus = self._get_company_tier_bonus(exp.company)
-                
-                total_score += years_score + company_bonus
-                relevant_count += 1
-        
-        if relevant_count == 0:
-            return Decimal('0')
-        
-        avg_score = total_score / relevant_count
-        return min(avg_score, Decimal('100'))
-    
-    def _calculate_project_score(self, sub_pillar):
-        """
-        Calculate project-based score for a sub-pillar.
+        Sub-pillar scores are computed once and multiplied against the cached
+        JobWeightMatrix, so the cost is flat in the number of job roles.
         
-        Considers:
-        - Project complexity (lines of code, features)
-        - Technologies used matching sub-pillar
-        - GitHub stars/forks
-        - Live deployment
+        Returns:
+            [{'id': 1, 'name': 'Backend Developer', 'iri_score': .., 'base_score': ..}, ...]
+            in job id order.
         """
-        projects = Project.objects.filter(profile=self.profile)
-        
-        if not projects.exists():
-            return Decimal('0')
-        
-        total_score = Decimal('0')
-        relevant_count = 0
-        
-        for project in projects:
-            # Match project based on technologies and description
-            relevance_score = self._calculate_project_relevance(project, sub_pillar)
-            
-            if relevance_score > 0:
-                # Score based on complexity
-                complexity_score = self._calculate_project_complexity(project)
-                # GitHub credibility
-                github_score = self._get_github_score(project.github_link)
-                # Deployment bonus
-                deployment_bonus = Decimal('15') if project.live_link else Decimal('0')
-                
-                total_score += complexity_score + github_score + deployment_bonus
-                relevant_count += 1
-        
-        if relevant_count == 0:
-            return Decimal('0')
-        
-        avg_score = total_score / relevant_count
-        return min(avg_score, Decimal('100'))
+        return self.score_all_jobs_levels((company_level,))[company_level]
     
-    def _calculate_certification_score(self, sub_pillar):
-        """
-        Calculate certification-based score for a sub-pillar.
-        
-        Considers:
-        - Certification relevance to sub-pillar
-        - Certification prestige level
-        - Expiration status
+    def score_all_jobs_levels(self, company_levels=None):
         """
-        certifications = Certification.objects.filter(profile=self.profile)
-        
-        if not certifications.exists():
-            return Decimal('0')
+        score_all_jobs for several company levels from one matrix product.
         
-        total_score = Decimal('0')
-        relevant_count = 0
-        
-        for cert in certifications:
-            # Match certification based on name and description
-            relevance_score = self._calculate_certification_relevance(cert, sub_pillar)
-            
-            if relevance_score > 0:
-                # Base score for certification
-                base_score = Decimal('60')
-                
-                # Prestige multiplier (AWS, GCP, Azure, etc.)
-                prestige_multiplier = self._get_certification_prestige(cert.issuer)
-                
-                # Check expiration
-                if cert.expiry_date and cert.expiry_date < timezone.now().date():
-                    base_score *= Decimal('0.5')  # 50% penalty if expired
-                
-                total_score += base_score * prestige_multiplier
-                relevant_count += 1
-        
-        if relevant_count == 0:
-            return Decimal('0')
-        
-        avg_score = total_score / relevant_count
-        return min(avg_score, Decimal('100'))
-    
-    def _get_job_weights(self, job_role):
-        """Get pillar weights for a specific job role."""
-        weights_qs = JobPillarWeight.objects.filter(job_role=job_role)
-        
-        return {
-            weight.pillar.id: Decimal(str(weight.weight_percent))
-            for weight in weights_qs
-        }
-    
-    def _calculate_experience_relevance(self, experience, sub_pillar):
-        """
-        Calculate how relevant an experience is to a sub-pillar (0-1 scale).
-        Uses keyword matching on title and description.
+        Returns:
+            {company_level: score_all_jobs result}, every level by default
         """
-        keywords = {
-            'Programming Languages': ['python', 'java', 'javascript', 'cpp', 'c#', 'go', 'rust'],
-            'Frameworks & Libraries': ['react', 'django', 'flask', 'spring', 'node'],
-            'Databases': ['sql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch'],
-            'DevOps & Cloud': ['aws', 'gcp', 'azure', 'docker', 'kubernetes', 'ci/cd'],
-            'Tools & Technologies': ['git', 'jira', 'linux', 'windows', 'mac'],
-            'Problem Solving': ['debug', 'troubleshoot', 'solve', 'optimize', 'performance'],
-            'Logical Thinking': ['algorithm', 'logic', 'architecture', 'design', 'pattern'],
-            'Learning Agility': ['learn', 'training', 'certification', 'course', 'upskill'],
-            'Analytical Thinking': ['analyze', 'analytics', 'data', 'metrics', 'report'],
-            'Research Ability': ['research', 'experiment', 'innovation', 'poc', 'prototype'],
-            'Communication': ['present', 'documentation', 'communicate', 'write', 'speak'],
-            'Teamwork & Collaboration': ['team', 'collaborate', 'mentor', 'lead', 'coordinate'],
-            'Leadership': ['lead', 'manage', 'direct', 'oversee', 'responsible'],
-            'Adaptability': ['adapt', 'flexible', 'change', 'pivot', 'agile'],
-            'Reliability & Work Ethic': ['deliver', 'reliable', 'consistent', 'deadline', 'quality'],
-        }
-        
-        keywords_list = keywords.get(sub_pillar.name, [])
-        full_text = f"{experience.role_title} {experience.description}".lower()
-        
-        matches = sum(1 for kw in keywords_list if kw in full_text)
-        relevance = min(Decimal(matches) / max(Decimal(len(keywords_list)), Decimal('1')), Decimal('1'))
-        
-        return relevance
-    
-    def _calculate_project_relevance(self, project, sub_pillar):
-        """Calculate how relevant a project is to a sub-pillar."""
-        # Match based on technologies and description
-        keywords = {
-            'Programming Languages': ['python', 'javascript', 'java', 'typescript', 'kotlin'],
-            'Frameworks & Libraries': ['react', 'vue', 'angular', 'django', 'fastapi'],
-            'Databases': ['postgresql', 'mongodb', 'mysql', 'redis', 'dynamodb'],
-            'DevOps & Cloud': ['docker', 'kubernetes', 'aws', 'gcp', 'terraform'],
-            'Tools & Technologies': ['git', 'api', 'rest', 'graphql', 'websocket'],
-        }
-        
-        keywords_list = keywords.get(sub_pillar.name, [])
-        full_text = f"{project.title} {project.description} {project.technologies}".lower()
-        
-        matches = sum(1 for kw in keywords_list if kw in full_text)
-        relevance = min(Decimal(matches) / max(Decimal(len(keywords_list)), Decimal('1')), Decimal('1'))
-        
-        return relevance
-    
-    def _calculate_certification_relevance(self, certification, sub_pillar):
-        """Calculate how relevant a certification is to a sub-pillar."""
-        keywords = {
-            'Programming Languages': ['python', 'java', 'javascript'],
-            'Frameworks & Libraries': ['react', 'django', 'spring'],
-            'Databases': ['sql', 'mongodb', 'nosql'],
-            'DevOps & Cloud': ['aws', 'gcp', 'azure', 'devops'],
-            'Tools & Technologies': ['linux', 'kubernetes'],
-        }
-        
-        keywords_list = keywords.get(sub_pillar.name, [])
-        full_text = f"{certification.name} {certification.issuer}".lower()
-        
-        matches = sum(1 for kw in keywords_list if kw in full_text)
-        relevance = min(Decimal(matches) / max(Decimal(len(keywords_list)), Decimal('1')), Decimal('1'))
-        
-        return relevance
-    
-    def _calculate_project_complexity(self, project):
-        """Calculate project complexity score (0-50)."""
-        # Simplified: based on description length and features count
-        complexity = min(Decimal(len(project.description or '')) / Decimal('20'), Decimal('50'))
-        return complexity
-    
-    def _get_github_score(self, github_url):
-        """Get GitHub credibility score (0-20)."""
-        # In production, would fetch actual GitHub stats
-        if not github_url:
-            return Decimal('0')
-        return Decimal('10')  # Base score for having GitHub link
-    
-    def _get_company_tier_bonus(self, company_name):
-        """Get bonus score for company tier (0-30)."""
-        faang = ['google', 'apple', 'facebook', 'amazon', 'microsoft', 'meta']
-        startups = ['startup', 'inc', 'labs', 'ai']
-        
-        if any(x in company_name.lower() for x in faang):
-            return Decimal('30')
-        elif any(x in company_name.lower() for x in startups):
-            return Decimal('15')
-        else:
-            return Decimal('10')
-    
-    def _get_certification_prestige(self, issuer):
-        """Get certification prestige multiplier."""
-        high_prestige = ['aws', 'gcp', 'azure', 'oracle', 'cisco', 'linux']
-        medium_prestige = ['coursera', 'udacity', 'google', 'microsoft']
-        
-        issuer_lower = issuer.lower() if issuer else ''
-        
-        if any(x in issuer_lower for x in high_prestige):
-            return Decimal('1.5')
-        elif any(x in issuer_lower for x in medium_prestige):
-            return Decimal('1.2')
-        else:
-            return Decimal('1.0')
-    
-    def _calculate_years(self, start_date, end_date, is_current):
-        """Calculate years of experience between two dates."""
-        if not start_date:
-            return 0
-        
-        from datetime import date
-        end = end_date if end_date and not is_current else date.today()
-        
-        years = (end - start_date).days / 365.25
-        return max(0, round(years, 1))
-    
-    def _calculate_verification_impact(self):
-        """Calculate how verification activities impact the overall score."""
-        verifications = VerificationRequest.objects.filter(profile=self.profile)
-        
-        total_count = verifications.count()
-        verified_count = verifications.filter(status='approved').count()
-        
-        by_type = {}
-        for vtype in ['self', 'referral', 'link']:
-            count = verifications.filter(method=vtype).count()
-            verified = verifications.filter(method=vtype, status='approved').count()
-            
-            by_type[vtype] = {
-                'total': count,
-                'verified': verified,
-                'percentage': float((verified / count * 100) if count > 0 else 0)
+        company_levels = company_levels or tuple(self.COMPANY_LEVEL_MULTIPLIERS)
+        matrix = JobWeightMatrix.get()
+        if not self.profile:
+            return {
+                company_level: [
+                    {'id': job_id, 'name': name, 'iri_score': 0, 'base_score': 0}
+                    for job_id, name in zip(matrix.job_ids, matrix.job_names)
+                ]
+                for company_level in company_levels
             }
         
-        return {
-            'total_verifications': total_count,
-            'verified_count': verified_count,
-            'verification_rate': float((verified_count / total_count * 100) if total_count > 0 else 0),
-            'by_type': by_type
-        }
+        base_scores = matrix.base_scores(self.calculate_sub_pillar_scores())
+        
+        results = {}
+        for company_level in company_levels:
+            company_multiplier = float(self.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0')))
+            iri_scores = np.minimum(base_scores * company_multiplier, 100.0)
+            results[company_level] = [
+                {
+                    'id': job_id,
+                    'name': name,
+                    'iri_score': float(iri_score),
+                    'base_score': float(base_score),
+                }
+                for job_id, name, iri_score, base_score in zip(
+                    matrix.job_ids, matrix.job_names, iri_scores, base_scores
+                )
+            ]
+        return results
     
-    def _identify_strengths_gaps(self, pillar_scores):
+    def top_jobs(self, k, company_level='startup'):
         """
-        Identify top 3 strengths and top 3 gaps.
+        The k best-fit active job roles (see JobWeightMatrix.top_k).
         
         Returns:
-            (strengths, gaps) - lists of dicts with pillar name and score
+            (results shaped like score_all_jobs, best first; number of roles scored)
         """
-        sorted_pillars = sorted(
-            pillar_scores.items(),
-            key=lambda x: x[1]['score'],
-            reverse=True
-        )
+        matrix = JobWeightMatrix.get()
+        if not self.profile:
+            return self.score_all_jobs(company_level)[:k], 0
         
-        strengths = [
-            {
-                'pillar': item[1]['name'],
-                'score': item[1]['score']
-            }
-            for item in sorted_pillars[:3]
-        ]
+        top, evaluated = matrix.top_k(self.calculate_sub_pillar_scores(), k)
+        company_multiplier = float(self.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0')))
         
-        gaps = [
+        return [
             {
-                'pillar': item[1]['name'],
-                'score': item[1]['score']
+                'id': matrix.job_ids[index],
+                'name': matrix.job_names[index],
+                'iri_score': min(base_score * company_multiplier, 100.0),
+                'base_score': base_score,
             }
-            for item in sorted_pillars[-3:]
-        ]
-        
-        return strengths, gaps
+            for index, base_score in top
+        ], evaluated
     
-    def _generate_recommendations(self, gaps, job_role):
-        """Generate actionable recommendations based on gaps."""
-        recommendations = []
-        
-        for gap in gaps:
-            pillar_name = gap['pillar']
-            recommendations.append({
-                'area': pillar_name,
-                'priority': 'high' if gap['score'] < 30 else 'medium',
-                'suggestion': self._get_recommendation_text(pillar_name, job_role)
-            })
-        
-        return recommendations
+    def valid_until(self):
+        """First day this profile's scores can drift without an edit (None: never)."""
+        if not self.profile:
+            return None
+        return self.kernel.valid_until()
     
-    def _get_recommendation_text(self, pillar_name, job_role):
-        """Get specific recommendation text for a pillar."""
-        recommendations_map = {
-            'Technical Skills': f"Strengthen your technical skills in areas required for {job_role.name}. Consider online courses or side projects.",
-            'Cognitive Abilities': "Improve problem-solving and analytical thinking through coding challenges and algorithm practice.",
-            'Behavioral Competencies': "Develop communication, teamwork, and leadership skills through group projects and presentations.",
-            'Domain Knowledge': f"Increase your understanding of IT industry trends and best practices relevant to {job_role.name}."
-        }
-        
-        return recommendations_map.get(pillar_name, "Work on improving this area.")
+    def calculate_sub_pillar_scores(self):
+        """Score of every sub-pillar for this profile, keyed by sub-pillar id."""
+        if not self.profile:
+            return {}
+        return self.kernel.sub_pillar_scores()
+
+
+_lock = threading.Lock()
+_taxonomy_records = None
+
+
+def taxonomy_records(taxonomy):
+    """Kernel records for a taxonomy snapshot, converted once per snapshot."""
+    global _taxonomy_records
+    cached = _taxonomy_records
+    if cached is not None and cached[0] is taxonomy:
+        return cached[1]
     
-    def _empty_result(self, company_level='startup'):
-        """Return empty result when profile is incomplete."""
-        company_multiplier = self.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0'))
-        return {
-            'iri_score': 0,
-            'base_score': 0,
-            'breakdown': [],
-            'verification_impact': {
-                'total_verifications': 0,
-                'verified_count': 0,
-                'verification_rate': 0,
-                'by_type': {}
-            },
-            'company_level': company_level,
-            'company_multiplier': float(company_multiplier),
-            'strengths': [],
-            'gaps': [],
-            'recommendations': [],
-            'error': 'Profile incomplete. Please add skills, experience, and projects.'
-        }
+    with _lock:
+        if _taxonomy_records is None or _taxonomy_records[0] is not taxonomy:
+            _taxonomy_records = (taxonomy, TaxonomyRecords.from_taxonomy(taxonomy))
+        return _taxonomy_records[1]
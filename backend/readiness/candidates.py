@@ -0,0 +1,101 @@
+"""
+Employer-side candidate ranking: which students are most ready for a job.
+
+A job's base score is linear in a profile's sub-pillar scores,
+
+    base_score = Σ_s W[job, s] × sub_pillar_score[s]
+
+with W the job's row of JobWeightMatrix.combined. Every term is monotone,
+so Fagin's threshold algorithm (TA) finds the top N profiles from the
+SubPillarScore table without scanning every profile:
+
+1. Sorted access: read the next batch of each weighted sub-pillar's scores
+   in descending order (the (sub_pillar, -score) index).
+2. Random access: fetch every sub-pillar score of the newly seen profiles
+   and compute their exact base score.
+3. Threshold: Σ_s W[s] × (last score read from list s) bounds the score of
+   any profile not seen yet. Stop once N seen profiles reach it.
+
+The company level multiplier is monotone, so it does not change the order.
+"""
+
+from collections import defaultdict
+
+from .job_matrix import JobWeightMatrix
+from .models import SubPillarScore
+
+
+SORTED_ACCESS_BATCH = 100
+
+
+def job_weights(job_role_id):
+    """{sub_pillar_id: weight} of a job's base score, positive weights only."""
+    matrix = JobWeightMatrix.get()
+    row = matrix.combined[matrix.job_ids.index(job_role_id)]
+    return {
+        sub_pillar_id: float(weight)
+        for sub_pillar_id, weight in zip(matrix.sub_pillar_ids, row)
+        if weight > 0
+    }
+
+
+def top_candidates(weights, limit, batch_size=SORTED_ACCESS_BATCH):
+    """
+    Top `limit` profiles by Σ weights[s] × score[s], with the threshold algorithm.
+
+    Args:
+        weights: {sub_pillar_id: weight > 0}
+        limit: Number of profiles wanted
+        batch_size: Rows read per sorted list and round
+
+    Returns:
+        ([(profile_id, base_score)] best first, stats dict with
+        'sorted_accesses' and 'profiles_seen')
+    """
+    offsets = dict.fromkeys(weights, 0)
+    last_scores = dict.fromkeys(weights, 100.0)
+    exhausted = set()
+    scores = {}
+    sorted_accesses = 0
+
+    while limit > 0 and len(exhausted) < len(weights):
+        # Sorted access: the next batch of every list that still has rows
+        new_ids = set()
+        for sub_pillar_id in weights:
+            if sub_pillar_id in exhausted:
+                continue
+            offset = offsets[sub_pillar_id]
+            batch = list(
+                SubPillarScore.objects.filter(sub_pillar_id=sub_pillar_id)
+                .order_by('-score', 'profile_id')
+                .values_list('profile_id', 'score')[offset:offset + batch_size]
+            )
+            sorted_accesses += len(batch)
+            offsets[sub_pillar_id] += len(batch)
+            if batch:
+                last_scores[sub_pillar_id] = float(batch[-1][1])
+            if len(batch) < batch_size:
+                exhausted.add(sub_pillar_id)
+            new_ids.update(profile_id for profile_id, _ in batch if profile_id not in scores)
+
+        # Random access: exact scores of the profiles seen for the first time
+        if new_ids:
+            totals = defaultdict(float)
+            for profile_id, sub_pillar_id, score in SubPillarScore.objects.filter(
+                profile_id__in=new_ids, sub_pillar_id__in=list(weights)
+            ).values_list('profile_id', 'sub_pillar_id', 'score'):
+                totals[profile_id] += weights[sub_pillar_id] * float(score)
+            for profile_id in new_ids:
+                scores[profile_id] = totals[profile_id]
+
+        # An exhausted list holds no unseen profile, so it adds nothing
+        threshold = sum(
+            weight * last_scores[sub_pillar_id]
+            for sub_pillar_id, weight in weights.items()
+            if sub_pillar_id not in exhausted
+        )
+        if sum(1 for score in scores.values() if score >= threshold) >= limit:
+            break
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return ranked, {'sorted_accesses': sorted_accesses, 'profiles_seen': len(scores)}
@@ -0,0 +1,141 @@
+"""
+Job x sub-pillar weight matrix for scoring every job role at once.
+
+A job's base IRI score is linear in the profile's sub-pillar scores:
+
+    base_score[job] = Σ_s W[job, s] × sub_pillar_score[s]
+
+where W folds together the job's pillar weights (JobPillarWeight) and the
+relative sub-pillar weights inside each pillar (JobSubPillarWeight when the
+job defines them for that pillar, SubPillar.weight otherwise). Building W
+once lets all_jobs/summary score the whole catalog with one matrix-vector
+product instead of one calculate_iri call per job. The matrix is rebuilt
+whenever the taxonomy snapshot is rebuilt.
+"""
+
+import threading
+
+import numpy as np
+
+from jobs.taxonomy import get_taxonomy
+
+from .kernel import effective_sub_pillar_weights
+
+
+_lock = threading.Lock()
+_matrix = None
+
+
+class JobWeightMatrix:
+    """Dense weight matrices over active job roles, pillars and sub-pillars."""
+
+    def __init__(self, job_ids, job_names, pillar_ids, sub_pillar_ids,
+                 sub_pillar_pillar, pillar_weights, sub_weights):
+        self.job_ids = job_ids
+        self.job_names = job_names
+        self.pillar_ids = pillar_ids
+        self.sub_pillar_ids = sub_pillar_ids
+        # Index of the owning pillar for each sub-pillar column
+        self.sub_pillar_pillar = sub_pillar_pillar
+        # jobs x pillars, weight_percent (0-100)
+        self.pillar_weights = pillar_weights
+        # jobs x sub-pillars, relative weight inside the pillar (rows sum to 1 per pillar)
+        self.sub_weights = sub_weights
+        # jobs x sub-pillars, contribution of each sub-pillar score to the base score
+        self.combined = sub_weights * pillar_weights[:, sub_pillar_pillar] / 100.0
+        self.taxonomy = None
+
+    @classmethod
+    def build(cls, taxonomy):
+        """Build the matrix from a taxonomy snapshot (no queries)."""
+        jobs = taxonomy.active_job_roles
+        pillars = taxonomy.pillars
+        sub_pillars = taxonomy.sub_pillars
+
+        pillar_index = {pillar.id: i for i, pillar in enumerate(pillars)}
+        sub_pillar_index = {sp.id: i for i, sp in enumerate(sub_pillars)}
+
+        pillar_weights = np.zeros((len(jobs), len(pillars)))
+        sub_weights = np.zeros((len(jobs), len(sub_pillars)))
+        for row, job in enumerate(jobs):
+            for pillar_id, weight in taxonomy.pillar_weights_for(job.id).items():
+                if pillar_id in pillar_index:
+                    pillar_weights[row, pillar_index[pillar_id]] = float(weight)
+
+            job_sub_weights = taxonomy.sub_pillar_weights_for(job.id)
+            for group in taxonomy.sub_pillars_by_pillar.values():
+                weights = effective_sub_pillar_weights(group, job_sub_weights)
+                total = float(sum(weights.values()))
+                if total == 0:
+                    continue
+                for sp_id, weight in weights.items():
+                    sub_weights[row, sub_pillar_index[sp_id]] = float(weight) / total
+
+        sub_pillar_pillar = np.array(
+            [pillar_index[sp.pillar_id] for sp in sub_pillars], dtype=np.intp
+        )
+
+        matrix = cls(
+            job_ids=[job.id for job in jobs],
+            job_names=[job.name for job in jobs],
+            pillar_ids=[pillar.id for pillar in pillars],
+            sub_pillar_ids=[sp.id for sp in sub_pillars],
+            sub_pillar_pillar=sub_pillar_pillar,
+            pillar_weights=pillar_weights,
+            sub_weights=sub_weights,
+        )
+        matrix.taxonomy = taxonomy
+        return matrix
+
+    @classmethod
+    def get(cls):
+        """Return the matrix for the current taxonomy snapshot, rebuilding on change."""
+        global _matrix
+        taxonomy = get_taxonomy()
+        matrix = _matrix
+        if matrix is not None and matrix.taxonomy is taxonomy:
+            return matrix
+
+        with _lock:
+            if _matrix is None or _matrix.taxonomy is not taxonomy:
+                _matrix = cls.build(taxonomy)
+            return _matrix
+
+    def score_vector(self, sub_pillar_scores):
+        """Sub-pillar scores as a vector in this matrix's column order."""
+        return np.array(
+            [float(sub_pillar_scores.get(sp_id, 0)) for sp_id in self.sub_pillar_ids]
+        )
+
+    def base_scores(self, sub_pillar_scores):
+        """Base (unadjusted) IRI score of every job role."""
+        return self.combined @ self.score_vector(sub_pillar_scores)
+
+    def pillar_scores(self, sub_pillar_scores):
+        """jobs x pillars matrix of pillar scores (0-100)."""
+        weighted = self.sub_weights * self.score_vector(sub_pillar_scores)
+        scores = np.zeros(self.pillar_weights.shape)
+        np.add.at(scores.T, self.sub_pillar_pillar, weighted.T)
+        return scores
+
+    def top_k(self, sub_pillar_scores, k):
+        """
+        The k highest base scores.
+
+        Every job is scored with one matrix-vector product; np.partition
+        finds the k-th best score without sorting the rest, and only the
+        jobs at or above it are sorted. Ties prefer the lower job index,
+        matching a stable full sort.
+
+        Returns:
+            ([(job index, base score)] best first, number of jobs scored)
+        """
+        scores = self.base_scores(sub_pillar_scores)
+        k = min(k, len(scores))
+        if k < 1:
+            return [], 0
+
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth)
+        best = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+        return [(int(index), float(scores[index])) for index in best], len(scores)
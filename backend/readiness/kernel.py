@@ -0,0 +1,924 @@
+"""
+ORM-free IRI scoring kernel.
+
+ScoringKernel holds all of the scoring arithmetic of the calculation engine
+but reads only the plain records defined here, never models or querysets.
+That lets the same code run inside request handlers (through the
+ReadinessCalculator adapter), in process pools, in batch jobs and in
+benchmarks. It must not import Django.
+
+Records are slotted dataclasses so large batches stay compact and can be
+pickled to worker processes.
+
+Arithmetic runs in Decimal by default. numeric_mode='float' runs the same
+code on floats, which is faster and agrees with the Decimal results to 2
+decimal places (see the golden tests in readiness/tests.py).
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+
+@dataclass
+class ExperienceRecord:
+    __slots__ = ('company', 'start_date', 'end_date', 'is_current', 'keyword_hits', 'confidence')
+
+    company: str
+    start_date: date
+    end_date: date
+    is_current: bool
+    keyword_hits: dict
+    confidence: Decimal
+
+
+@dataclass
+class ProjectRecord:
+    __slots__ = ('description', 'github_link', 'live_link', 'keyword_hits', 'confidence')
+
+    description: str
+    github_link: str
+    live_link: str
+    keyword_hits: dict
+    confidence: Decimal
+
+
+@dataclass
+class CertificationRecord:
+    __slots__ = ('issuer', 'expiry_date', 'keyword_hits', 'confidence')
+
+    issuer: str
+    expiry_date: date
+    keyword_hits: dict
+    confidence: Decimal
+
+
+@dataclass
+class VerificationRecord:
+    """A verification request; skill_id is set when it targets one of the profile's skills."""
+
+    __slots__ = ('method', 'status', 'score', 'skill_id')
+
+    method: str
+    status: str
+    score: Decimal
+    skill_id: int
+
+
+@dataclass
+class ProfileRecords:
+    """
+    Everything the kernel reads about one profile.
+
+    skills_by_sub_pillar maps sub-pillar id -> skill ids of the profile's
+    skills in that sub-pillar. skill_confidence maps skill id -> the
+    stored blended verification score (0-100) of that skill; unverified
+    skills may be left out. Experiences, projects and certifications
+    carry their own stored score as confidence (0 when unverified).
+    verification_counts maps (method, status) ->
+    number of the profile's verifications, as VerificationCounter keeps
+    them; pairs with no verification may be left out. Items keep the
+    engine's id order.
+    """
+
+    __slots__ = (
+        'skills_by_sub_pillar', 'skill_confidence', 'experiences', 'projects', 'certifications',
+        'verifications', 'verification_counts', 'today',
+    )
+
+    skills_by_sub_pillar: dict
+    skill_confidence: dict
+    experiences: list
+    projects: list
+    certifications: list
+    verifications: list
+    verification_counts: dict
+    today: date
+
+
+@dataclass
+class PillarRecord:
+    __slots__ = ('id', 'name')
+
+    id: int
+    name: str
+
+
+@dataclass
+class SubPillarRecord:
+    __slots__ = ('id', 'pillar_id', 'name', 'weight')
+
+    id: int
+    pillar_id: int
+    name: str
+    weight: Decimal
+
+
+@dataclass
+class JobRecord:
+    __slots__ = ('id', 'name')
+
+    id: int
+    name: str
+
+
+@dataclass
+class TaxonomyRecords:
+    """
+    The parts of the jobs taxonomy the kernel reads.
+
+    job_pillar_weights and job_sub_pillar_weights map job role id ->
+    {pillar or sub-pillar id: weight_percent}.
+    """
+
+    __slots__ = (
+        'pillars', 'sub_pillars_by_pillar', 'job_pillar_weights', 'job_sub_pillar_weights',
+    )
+
+    pillars: list
+    sub_pillars_by_pillar: dict
+    job_pillar_weights: dict
+    job_sub_pillar_weights: dict
+
+    @classmethod
+    def from_taxonomy(cls, taxonomy):
+        """Records from a jobs.taxonomy.TaxonomySnapshot (or anything shaped like one)."""
+        return cls(
+            pillars=[PillarRecord(pillar.id, pillar.name) for pillar in taxonomy.pillars],
+            sub_pillars_by_pillar={
+                pillar_id: [
+                    SubPillarRecord(sp.id, sp.pillar_id, sp.name, sp.weight)
+                    for sp in sub_pillars
+                ]
+                for pillar_id, sub_pillars in taxonomy.sub_pillars_by_pillar.items()
+            },
+            job_pillar_weights={
+                job_id: dict(weights) for job_id, weights in taxonomy.job_pillar_weights.items()
+            },
+            job_sub_pillar_weights={
+                job_id: dict(weights) for job_id, weights in taxonomy.job_sub_pillar_weights.items()
+            },
+        )
+
+    def pillar_weights_for(self, job_role_id):
+        """Pillar weights (weight_percent) of a job role, keyed by pillar id."""
+        return self.job_pillar_weights.get(job_role_id, {})
+
+    def sub_pillar_weights_for(self, job_role_id):
+        """Job-specific sub-pillar weights of a job role, keyed by sub-pillar id."""
+        return self.job_sub_pillar_weights.get(job_role_id, {})
+
+
+# Share of each verification method in an item's blended confidence
+VERIFICATION_WEIGHTS = {
+    'self': Decimal('0.60'),          # 60% weight for self-verification (quiz)
+    'referral': Decimal('0.30'),      # 30% weight for referral verification
+    'link': Decimal('0.10')           # 10% weight for link/portfolio verification
+}
+
+
+def blend_confidence(verifications):
+    """
+    Blended verification confidence (0-100) of one item.
+
+    The best approved score of each method, weighted by
+    VERIFICATION_WEIGHTS. Pending, rejected and expired requests count 0,
+    so only a full quiz, referral and link together reach 100.
+
+    Args:
+        verifications: VerificationRecords or VerificationRequests of the item
+    """
+    best = {}
+    for verification in verifications:
+        if verification.status == 'approved' and verification.method in VERIFICATION_WEIGHTS:
+            score = Decimal(str(verification.score or 0))
+            best[verification.method] = max(best.get(verification.method, score), score)
+    total = sum((VERIFICATION_WEIGHTS[method] * score for method, score in best.items()), Decimal('0'))
+    return min(total, Decimal('100')).quantize(Decimal('0.01'))
+
+
+def count_verifications(verifications):
+    """{(method, status): count} of VerificationRecords, for ProfileRecords.verification_counts."""
+    counts = {}
+    for verification in verifications:
+        key = (verification.method, verification.status)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+class ProfileChanges:
+    """
+    Hypothetical edits to a profile, for what-if scoring.
+
+    Skills are (sub_pillar_id, skill_id) pairs. Added experiences, projects,
+    certifications and verifications are records; removed ones are indexes
+    into the profile's lists.
+    """
+
+    KINDS = ('experiences', 'projects', 'certifications', 'verifications')
+
+    __slots__ = ('add_skills', 'remove_skills', 'add', 'remove')
+
+    def __init__(self, add_skills=(), remove_skills=(), add=None, remove=None):
+        self.add_skills = list(add_skills)
+        self.remove_skills = list(remove_skills)
+        self.add = add or {}
+        self.remove = remove or {}
+
+    def apply(self, profile):
+        """
+        Apply the edits to ProfileRecords.
+
+        Returns:
+            (new ProfileRecords, ids of the sub-pillars whose score may change)
+        """
+        affected = set()
+
+        skills = {sub_pillar_id: list(ids) for sub_pillar_id, ids in profile.skills_by_sub_pillar.items()}
+        for sub_pillar_id, skill_id in self.remove_skills:
+            if skill_id in skills.get(sub_pillar_id, ()):
+                skills[sub_pillar_id].remove(skill_id)
+                affected.add(sub_pillar_id)
+        for sub_pillar_id, skill_id in self.add_skills:
+            if skill_id not in skills.setdefault(sub_pillar_id, []):
+                skills[sub_pillar_id].append(skill_id)
+                affected.add(sub_pillar_id)
+        skills = {sub_pillar_id: ids for sub_pillar_id, ids in skills.items() if ids}
+
+        items = {}
+        for kind in self.KINDS:
+            current = getattr(profile, kind)
+            removed = set(self.remove.get(kind, ()))
+            added = list(self.add.get(kind, ()))
+            items[kind] = [item for index, item in enumerate(current) if index not in removed] + added
+            if kind != 'verifications':
+                # An item only counts towards the sub-pillars it has keyword hits in
+                for item in [current[index] for index in removed] + added:
+                    affected.update(int(sub_pillar_id) for sub_pillar_id in item.keyword_hits)
+
+        # A skill's confidence is blended again from the verifications that
+        # target it, when they change
+        confidence = dict(profile.skill_confidence)
+        removed = set(self.remove.get('verifications', ()))
+        counts = dict(profile.verification_counts)
+        for verification in [profile.verifications[index] for index in removed]:
+            key = (verification.method, verification.status)
+            counts[key] = counts.get(key, 0) - 1
+        for verification in self.add.get('verifications', ()):
+            key = (verification.method, verification.status)
+            counts[key] = counts.get(key, 0) + 1
+        retargeted = {
+            verification.skill_id
+            for verification in [profile.verifications[index] for index in removed]
+            + list(self.add.get('verifications', ()))
+            if verification.skill_id is not None
+        }
+        for skill_id in retargeted:
+            confidence[skill_id] = blend_confidence(
+                [v for v in items['verifications'] if v.skill_id == skill_id]
+            )
+            affected.update(
+                sub_pillar_id for sub_pillar_id, skill_ids in skills.items() if skill_id in skill_ids
+            )
+
+        records = ProfileRecords(
+            skills_by_sub_pillar=skills, skill_confidence=confidence, verification_counts=counts,
+            today=profile.today, **items
+        )
+        return records, affected
+
+
+class NumberLiterals(dict):
+    """Numeric literals of one type, converted once: n['0.40'] -> Decimal('0.40')."""
+
+    def __init__(self, number):
+        super().__init__()
+        self.number = number
+
+    def __missing__(self, literal):
+        value = self[literal] = self.number(literal)
+        return value
+
+
+NUMERIC_MODES = {
+    'decimal': Decimal,
+    'float': float,
+}
+
+# calculate_iri company_level that scores every level at once
+ALL_LEVELS = 'all'
+
+_literals = {mode: NumberLiterals(number) for mode, number in NUMERIC_MODES.items()}
+
+
+def combine_levels(results):
+    """
+    Fold per-level calculate_iri results into one company_level='all' result.
+
+    Everything but the adjusted score is the same for every level, so it is
+    kept once and the level-specific parts move under 'levels':
+    {'startup': {'iri_score': .., 'company_multiplier': ..}, ...}.
+    """
+    combined = dict(next(iter(results.values())))
+    del combined['iri_score'], combined['company_multiplier']
+    combined['company_level'] = ALL_LEVELS
+    combined['levels'] = {
+        level: {'iri_score': result['iri_score'], 'company_multiplier': result['company_multiplier']}
+        for level, result in results.items()
+    }
+    return combined
+
+
+def effective_sub_pillar_weights(sub_pillars, job_sub_weights):
+    """
+    Relative weights of a pillar's sub-pillars for one job.
+
+    If the job defines any JobSubPillarWeight inside this pillar, those
+    weights replace the defaults for the whole pillar (sub-pillars without
+    an override count as 0). Otherwise SubPillar.weight is used.
+    """
+    if any(sp.id in job_sub_weights for sp in sub_pillars):
+        return {sp.id: job_sub_weights.get(sp.id, 0) for sp in sub_pillars}
+    return {sp.id: sp.weight for sp in sub_pillars}
+
+
+class ScoringKernel:
+    """
+    IRI scoring for one profile against a taxonomy.
+
+    Sub-pillar scores depend only on the profile, so they are memoized per
+    kernel and shared across job roles and company levels.
+    """
+
+    # Verification level weights (impact on score)
+    VERIFICATION_WEIGHTS = VERIFICATION_WEIGHTS
+
+    # Company level multipliers
+    COMPANY_LEVEL_MULTIPLIERS = {
+        'startup': Decimal('1.0'),        # Base level
+        'corporate': Decimal('1.15'),     # 15% higher expectations
+        'leading': Decimal('1.30')        # 30% higher expectations (FAANG-level)
+    }
+
+    def __init__(self, profile, taxonomy, keyword_maps=None, numeric_mode='decimal', sub_pillar_scores=None):
+        """
+        Args:
+            profile: ProfileRecords
+            taxonomy: TaxonomyRecords
+            keyword_maps: (experience, project, certification) keyword tables;
+                defaults to the tables in readiness.keywords
+            numeric_mode: 'decimal' (exact, default) or 'float' (fast)
+            sub_pillar_scores: Already known sub-pillar scores of this profile
+                (in this numeric mode), used instead of recomputing them
+        """
+        if numeric_mode not in NUMERIC_MODES:
+            raise ValueError(f'Unknown numeric mode: {numeric_mode!r}')
+        if keyword_maps is None:
+            from .keywords import EXPERIENCE_KEYWORDS, PROJECT_KEYWORDS, CERTIFICATION_KEYWORDS
+            keyword_maps = (EXPERIENCE_KEYWORDS, PROJECT_KEYWORDS, CERTIFICATION_KEYWORDS)
+        self.profile = profile
+        self.taxonomy = taxonomy
+        self.experience_keywords, self.project_keywords, self.certification_keywords = keyword_maps
+        self.numeric_mode = numeric_mode
+        self.number = NUMERIC_MODES[numeric_mode]
+        self.n = _literals[numeric_mode]
+        self._sub_pillar_scores = dict(sub_pillar_scores or {})
+
+    def with_changes(self, changes):
+        """
+        Kernel for this profile with ProfileChanges applied.
+
+        Only the sub-pillars the changes touch are scored again; the scores
+        this kernel already memoized for the others are carried over.
+        """
+        profile, affected = changes.apply(self.profile)
+        return ScoringKernel(
+            profile,
+            self.taxonomy,
+            keyword_maps=(self.experience_keywords, self.project_keywords, self.certification_keywords),
+            numeric_mode=self.numeric_mode,
+            sub_pillar_scores={
+                sub_pillar_id: score
+                for sub_pillar_id, score in self._sub_pillar_scores.items()
+                if sub_pillar_id not in affected
+            },
+        )
+
+    def calculate_iri(self, job_role, company_level='startup'):
+        """
+        Calculate the complete Industry Readiness Index for one job role.
+
+        Args:
+            job_role: JobRecord (or any object with id and name)
+            company_level: 'startup', 'corporate', 'leading', or 'all'
+                (see combine_levels for the 'all' shape)
+
+        Returns:
+            Same dict as ReadinessCalculator.calculate_iri
+        """
+        if company_level == ALL_LEVELS:
+            return combine_levels(self.calculate_iri_levels(job_role))
+        return self.calculate_iri_levels(job_role, (company_level,))[company_level]
+
+    def calculate_iri_levels(self, job_role, company_levels=None):
+        """
+        calculate_iri for several company levels from one base computation.
+
+        The level only scales the base score by its multiplier, so pillar
+        scores, strengths, gaps and recommendations are computed once.
+
+        Returns:
+            {company_level: calculate_iri result}, every level by default
+        """
+        n = self.n
+        if company_levels is None:
+            company_levels = tuple(self.COMPANY_LEVEL_MULTIPLIERS)
+
+        # Step 1: Get job-pillar weights for this role
+        job_weights = self._get_job_weights(job_role)
+        if not job_weights:
+            return {level: self.empty_result(level) for level in company_levels}
+
+        job_sub_weights = self.taxonomy.sub_pillar_weights_for(job_role.id)
+
+        # Step 2: Calculate pillar scores
+        pillar_scores = {}
+        total_weighted_score = n['0']
+
+        for pillar in self.taxonomy.pillars:
+            pillar_score = self.pillar_score(pillar, job_sub_weights)
+            weight = job_weights.get(pillar.id, n['0'])
+            weighted_contribution = (pillar_score * weight) / n['100']
+
+            pillar_scores[pillar.id] = {
+                'name': pillar.name,
+                'score': float(pillar_score),
+                'weight_percent': float(weight),
+                'weighted_contribution': float(weighted_contribution)
+            }
+
+            total_weighted_score += weighted_contribution
+
+        # Step 3: Identify strengths and gaps
+        strengths, gaps = self._identify_strengths_gaps(pillar_scores)
+
+        # Step 4: Build verification impact summary
+        verification_impact = self.verification_impact()
+        recommendations = self._generate_recommendations(gaps, job_role)
+        valid_until = self.valid_until()
+
+        # Step 5: Apply each company level adjustment
+        results = {}
+        for company_level in company_levels:
+            company_multiplier = self.number(self.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0')))
+            adjusted_score = min(total_weighted_score * company_multiplier, n['100'])
+
+            results[company_level] = {
+                'iri_score': float(adjusted_score),
+                'base_score': float(total_weighted_score),
+                'breakdown': pillar_scores,
+                'verification_impact': verification_impact,
+                'company_level': company_level,
+                'company_multiplier': float(company_multiplier),
+                'strengths': strengths,
+                'gaps': gaps,
+                'recommendations': recommendations,
+                'valid_until': valid_until
+            }
+        return results
+
+    def valid_until(self):
+        """
+        First day on which this profile's scores can change without an edit,
+        or None if they never drift.
+
+        A certification loses half its value the day after it expires, and
+        an ongoing experience gains 0.1 year every ~36 days until its years
+        score is capped. Only items relevant to some sub-pillar count.
+        """
+        today = self.profile.today
+        horizons = []
+        for cert in self.profile.certifications:
+            if cert.keyword_hits and cert.expiry_date and cert.expiry_date >= today:
+                horizons.append(cert.expiry_date + timedelta(days=1))
+        for exp in self.profile.experiences:
+            if exp.keyword_hits and exp.start_date and (exp.is_current or not exp.end_date):
+                change = self._next_years_change(exp.start_date)
+                if change:
+                    horizons.append(change)
+        return min(horizons, default=None)
+
+    def _next_years_change(self, start_date):
+        """Next day on which an ongoing experience's rounded years (below the cap) change."""
+        def years_on(day):
+            return max(0, round((day - start_date).days / 365.25, 1))
+
+        today = self.profile.today
+        years = years_on(today)
+        # years_score = min(years * 10, 50) no longer moves past 5 years
+        if years >= 5:
+            return None
+        day = max(today, start_date) + timedelta(days=1)
+        while years_on(day) == years:
+            day += timedelta(days=1)
+        return day
+
+    def sub_pillar_scores(self):
+        """Score of every sub-pillar for this profile, keyed by sub-pillar id."""
+        return {
+            sub_pillar.id: self.sub_pillar_score(sub_pillar)
+            for sub_pillars in self.taxonomy.sub_pillars_by_pillar.values()
+            for sub_pillar in sub_pillars
+        }
+
+    def pillar_score(self, pillar, job_sub_weights=None):
+        """
+        Calculate score for a single pillar.
+
+        Formula: Pillar_Score = Σ(SubPillar_Score × SubPillar_Weight) / Σ(SubPillar_Weight)
+
+        SubPillar_Weight is the job's JobSubPillarWeight when the job defines
+        any for this pillar, otherwise SubPillar.weight.
+        """
+        n = self.n
+        sub_pillars = self.taxonomy.sub_pillars_by_pillar.get(pillar.id, [])
+
+        if not sub_pillars:
+            return n['0']
+
+        total_weighted_score = n['0']
+        total_weight = n['0']
+        weights = effective_sub_pillar_weights(sub_pillars, job_sub_weights or {})
+
+        for sub_pillar in sub_pillars:
+            sub_score = self.sub_pillar_score(sub_pillar)
+            weight = self.number(weights[sub_pillar.id])
+
+            total_weighted_score += sub_score * weight
+            total_weight += weight
+
+        if total_weight == 0:
+            return n['0']
+
+        return total_weighted_score / total_weight
+
+    def sub_pillar_score(self, sub_pillar):
+        """
+        Calculate score for a sub-pillar (0-100).
+
+        Components:
+        1. Skills score (40% weight)
+        2. Experience score (30% weight)
+        3. Project score (20% weight)
+        4. Certification score (10% weight)
+        """
+        n = self.n
+        if sub_pillar.id in self._sub_pillar_scores:
+            return self._sub_pillar_scores[sub_pillar.id]
+
+        # Get component scores
+        skills_score = self._calculate_skills_score(sub_pillar)
+        experience_score = self._calculate_experience_score(sub_pillar)
+        project_score = self._calculate_project_score(sub_pillar)
+        certification_score = self._calculate_certification_score(sub_pillar)
+
+        # Weighted average
+        total_score = (
+            (skills_score * n['0.40']) +
+            (experience_score * n['0.30']) +
+            (project_score * n['0.20']) +
+            (certification_score * n['0.10'])
+        )
+
+        score = min(total_score, n['100'])
+        self._sub_pillar_scores[sub_pillar.id] = score
+        return score
+
+    def _calculate_skills_score(self, sub_pillar):
+        """
+        Calculate skill-based score for a sub-pillar.
+
+        Scores each skill by its stored verification confidence (see
+        blend_confidence): a full quiz alone is worth 60 points, a
+        referral 30 and a link 10. Unverified skills get 20 points, and
+        verification never scores a skill below that.
+        """
+        n = self.n
+        skills = self.profile.skills_by_sub_pillar.get(sub_pillar.id, [])
+
+        if not skills:
+            return n['0']
+
+        total_score = n['0']
+        confidence = self.profile.skill_confidence
+
+        for skill in skills:
+            total_score += max(n['20'], self.number(confidence.get(skill, 0)))
+
+        # Average across all skills (normalize to 0-100)
+        avg_score = total_score / len(skills)
+        return min(avg_score, n['100'])
+
+    def _calculate_experience_score(self, sub_pillar):
+        """
+        Calculate experience-based score for a sub-pillar.
+
+        Considers:
+        - Years of relevant experience
+        - Job titles matching sub-pillar keywords
+        - Company tier/prestige
+        - Verification confidence (see _confidence_bonus)
+        """
+        n = self.n
+        experiences = self.profile.experiences
+
+        if not experiences:
+            return n['0']
+
+        total_score = n['0']
+        relevant_count = 0
+
+        for exp in experiences:
+            # Match experience based on title and description keywords
+            relevance_score = self._keyword_relevance(exp, sub_pillar, self.experience_keywords)
+
+            if relevance_score > 0:
+                # Calculate years of experience
+                years = self._calculate_years(exp.start_date, exp.end_date, exp.is_current)
+                years_score = min(self.number(years) * n['10'], n['50'])
+
+                # Company tier bonus
+                company_bonus = self._get_company_tier_bonus(exp.company)
+
+                total_score += years_score + company_bonus + self._confidence_bonus(exp)
+                relevant_count += 1
+
+        if relevant_count == 0:
+            return n['0']
+
+        avg_score = total_score / relevant_count
+        return min(avg_score, n['100'])
+
+    def _calculate_project_score(self, sub_pillar):
+        """
+        Calculate project-based score for a sub-pillar.
+
+        Considers:
+        - Project complexity (description length)
+        - Technologies used matching sub-pillar
+        - GitHub link
+        - Live deployment
+        - Verification confidence (see _confidence_bonus)
+        """
+        n = self.n
+        projects = self.profile.projects
+
+        if not projects:
+            return n['0']
+
+        total_score = n['0']
+        relevant_count = 0
+
+        for project in projects:
+            # Match project based on technologies and description
+            relevance_score = self._keyword_relevance(project, sub_pillar, self.project_keywords)
+
+            if relevance_score > 0:
+                # Score based on complexity
+                complexity_score = self._calculate_project_complexity(project)
+                # GitHub credibility
+                github_score = self._get_github_score(project.github_link)
+                # Deployment bonus
+                deployment_bonus = n['15'] if project.live_link else n['0']
+
+                total_score += complexity_score + github_score + deployment_bonus + self._confidence_bonus(project)
+                relevant_count += 1
+
+        if relevant_count == 0:
+            return n['0']
+
+        avg_score = total_score / relevant_count
+        return min(avg_score, n['100'])
+
+    def _calculate_certification_score(self, sub_pillar):
+        """
+        Calculate certification-based score for a sub-pillar.
+
+        Considers:
+        - Certification relevance to sub-pillar
+        - Certification prestige level
+        - Expiration status
+        - Verification confidence (see _confidence_bonus)
+        """
+        n = self.n
+        certifications = self.profile.certifications
+
+        if not certifications:
+            return n['0']
+
+        total_score = n['0']
+        relevant_count = 0
+
+        for cert in certifications:
+            # Match certification based on name and issuer
+            relevance_score = self._keyword_relevance(cert, sub_pillar, self.certification_keywords)
+
+            if relevance_score > 0:
+                # Base score for certification
+                base_score = n['60']
+
+                # Prestige multiplier (AWS, GCP, Azure, etc.)
+                prestige_multiplier = self._get_certification_prestige(cert.issuer)
+
+                # Check expiration
+                if cert.expiry_date and cert.expiry_date < self.profile.today:
+                    base_score *= n['0.5']  # 50% penalty if expired
+
+                total_score += base_score * prestige_multiplier + self._confidence_bonus(cert)
+                relevant_count += 1
+
+        if relevant_count == 0:
+            return n['0']
+
+        avg_score = total_score / relevant_count
+        return min(avg_score, n['100'])
+
+    def _get_job_weights(self, job_role):
+        """Get pillar weights for a specific job role."""
+        weights = self.taxonomy.pillar_weights_for(job_role.id)
+
+        return {
+            pillar_id: self.number(str(weight_percent))
+            for pillar_id, weight_percent in weights.items()
+        }
+
+    def _keyword_relevance(self, item, sub_pillar, keyword_map):
+        """Share of a sub-pillar's keywords found in an item (0-1 scale)."""
+        n = self.n
+        matches = item.keyword_hits.get(str(sub_pillar.id), 0)
+        if not matches:
+            return n['0']
+
+        keywords_list = keyword_map.get(sub_pillar.name, [])
+        return min(self.number(matches) / max(self.number(len(keywords_list)), n['1']), n['1'])
+
+    def _confidence_bonus(self, item):
+        """Verification bonus of an experience, project or certification (0-20)."""
+        n = self.n
+        # A fully verified item (confidence 100) earns the whole 20 points
+        return self.number(item.confidence) * n['0.20']
+
+    def _calculate_project_complexity(self, project):
+        """Calculate project complexity score (0-50)."""
+        n = self.n
+        # Simplified: based on description length and features count
+        return min(self.number(len(project.description or '')) / n['20'], n['50'])
+
+    def _get_github_score(self, github_url):
+        """Get GitHub credibility score (0-20)."""
+        n = self.n
+        # In production, would fetch actual GitHub stats
+        if not github_url:
+            return n['0']
+        return n['10']  # Base score for having GitHub link
+
+    def _get_company_tier_bonus(self, company_name):
+        """Get bonus score for company tier (0-30)."""
+        n = self.n
+        faang = ['google', 'apple', 'facebook', 'amazon', 'microsoft', 'meta']
+        startups = ['startup', 'inc', 'labs', 'ai']
+
+        if any(x in company_name.lower() for x in faang):
+            return n['30']
+        elif any(x in company_name.lower() for x in startups):
+            return n['15']
+        else:
+            return n['10']
+
+    def _get_certification_prestige(self, issuer):
+        """Get certification prestige multiplier."""
+        n = self.n
+        high_prestige = ['aws', 'gcp', 'azure', 'oracle', 'cisco', 'linux']
+        medium_prestige = ['coursera', 'udacity', 'google', 'microsoft']
+
+        issuer_lower = issuer.lower() if issuer else ''
+
+        if any(x in issuer_lower for x in high_prestige):
+            return n['1.5']
+        elif any(x in issuer_lower for x in medium_prestige):
+            return n['1.2']
+        else:
+            return n['1.0']
+
+    def _calculate_years(self, start_date, end_date, is_current):
+        """Calculate years of experience between two dates."""
+        if not start_date:
+            return 0
+
+        end = end_date if end_date and not is_current else self.profile.today
+
+        years = (end - start_date).days / 365.25
+        return max(0, round(years, 1))
+
+    def verification_impact(self):
+        """Calculate how verification activities impact the overall score."""
+        counts = self.profile.verification_counts
+
+        total_count = sum(counts.values())
+        verified_count = sum(n for (method, status), n in counts.items() if status == 'approved')
+
+        by_type = {}
+        for vtype in ['self', 'referral', 'link']:
+            count = sum(n for (method, status), n in counts.items() if method == vtype)
+            verified = counts.get((vtype, 'approved'), 0)
+
+            by_type[vtype] = {
+                'total': count,
+                'verified': verified,
+                'percentage': float((verified / count * 100) if count > 0 else 0)
+            }
+
+        return {
+            'total_verifications': total_count,
+            'verified_count': verified_count,
+            'verification_rate': float((verified_count / total_count * 100) if total_count > 0 else 0),
+            'by_type': by_type
+        }
+
+    def _identify_strengths_gaps(self, pillar_scores):
+        """
+        Identify top 3 strengths and top 3 gaps.
+
+        Returns:
+            (strengths, gaps) - lists of dicts with pillar name and score
+        """
+        sorted_pillars = sorted(
+            pillar_scores.items(),
+            key=lambda x: x[1]['score'],
+            reverse=True
+        )
+
+        strengths = [
+            {
+                'pillar': item[1]['name'],
+                'score': item[1]['score']
+            }
+            for item in sorted_pillars[:3]
+        ]
+
+        gaps = [
+            {
+                'pillar': item[1]['name'],
+                'score': item[1]['score']
+            }
+            for item in sorted_pillars[-3:]
+        ]
+
+        return strengths, gaps
+
+    def _generate_recommendations(self, gaps, job_role):
+        """Generate actionable recommendations based on gaps."""
+        recommendations = []
+
+        for gap in gaps:
+            pillar_name = gap['pillar']
+            recommendations.append({
+                'area': pillar_name,
+                'priority': 'high' if gap['score'] < 30 else 'medium',
+                'suggestion': self._get_recommendation_text(pillar_name, job_role)
+            })
+
+        return recommendations
+
+    def _get_recommendation_text(self, pillar_name, job_role):
+        """Get specific recommendation text for a pillar."""
+        recommendations_map = {
+            'Technical Skills': f"Strengthen your technical skills in areas required for {job_role.name}. Consider online courses or side projects.",
+            'Cognitive Abilities': "Improve problem-solving and analytical thinking through coding challenges and algorithm practice.",
+            'Behavioral Competencies': "Develop communication, teamwork, and leadership skills through group projects and presentations.",
+            'Domain Knowledge': f"Increase your understanding of IT industry trends and best practices relevant to {job_role.name}."
+        }
+
+        return recommendations_map.get(pillar_name, "Work on improving this area.")
+
+    @classmethod
+    def empty_result(cls, company_level='startup'):
+        """Return empty result when profile is incomplete."""
+        company_multiplier = cls.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0'))
+        return {
+            'iri_score': 0,
+            'base_score': 0,
+            'breakdown': [],
+            'verification_impact': {
+                'total_verifications': 0,
+                'verified_count': 0,
+                'verification_rate': 0,
+                'by_type': {}
+            },
+            'company_level': company_level,
+            'company_multiplier': float(company_multiplier),
+            'strengths': [],
+            'gaps': [],
+            'recommendations': [],
+            'error': 'Profile incomplete. Please add skills, experience, and projects.'
+        }
@@ -0,0 +1,137 @@
+"""
+Keyword relevance index for experiences, projects and certifications.
+
+Each item's text is tokenized on word boundaries once, when it is saved, and
+the keyword hits are stored on the row as {sub_pillar_id: match_count}. The
+calculation engine then reads relevance with a dict lookup instead of
+lower-casing and substring-scanning every (item, sub-pillar) pair.
+
+Word-boundary matching also stops false hits such as 'go' in 'google' or
+'sql' in 'postgresql'. A few common suffixes are folded so 'teams',
+'leading' and 'analyzed' still match 'team', 'lead' and 'analyze'.
+"""
+
+import re
+
+
+EXPERIENCE_KEYWORDS = {
+    'Programming Languages': ['python', 'java', 'javascript', 'cpp', 'c#', 'go', 'rust'],
+    'Frameworks & Libraries': ['react', 'django', 'flask', 'spring', 'node'],
+    'Databases': ['sql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch'],
+    'DevOps & Cloud': ['aws', 'gcp', 'azure', 'docker', 'kubernetes', 'ci/cd'],
+    'Tools & Technologies': ['git', 'jira', 'linux', 'windows', 'mac'],
+    'Problem Solving': ['debug', 'troubleshoot', 'solve', 'optimize', 'performance'],
+    'Logical Thinking': ['algorithm', 'logic', 'architecture', 'design', 'pattern'],
+    'Learning Agility': ['learn', 'training', 'certification', 'course', 'upskill'],
+    'Analytical Thinking': ['analyze', 'analytics', 'data', 'metrics', 'report'],
+    'Research Ability': ['research', 'experiment', 'innovation', 'poc', 'prototype'],
+    'Communication': ['present', 'documentation', 'communicate', 'write', 'speak'],
+    'Teamwork & Collaboration': ['team', 'collaborate', 'mentor', 'lead', 'coordinate'],
+    'Leadership': ['lead', 'manage', 'direct', 'oversee', 'responsible'],
+    'Adaptability': ['adapt', 'flexible', 'change', 'pivot', 'agile'],
+    'Reliability & Work Ethic': ['deliver', 'reliable', 'consistent', 'deadline', 'quality'],
+}
+
+PROJECT_KEYWORDS = {
+    'Programming Languages': ['python', 'javascript', 'java', 'typescript', 'kotlin'],
+    'Frameworks & Libraries': ['react', 'vue', 'angular', 'django', 'fastapi'],
+    'Databases': ['postgresql', 'mongodb', 'mysql', 'redis', 'dynamodb'],
+    'DevOps & Cloud': ['docker', 'kubernetes', 'aws', 'gcp', 'terraform'],
+    'Tools & Technologies': ['git', 'api', 'rest', 'graphql', 'websocket'],
+}
+
+CERTIFICATION_KEYWORDS = {
+    'Programming Languages': ['python', 'java', 'javascript'],
+    'Frameworks & Libraries': ['react', 'django', 'spring'],
+    'Databases': ['sql', 'mongodb', 'nosql'],
+    'DevOps & Cloud': ['aws', 'gcp', 'azure', 'devops'],
+    'Tools & Technologies': ['linux', 'kubernetes'],
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9#+]*")
+
+# Suffixes folded back to a stem; 'e' is restored for 'analyzed' -> 'analyze'
+SUFFIXES = ('ments', 'ment', 'ing', 'ers', 'er', 'ed', 'es', 's')
+RESTORE_E = ('ing', 'ers', 'er', 'ed')
+MIN_STEM_LENGTH = 3
+
+
+def tokenize(text):
+    """Lower-cased word tokens of `text`, plus their folded stems."""
+    tokens = set()
+    for token in TOKEN_RE.findall((text or '').lower()):
+        tokens.add(token)
+        for suffix in SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+                stem = token[:-len(suffix)]
+                tokens.add(stem)
+                if suffix in RESTORE_E:
+                    tokens.add(stem + 'e')
+                break
+    return tokens
+
+
+def _keyword_tokens(keyword):
+    return TOKEN_RE.findall(keyword.lower())
+
+
+def keyword_hits(text, keyword_map, sub_pillar_ids):
+    """
+    Count keyword matches per sub-pillar.
+
+    A keyword matches when all of its tokens occur in the text ('ci/cd'
+    needs both 'ci' and 'cd').
+
+    Args:
+        text: Text to index
+        keyword_map: {sub_pillar_name: [keywords]}
+        sub_pillar_ids: {sub_pillar_name: sub_pillar_id}
+
+    Returns:
+        {str(sub_pillar_id): match_count}, omitting sub-pillars with no match
+    """
+    tokens = tokenize(text)
+    hits = {}
+    for name, keywords in keyword_map.items():
+        sub_pillar_id = sub_pillar_ids.get(name)
+        if sub_pillar_id is None:
+            continue
+        matches = sum(
+            1 for keyword in keywords
+            if all(token in tokens for token in _keyword_tokens(keyword))
+        )
+        if matches:
+            hits[str(sub_pillar_id)] = matches
+    return hits
+
+
+def experience_text(experience):
+    return f"{experience.role_title} {experience.description}"
+
+
+def project_text(project):
+    return f"{project.title} {project.description} {project.technologies}"
+
+
+def certification_text(certification):
+    return f"{certification.name} {certification.issuer}"
+
+
+INDEXED_TEXT = {
+    'Experience': (experience_text, EXPERIENCE_KEYWORDS),
+    'Project': (project_text, PROJECT_KEYWORDS),
+    'Certification': (certification_text, CERTIFICATION_KEYWORDS),
+}
+
+
+def index_item(item, sub_pillar_ids=None):
+    """Keyword hits for an Experience, Project or Certification instance."""
+    if sub_pillar_ids is None:
+        # Imported lazily so the keyword tables stay usable without Django
+        from jobs.taxonomy import get_taxonomy
+        sub_pillar_ids = {
+            name: sub_pillar.id
+            for name, sub_pillar in get_taxonomy().sub_pillar_by_name.items()
+        }
+    text_for, keyword_map = INDEXED_TEXT[type(item).__name__]
+    return keyword_hits(text_for(item), keyword_map, sub_pillar_ids)
@@ -0,0 +1,77 @@
+"""
+Django management command to micro-benchmark the scoring kernel.
+
+Scores a corpus of generated profiles (readiness.synthetic) against every
+job role and company level in each numeric mode, reports the time per
+profile and the float/Decimal speedup, and checks that both modes agree to
+2 decimal places. Touches no database.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from readiness import synthetic
+from readiness.kernel import ScoringKernel, NUMERIC_MODES
+
+
+LEVELS = tuple(ScoringKernel.COMPANY_LEVEL_MULTIPLIERS)
+
+
+def score_corpus(profiles, taxonomy, jobs, numeric_mode):
+    """iri_score of every (profile, job, level), one kernel per profile."""
+    scores = []
+    for profile in profiles:
+        kernel = ScoringKernel(profile, taxonomy, numeric_mode=numeric_mode)
+        for job in jobs:
+            for level in LEVELS:
+                scores.append(kernel.calculate_iri(job, level)['iri_score'])
+    return scores
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the scoring kernel in Decimal and float mode'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=200, help='Generated profiles to score')
+        parser.add_argument('--size', type=int, help='Items of each kind per profile (random when omitted)')
+        parser.add_argument('--jobs', type=int, default=10, help='Generated job roles')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per mode; the best is reported')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['profiles'] < 1 or options['repeat'] < 1 or options['jobs'] < 1:
+            raise CommandError('--profiles, --jobs and --repeat must be positive')
+
+        taxonomy = synthetic.make_taxonomy(options['seed'], options['jobs'])
+        jobs = synthetic.make_jobs(taxonomy)
+        profiles = synthetic.make_profiles(taxonomy, options['profiles'], options['seed'], options['size'])
+        calculations = len(profiles) * len(jobs) * len(LEVELS)
+
+        self.stdout.write(self.style.HTTP_INFO(
+            f'Scoring {len(profiles)} profile(s) x {len(jobs)} job(s) x {len(LEVELS)} level(s), '
+            f'best of {options["repeat"]}...'
+        ))
+
+        best = {}
+        scores = {}
+        for mode in NUMERIC_MODES:
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                scores[mode] = score_corpus(profiles, taxonomy, jobs, mode)
+                timings.append(time.perf_counter() - started)
+            best[mode] = min(timings)
+            self.stdout.write(
+                f'  {mode:<8} {best[mode]:.3f}s  '
+                f'{best[mode] / len(profiles) * 1e6:.0f} µs/profile  '
+                f'{calculations / best[mode]:.0f} calculate_iri/s'
+            )
+
+        max_error = max(abs(a - b) for a, b in zip(scores['decimal'], scores['float']))
+        self.stdout.write(f'  max |decimal - float| iri_score: {max_error:.2e}')
+        if max_error >= 0.005:
+            raise CommandError('float mode disagrees with Decimal mode at 2 decimal places')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ float mode is {best["decimal"] / best["float"]:.2f}x faster than Decimal'
+        ))
@@ -0,0 +1,40 @@
+"""
+Django management command that keeps materialized readiness scores fresh.
+
+Drains the ReadinessRecompute queue filled by profile and verification
+writes, recomputing every job role x company level score for each queued
+profile and bulk-upserting the ReadinessScore rows.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from readiness.services import drain_recompute_queue
+
+
+class Command(BaseCommand):
+    help = 'Recompute readiness scores for profiles queued by profile/verification changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Profiles recomputed per queue read')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(self.style.HTTP_INFO('Processing readiness recompute queue...'))
+
+        while True:
+            close_old_connections()
+            processed = drain_recompute_queue(batch_size)
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f'✓ Recomputed {processed} profile(s)'))
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,21 @@
+"""
+Django management command to recount the cohort score sketches.
+
+The sketches behind percentile ranks are updated incrementally whenever
+scores are written, but rows removed by cascades (deleted profiles or job
+roles) are not subtracted. This recounts every sketch from the
+ReadinessScore and PillarScore tables. Run it once after deploying
+sketches onto existing scores, and periodically afterwards.
+"""
+from django.core.management.base import BaseCommand
+
+from readiness.sketches import rebuild_sketches
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the score histograms used for cohort percentile ranks'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO('Rebuilding cohort score sketches...'))
+        count = rebuild_sketches()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt {count} sketch(es)'))
@@ -0,0 +1,59 @@
+"""
+Django management command to rebuild the keyword relevance index
+(keyword_hits) on experiences, projects and certifications.
+
+Run once after migrating profiles past 0002_keyword_hits, which adds the
+field empty, and again after changing the keyword tables in
+readiness/keywords.py or renaming sub-pillars; normal saves keep the index
+current on their own. Only items whose hits changed are written, and since
+bulk_update sends no signals their profiles' revisions are bumped here and the
+profiles queued for a readiness recompute.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.taxonomy import get_taxonomy
+from profiles.models import Experience, Project, Certification
+from profiles.signals import bump_revision, deferred_revision_bumps
+from readiness.keywords import index_item
+from readiness.services import request_recomputes
+
+
+class Command(BaseCommand):
+    help = 'Rebuild keyword_hits for experiences, projects and certifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sub_pillar_ids = {
+            name: sub_pillar.id
+            for name, sub_pillar in get_taxonomy().sub_pillar_by_name.items()
+        }
+
+        profile_ids = set()
+        with transaction.atomic(), deferred_revision_bumps():
+            for model in (Experience, Project, Certification):
+                batch = []
+                total = 0
+                for item in model.objects.iterator(chunk_size=batch_size):
+                    keyword_hits = index_item(item, sub_pillar_ids)
+                    if item.keyword_hits == keyword_hits:
+                        continue
+                    item.keyword_hits = keyword_hits
+                    batch.append(item)
+                    bump_revision(item.profile_id)
+                    profile_ids.add(item.profile_id)
+                    if len(batch) >= batch_size:
+                        model.objects.bulk_update(batch, ['keyword_hits'])
+                        total += len(batch)
+                        batch = []
+                if batch:
+                    model.objects.bulk_update(batch, ['keyword_hits'])
+                    total += len(batch)
+
+                self.stdout.write(self.style.SUCCESS(f'✓ {model.__name__}: {total} reindexed'))
+            request_recomputes(profile_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Queued {len(profile_ids)} profile(s) for recompute'))
@@ -0,0 +1,182 @@
+"""
+Django management command to rescore every student profile.
+
+Streams profile ids in chunks and scores them across a multiprocessing pool.
+Each worker loads its chunk with ProfileSnapshot.load_many (a fixed number
+of queries per chunk) and bulk-upserts the resulting ReadinessScore rows,
+together with their PillarScore rows and the SubPillarScore rows used for
+candidate ranking.
+Use it after a weight change. As a nightly job, run it with --expired to
+rescore only the profiles whose scores reached their valid_until day
+(a certification expired or an ongoing job added time), using the
+valid_until index instead of rescoring everyone.
+"""
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from jobs.taxonomy import get_taxonomy
+from profiles.models import StudentProfile
+from readiness.calculation_engine import ProfileSnapshot, ReadinessCalculator
+from readiness.models import ReadinessScore, ReadinessRecompute
+from readiness.services import (
+    build_score_rows,
+    build_pillar_rows,
+    build_sub_pillar_rows,
+    bulk_upsert_scores,
+    replace_pillar_scores,
+    replace_sub_pillar_scores,
+)
+
+
+def _init_worker():
+    """Pool initializer: make Django usable in the child process."""
+    import django
+    django.setup()
+
+
+def score_chunk(profile_ids, job_role_ids=None):
+    """
+    Score one chunk of profiles and upsert their ReadinessScore rows.
+
+    Returns:
+        (profiles scored, rows written)
+    """
+    started_at = timezone.now()
+    taxonomy = get_taxonomy()
+    job_roles = taxonomy.active_job_roles
+    if job_role_ids:
+        job_roles = [job for job in job_roles if job.id in job_role_ids]
+
+    profiles = list(StudentProfile.objects.filter(id__in=profile_ids).select_related('user'))
+    snapshots = ProfileSnapshot.load_many(profiles, taxonomy)
+
+    rows = []
+    pillar_rows = []
+    sub_pillar_rows = []
+    for profile in profiles:
+        calculator = ReadinessCalculator(profile.user, profile=profile, snapshot=snapshots[profile.id])
+        rows.extend(build_score_rows(profile, job_roles, calculator=calculator))
+        pillar_rows.extend(build_pillar_rows(profile, calculator, job_role_ids))
+        if not job_role_ids:
+            sub_pillar_rows.extend(build_sub_pillar_rows(profile, calculator))
+    bulk_upsert_scores(rows)
+    replace_pillar_scores(profile_ids, pillar_rows, job_role_ids)
+
+    # A full rescore satisfies any recompute queued before this chunk started
+    if not job_role_ids:
+        replace_sub_pillar_scores(profile_ids, sub_pillar_rows)
+        ReadinessRecompute.objects.filter(
+            profile_id__in=profile_ids,
+            requested_at__lte=started_at,
+        ).delete()
+
+    return len(profiles), len(rows)
+
+
+def _score_chunk_star(args):
+    return score_chunk(*args)
+
+
+class Command(BaseCommand):
+    help = 'Rescore all student profiles in parallel and store ReadinessScore rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (1 scores in this process)')
+        parser.add_argument('--chunk-size', type=int, default=200,
+                            help='Profiles per worker task')
+        parser.add_argument('--only-stale', action='store_true',
+                            help='Only profiles with a pending recompute or scores from an older '
+                                 'taxonomy or profile revision')
+        parser.add_argument('--expired', action='store_true',
+                            help='Only profiles with scores past their valid_until day')
+        parser.add_argument('--job-role', help='Only rescore this job role (id or name)')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size < 1 or options['jobs'] < 1:
+            raise CommandError('--jobs and --chunk-size must be positive')
+
+        job_role_ids = None
+        if options['job_role']:
+            job_role_ids = self._resolve_job_role(options['job_role'])
+
+        profile_ids = self._profile_ids(options['only_stale'], options['expired'])
+        total = profile_ids.count()
+        self.stdout.write(self.style.HTTP_INFO(
+            f'Scoring {total} profile(s) with {options["jobs"]} worker(s), chunk size {chunk_size}...'
+        ))
+
+        tasks = (
+            (chunk, job_role_ids)
+            for chunk in self._chunks(profile_ids.iterator(chunk_size=chunk_size), chunk_size)
+        )
+
+        started = time.monotonic()
+        scored = written = 0
+        for profiles, rows in self._run(tasks, options['jobs']):
+            scored += profiles
+            written += rows
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'  {scored}/{total} profiles, {written} scores '
+                f'({scored / elapsed:.1f} profiles/s, {written / elapsed:.1f} scores/s)'
+            )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Scored {scored} profile(s), {written} score row(s) in {elapsed:.1f}s'
+        ))
+
+    def _run(self, tasks, jobs):
+        if jobs == 1:
+            for task in tasks:
+                yield _score_chunk_star(task)
+            return
+
+        # Forked children must not share the parent's database sockets
+        connections.close_all()
+        with multiprocessing.Pool(jobs, initializer=_init_worker) as pool:
+            yield from pool.imap_unordered(_score_chunk_star, tasks)
+
+    def _profile_ids(self, only_stale, expired=False):
+        profiles = StudentProfile.objects.order_by('id')
+        if expired:
+            drifted = ReadinessScore.objects.filter(
+                profile=OuterRef('pk'), valid_until__lte=timezone.now().date()
+            )
+            profiles = profiles.filter(Exists(drifted))
+        if only_stale:
+            fingerprint = get_taxonomy().fingerprint
+            fresh = ReadinessScore.objects.filter(profile=OuterRef('pk'), taxonomy_fingerprint=fingerprint)
+            # The same freshness check as load_stored_scores
+            outdated = ReadinessScore.objects.filter(profile=OuterRef('pk')).filter(
+                ~Q(taxonomy_fingerprint=fingerprint) | ~Q(revision=OuterRef('revision'))
+            )
+            profiles = profiles.filter(
+                Q(readiness_recompute__isnull=False) | ~Exists(fresh) | Exists(outdated)
+            )
+        return profiles.values_list('id', flat=True)
+
+    def _resolve_job_role(self, value):
+        for job in get_taxonomy().active_job_roles:
+            if str(job.id) == value or job.name == value:
+                return {job.id}
+        raise CommandError(f'Active job role not found: {value}')
+
+    @staticmethod
+    def _chunks(iterable, size):
+        chunk = []
+        for item in iterable:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.28 on 2026-10-17 06:55
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_keyword_hits'),
+        ('readiness', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readinessscore',
+            name='base_score',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AddField(
+            model_name='readinessscore',
+            name='details',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='readinessscore',
+            name='revision',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='readinessscore',
+            name='taxonomy_fingerprint',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.CreateModel(
+            name='ReadinessRecompute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('requested_at', models.DateTimeField(db_index=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='readiness_recompute', to='profiles.studentprofile')),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:11
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_subpillar_weight'),
+        ('profiles', '0003_profile_revision'),
+        ('readiness', '0002_materialized_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubPillarScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sub_pillar_scores', to='profiles.studentprofile')),
+                ('sub_pillar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_scores', to='jobs.subpillar')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sub_pillar', '-score', 'profile'], name='readiness_subpillar_rank')],
+                'unique_together': {('profile', 'sub_pillar')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:14
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_profile_revision'),
+        ('jobs', '0002_subpillar_weight'),
+        ('readiness', '0003_sub_pillar_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PillarScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('job_role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pillar_scores', to='jobs.jobrole')),
+                ('pillar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_scores', to='jobs.pillar')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pillar_scores', to='profiles.studentprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job_role', 'pillar', 'score'], name='readiness_pillar_score')],
+                'unique_together': {('profile', 'job_role', 'pillar')},
+            },
+        ),
+    ]
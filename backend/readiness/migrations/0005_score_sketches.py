@@ -0,0 +1,31 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_subpillar_weight'),
+        ('readiness', '0004_pillar_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company_level', models.CharField(blank=True, choices=[('startup', 'Startup'), ('corporate', 'Corporate'), ('leading', 'Leading')], max_length=20)),
+                ('pillar_key', models.PositiveIntegerField(default=0)),
+                ('counts', models.JSONField(default=list)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_sketches', to='jobs.jobrole')),
+                ('pillar', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='score_sketches', to='jobs.pillar')),
+            ],
+            options={
+                'unique_together': {('job_role', 'company_level', 'pillar_key')},
+            },
+        ),
+    ]
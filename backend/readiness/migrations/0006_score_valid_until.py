@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('readiness', '0005_score_sketches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readinessscore',
+            name='valid_until',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
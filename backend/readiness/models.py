@@ -1,7 +1,7 @@
 ﻿from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
-from jobs.models import JobRole
+from jobs.models import JobRole, Pillar, SubPillar
 from profiles.models import StudentProfile
 
 
@@ -32,7 +32,21 @@ class ReadinessScore(models.Model):
         default=0,
         validators=[MinValueValidator(0), MaxValueValidator(100)],
     )
+    base_score = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=0,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+    )
     pillar_breakdown = models.JSONField(default=dict, blank=True)
+    # Remaining calculation output: verification impact, strengths, gaps, recommendations
+    details = models.JSONField(default=dict, blank=True)
+    # jobs.taxonomy fingerprint the score was computed against
+    taxonomy_fingerprint = models.CharField(max_length=40, blank=True)
+    # First day the score can drift without an edit (cert expiry, ongoing job); null = never
+    valid_until = models.DateField(null=True, blank=True, db_index=True)
+    # StudentProfile.revision the score was computed at
+    revision = models.PositiveBigIntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -40,3 +54,94 @@ class ReadinessScore(models.Model):
 
     def __str__(self):
         return f"{self.profile} - {self.job_role} - {self.company_level}"
+
+
+class ReadinessRecompute(models.Model):
+    """
+    Pending recompute of a profile's materialized readiness scores.
+
+    One row per dirty profile; requested_at moves forward on every new
+    mutation so a worker can tell whether the profile changed mid-compute.
+    """
+    profile = models.OneToOneField(StudentProfile, on_delete=models.CASCADE, related_name="readiness_recompute")
+    requested_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.profile} @ {self.requested_at}"
+
+
+class PillarScore(models.Model):
+    """
+    Pillar score of a profile for a job role, written alongside ReadinessScore.
+
+    The normalized, indexed form of ReadinessScore.pillar_breakdown, so
+    pillar thresholds can be filtered in SQL. Pillar scores do not depend on
+    the company level.
+    """
+    profile = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="pillar_scores")
+    job_role = models.ForeignKey(JobRole, on_delete=models.CASCADE, related_name="pillar_scores")
+    pillar = models.ForeignKey(Pillar, on_delete=models.CASCADE, related_name="profile_scores")
+    score = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+    )
+
+    class Meta:
+        unique_together = ("profile", "job_role", "pillar")
+        indexes = [models.Index(fields=["job_role", "pillar", "score"], name="readiness_pillar_score")]
+
+    def __str__(self):
+        return f"{self.profile} - {self.job_role} - {self.pillar}: {self.score}"
+
+
+class SubPillarScore(models.Model):
+    """
+    Materialized sub-pillar score of a profile, kept next to ReadinessScore.
+
+    A job's base score is linear in these scores, so the (sub_pillar, score)
+    index gives the sorted lists that readiness/candidates.py ranks students
+    from. Only non-zero scores are stored; a missing row means 0.
+    """
+    profile = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="sub_pillar_scores")
+    sub_pillar = models.ForeignKey(SubPillar, on_delete=models.CASCADE, related_name="profile_scores")
+    score = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+    )
+
+    class Meta:
+        unique_together = ("profile", "sub_pillar")
+        indexes = [models.Index(fields=["sub_pillar", "-score", "profile"], name="readiness_subpillar_rank")]
+
+    def __str__(self):
+        return f"{self.profile} - {self.sub_pillar}: {self.score}"
+
+
+class ScoreSketch(models.Model):
+    """
+    Histogram of the stored scores of one cohort, for percentile ranks.
+
+    A cohort is every profile's ReadinessScore for a (job role, company
+    level), with pillar null, or every profile's PillarScore for a (job role,
+    pillar), with company_level blank since pillar scores do not depend on
+    the level. Kept up to date incrementally as scores are written; see
+    readiness/sketches.py.
+    """
+    job_role = models.ForeignKey(JobRole, on_delete=models.CASCADE, related_name="score_sketches")
+    company_level = models.CharField(max_length=20, choices=CompanyLevel.choices, blank=True)
+    pillar = models.ForeignKey(Pillar, on_delete=models.CASCADE, null=True, blank=True, related_name="score_sketches")
+    # pillar_id, or 0 for a company level cohort. NULLs never compare equal,
+    # so the unique key uses this instead of pillar.
+    pillar_key = models.PositiveIntegerField(default=0)
+    # Profiles per fixed-width score bin (see sketches.BIN_WIDTH)
+    counts = models.JSONField(default=list)
+    total = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("job_role", "company_level", "pillar_key")
+
+    def __str__(self):
+        return f"{self.job_role} - {self.company_level or self.pillar}: {self.total} score(s)"
@@ -0,0 +1,237 @@
+"""
+Skill-gap planner: a cheap ordered set of actions that reaches a target IRI.
+
+A job's base score is linear in the profile's sub-pillar scores (the job's
+row of JobWeightMatrix.combined), so each sub-pillar has a fixed marginal
+gain per point. Candidate actions are:
+
+- verify an existing skill by quiz (assuming full marks), unless it
+  already has a full-score quiz approval. Referral and link verifications
+  of experiences, projects and certifications raise the score too, but
+  are not proposed: the records do not say which item a verification
+  targets, so their exact gain is unknown
+- add a skill mapped to a weighted sub-pillar the profile is weak in
+- add a certification covering such a sub-pillar
+
+Every action has an effort cost (ACTION_COSTS). The planner is a lazy
+greedy search over gain per cost. An action's optimistic bound (marginal
+gain x the headroom of the sub-pillars it touches) orders the heap, and
+its exact gain is only computed, through the scoring kernel, when it
+reaches the top. Accepted actions are then pruned again: any action the
+target does not need is dropped, costliest first. The search stops at
+PLAN_TIME_BUDGET seconds and returns the best plan found so far.
+"""
+
+import heapq
+import itertools
+import time
+from decimal import Decimal
+
+from django.conf import settings
+
+from jobs.taxonomy import get_taxonomy
+from profiles.models import Certification
+from .calculation_engine import taxonomy_records
+from .job_matrix import JobWeightMatrix
+from .kernel import ScoringKernel, ProfileChanges, CertificationRecord, VerificationRecord
+from .keywords import CERTIFICATION_KEYWORDS, index_item
+from .simulation import simulation_base
+
+
+# Relative effort of each action
+ACTION_COSTS = {
+    'verify_self': 1,
+    'add_skill': 3,
+    'add_certification': 5,
+}
+
+# Verification methods the API accepts for a skill
+SKILL_VERIFICATION_METHODS = ('self',)
+
+PLAN_TIME_BUDGET = 0.5
+SKILLS_PER_SUB_PILLAR = 3
+# Base score points below which an action is not worth taking
+MIN_GAIN = 0.01
+
+
+class Action:
+    """A candidate plan step: profile changes plus how to describe them."""
+
+    __slots__ = ('kind', 'cost', 'changes', 'sub_pillar_ids', 'details')
+
+    def __init__(self, kind, changes, sub_pillar_ids, **details):
+        self.kind = kind
+        self.cost = ACTION_COSTS[kind]
+        self.changes = changes
+        self.sub_pillar_ids = sub_pillar_ids
+        self.details = details
+
+
+def candidate_actions(records, taxonomy, weights, scores):
+    """
+    Every action worth considering for a job.
+
+    Args:
+        records: ProfileRecords of the profile
+        taxonomy: jobs.taxonomy.TaxonomySnapshot
+        weights: {sub_pillar_id: marginal base-score gain per point}, positive only
+        scores: current {sub_pillar_id: score}
+    """
+    skill_names = {skill.id: skill.name for skill in taxonomy.skills}
+    sub_pillars = {sp.id: sp for sp in taxonomy.sub_pillars}
+    owned = {skill_id for skill_ids in records.skills_by_sub_pillar.values() for skill_id in skill_ids}
+    done = {
+        (v.skill_id, v.method) for v in records.verifications
+        if v.status == 'approved' and v.score >= 100
+    }
+
+    actions = []
+    for sub_pillar_id, skill_ids in records.skills_by_sub_pillar.items():
+        for skill_id in skill_ids:
+            for method in SKILL_VERIFICATION_METHODS:
+                if (skill_id, method) in done:
+                    continue
+                verification = VerificationRecord(method, 'approved', Decimal('100'), skill_id)
+                actions.append(Action(
+                    f'verify_{method}',
+                    ProfileChanges(add={'verifications': [verification]}),
+                    {sub_pillar_id},
+                    skill_id=skill_id,
+                    method=method,
+                    description=f'Verify {skill_names.get(skill_id, "a skill")} by {method}',
+                ))
+
+    weak = [sp_id for sp_id in weights if sp_id in sub_pillars and float(scores.get(sp_id, 0)) < 100]
+    candidates_by_sub_pillar = {sp_id: [] for sp_id in weak}
+    for skill in taxonomy.skills:
+        group = candidates_by_sub_pillar.get(skill.sub_pillar_id)
+        if group is not None and skill.id not in owned and len(group) < SKILLS_PER_SUB_PILLAR:
+            group.append(skill)
+
+    sub_pillar_ids = {name: sp.id for name, sp in taxonomy.sub_pillar_by_name.items()}
+    for sp_id in weak:
+        name = sub_pillars[sp_id].name
+        for skill in candidates_by_sub_pillar[sp_id]:
+            actions.append(Action(
+                'add_skill',
+                ProfileChanges(add_skills=[(sp_id, skill.id)]),
+                {sp_id},
+                skill_id=skill.id,
+                description=f'Add the skill {skill.name} ({name})',
+            ))
+
+        keyword = CERTIFICATION_KEYWORDS.get(name, [name])[0]
+        certification = Certification(name=f'{keyword} certification')
+        hits = index_item(certification, sub_pillar_ids) or {str(sp_id): 1}
+        actions.append(Action(
+            'add_certification',
+            ProfileChanges(add={'certifications': [CertificationRecord('', None, hits, Decimal('0'))]}),
+            {int(hit) for hit in hits},
+            description=f'Earn a certification in {keyword} ({name})',
+        ))
+    return actions
+
+
+def plan(profile, job_role, company_level, target_score, max_actions, time_budget=PLAN_TIME_BUDGET):
+    """
+    Near-minimal-cost ordered actions that lift a profile's IRI for a job
+    to `target_score`.
+
+    Returns:
+        Response body of POST /api/readiness/plan/
+    """
+    deadline = time.monotonic() + time_budget
+    taxonomy = get_taxonomy()
+    matrix = JobWeightMatrix.get()
+    base = simulation_base(profile)
+    row = matrix.combined[matrix.job_ids.index(job_role.id)]
+    multiplier = float(ScoringKernel.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0')))
+
+    def base_score(kernel):
+        return float(row @ matrix.score_vector(kernel.sub_pillar_scores()))
+
+    def iri(base_value):
+        return min(base_value * multiplier, 100.0)
+
+    start = ScoringKernel(
+        base['records'],
+        taxonomy_records(taxonomy),
+        numeric_mode=settings.READINESS_NUMERIC_MODE,
+        sub_pillar_scores=base['sub_pillar_scores'],
+    )
+    start_score = base_score(start)
+    weights = {sp_id: float(weight) for sp_id, weight in zip(matrix.sub_pillar_ids, row) if weight > 0}
+    scores = base['sub_pillar_scores']
+
+    # Heap of (-gain per cost, tie-breaker, action); bounds first, exact gains once evaluated
+    counter = itertools.count()
+    heap = []
+    for action in candidate_actions(base['records'], taxonomy, weights, scores):
+        bound = sum(
+            weights.get(sp_id, 0) * (100 - float(scores.get(sp_id, 0))) for sp_id in action.sub_pillar_ids
+        )
+        if bound >= MIN_GAIN:
+            heap.append((-bound / action.cost, next(counter), action))
+    heapq.heapify(heap)
+
+    kernel, score = start, start_score
+    chosen = []
+    evaluated = 0
+    complete = True
+    while iri(score) < target_score and heap and len(chosen) < max_actions:
+        if time.monotonic() > deadline:
+            complete = False
+            break
+        _, _, action = heapq.heappop(heap)
+        candidate = kernel.with_changes(action.changes)
+        gain = base_score(candidate) - score
+        evaluated += 1
+        if gain < MIN_GAIN:
+            continue
+        ratio = gain / action.cost
+        if heap and ratio < -heap[0][0]:
+            # Another action may do better now; its key is still an upper bound
+            heapq.heappush(heap, (-ratio, next(counter), action))
+            continue
+        kernel, score = candidate, score + gain
+        chosen.append(action)
+
+    # Knapsack-style pruning: drop actions the target does not need, costliest first
+    if iri(score) >= target_score:
+        for action in sorted(chosen, key=lambda a: a.cost, reverse=True):
+            if time.monotonic() > deadline:
+                complete = False
+                break
+            rest = [a for a in chosen if a is not action]
+            kernel = start
+            for step in rest:
+                kernel = kernel.with_changes(step.changes)
+            if iri(base_score(kernel)) >= target_score:
+                chosen = rest
+
+    steps = []
+    kernel, score = start, start_score
+    for action in chosen:
+        kernel = kernel.with_changes(action.changes)
+        new_score = base_score(kernel)
+        steps.append({
+            'action': action.kind,
+            'cost': action.cost,
+            'gain': iri(new_score) - iri(score),
+            'score_after': iri(new_score),
+            **action.details,
+        })
+        score = new_score
+
+    return {
+        'job_role': {'id': job_role.id, 'name': job_role.name},
+        'company_level': company_level,
+        'target_score': target_score,
+        'current_score': iri(start_score),
+        'projected_score': iri(score),
+        'reached': iri(score) >= target_score,
+        'complete': complete,
+        'total_cost': sum(action.cost for action in chosen),
+        'steps': steps,
+        'evaluated_actions': evaluated,
+    }
@@ -1,6 +1,8 @@
 ﻿from rest_framework import serializers
 from .models import ReadinessScore
 from jobs.models import JobRole
+from profiles.models import Experience, Project, Certification
+from verification.models import VerificationMethod, VerificationStatus
 
 
 class ReadinessScoreSerializer(serializers.ModelSerializer):
@@ -9,19 +11,114 @@ class ReadinessScoreSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReadinessScore
         fields = [
-            'id', 'job_role', 'job_role_name', 'company_level', 'score',
+            'id', 'job_role', 'job_role_name', 'company_level', 'score', 'base_score',
             'verified_score', 'unverified_score', 'pillar_breakdown', 'updated_at'
         ]
-        read_only_fields = ['score', 'verified_score', 'unverified_score', 'pillar_breakdown', 'updated_at']
+        read_only_fields = ['score', 'base_score', 'verified_score', 'unverified_score', 'pillar_breakdown', 'updated_at']
+
+
+class CohortScoreSerializer(ReadinessScoreSerializer):
+    """A stored score with the student it belongs to, for staff."""
+    full_name = serializers.CharField(source='profile.full_name', read_only=True)
+    
+    class Meta(ReadinessScoreSerializer.Meta):
+        fields = ['profile', 'full_name', *ReadinessScoreSerializer.Meta.fields]
 
 
 class ReadinessCalculationRequestSerializer(serializers.Serializer):
     """Request serializer for readiness calculation."""
     job_role_id = serializers.IntegerField()
+    company_level = serializers.ChoiceField(
+        choices=['startup', 'corporate', 'leading', 'all'],
+        default='startup'
+    )
+
+
+class ReadinessScoreFilterSerializer(serializers.Serializer):
+    """Query parameters filtering the stored readiness scores."""
+    job_role = serializers.IntegerField(required=False)
+    company_level = serializers.ChoiceField(choices=['startup', 'corporate', 'leading'], required=False)
+    min_score = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+    max_score = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+    pillar = serializers.IntegerField(required=False)
+    pillar_min = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+    pillar_max = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+
+    def validate(self, attrs):
+        if ('pillar_min' in attrs or 'pillar_max' in attrs) and 'pillar' not in attrs:
+            raise serializers.ValidationError('pillar_min and pillar_max require pillar')
+        return attrs
+
+
+class CandidateRankingRequestSerializer(serializers.Serializer):
+    """Query parameters of the candidate ranking endpoint."""
+    job_role_id = serializers.IntegerField()
     company_level = serializers.ChoiceField(
         choices=['startup', 'corporate', 'leading'],
         default='startup'
     )
+    page = serializers.IntegerField(min_value=1, default=1)
+    page_size = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class SimulatedExperienceSerializer(serializers.ModelSerializer):
+    """Hypothetical experience for a what-if simulation (never saved)."""
+    class Meta:
+        model = Experience
+        fields = ['role_title', 'company', 'start_date', 'end_date', 'is_current', 'description']
+
+
+class SimulatedProjectSerializer(serializers.ModelSerializer):
+    """Hypothetical project for a what-if simulation (never saved)."""
+    class Meta:
+        model = Project
+        fields = ['title', 'description', 'technologies', 'github_link', 'live_link']
+
+
+class SimulatedCertificationSerializer(serializers.ModelSerializer):
+    """Hypothetical certification for a what-if simulation (never saved)."""
+    class Meta:
+        model = Certification
+        fields = ['name', 'issuer', 'expiry_date']
+
+
+class SimulatedVerificationSerializer(serializers.Serializer):
+    """Hypothetical verification for a what-if simulation (never saved)."""
+    method = serializers.ChoiceField(choices=VerificationMethod.choices)
+    status = serializers.ChoiceField(choices=VerificationStatus.choices, default=VerificationStatus.APPROVED)
+    score = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0, max_value=100, default=0)
+    # Skill the verification targets; without one it does not change any score
+    skill_id = serializers.IntegerField(required=False, allow_null=True, default=None)
+
+
+class SimulationRequestSerializer(serializers.Serializer):
+    """Request serializer for the what-if simulation; removals are row ids."""
+    job_role_ids = serializers.ListField(child=serializers.IntegerField(), default=list)
+    company_level = serializers.ChoiceField(
+        choices=['startup', 'corporate', 'leading'],
+        default='startup'
+    )
+    add_skills = serializers.ListField(child=serializers.IntegerField(), default=list)
+    remove_skills = serializers.ListField(child=serializers.IntegerField(), default=list)
+    add_experiences = SimulatedExperienceSerializer(many=True, default=list)
+    remove_experiences = serializers.ListField(child=serializers.IntegerField(), default=list)
+    add_projects = SimulatedProjectSerializer(many=True, default=list)
+    remove_projects = serializers.ListField(child=serializers.IntegerField(), default=list)
+    add_certifications = SimulatedCertificationSerializer(many=True, default=list)
+    remove_certifications = serializers.ListField(child=serializers.IntegerField(), default=list)
+    add_verifications = SimulatedVerificationSerializer(many=True, default=list)
+    remove_verifications = serializers.ListField(child=serializers.IntegerField(), default=list)
+
+
+class PlanRequestSerializer(serializers.Serializer):
+    """Request serializer for the skill-gap planner."""
+    job_role_id = serializers.IntegerField()
+    company_level = serializers.ChoiceField(
+        choices=['startup', 'corporate', 'leading'],
+        default='startup'
+    )
+    target_score = serializers.FloatField(min_value=0, max_value=100)
+    max_actions = serializers.IntegerField(min_value=1, max_value=20, default=10)
 
 
 class PillarBreakdownItemSerializer(serializers.Serializer):
@@ -30,6 +127,7 @@ class PillarBreakdownItemSerializer(serializers.Serializer):
     score = serializers.FloatField()
     weight_percent = serializers.FloatField()
     weighted_contribution = serializers.FloatField()
+    percentile = serializers.FloatField(required=False, allow_null=True)
 
 
 class VerificationImpactSerializer(serializers.Serializer):
@@ -64,3 +162,27 @@ class ReadinessResultSerializer(serializers.Serializer):
     strengths = StrengthGapItemSerializer(many=True)
     gaps = StrengthGapItemSerializer(many=True)
     recommendations = RecommendationItemSerializer(many=True)
+    percentile = serializers.FloatField(required=False, allow_null=True)
+    valid_until = serializers.DateField(required=False, allow_null=True)
+    freshness = serializers.DictField(required=False)
+
+
+class LevelScoreSerializer(serializers.Serializer):
+    """Adjusted score at one company level."""
+    iri_score = serializers.FloatField()
+    company_multiplier = serializers.FloatField()
+    percentile = serializers.FloatField(required=False, allow_null=True)
+
+
+class ReadinessAllLevelsResultSerializer(serializers.Serializer):
+    """Readiness result for company_level=all: one breakdown, a score per level."""
+    base_score = serializers.FloatField()
+    company_level = serializers.CharField()
+    levels = serializers.DictField(child=LevelScoreSerializer())
+    breakdown = PillarBreakdownItemSerializer(many=True)
+    verification_impact = VerificationImpactSerializer()
+    strengths = StrengthGapItemSerializer(many=True)
+    gaps = StrengthGapItemSerializer(many=True)
+    recommendations = RecommendationItemSerializer(many=True)
+    valid_until = serializers.DateField(required=False, allow_null=True)
+    freshness = serializers.DictField(required=False)
@@ -1,120 +1,356 @@
-﻿from decimal import Decimal
-from collections import defaultdict
-
-from jobs.models import JobRole, JobPillarWeight, Skill
-from profiles.models import StudentProfile, ProfileSkill
-from readiness.models import ReadinessScore, CompanyLevel
-
-
-class ReadinessCalculator:
-    def __init__(self, profile: StudentProfile, job_role: JobRole):
-        self.profile = profile
-        self.job_role = job_role
-        self.pillar_weights = {}
-        self._load_weights()
-
-    def _load_weights(self):
-        weights = JobPillarWeight.objects.filter(job_role=self.job_role).select_related('pillar')
-        for weight in weights:
-            self.pillar_weights[weight.pillar.id] = {
-                'pillar': weight.pillar,
-                'weight': weight.weight_percent,
-            }
-
-    def calculate(self, company_level: str) -> dict:
-        # Get profile skills grouped by pillar
-        profile_skills = ProfileSkill.objects.filter(profile=self.profile).select_related('skill', 'skill__pillar')
-        
-        pillar_scores = defaultdict(lambda: {'total': 0, 'count': 0, 'verified': 0, 'unverified': 0})
-        
-        for ps in profile_skills:
-            if not ps.skill.pillar:
-                continue
-            
-            pillar_id = ps.skill.pillar.id
-            score = ps.verification_score
-            
-            pillar_scores[pillar_id]['total'] += score
-            pillar_scores[pillar_id]['count'] += 1
-            
-            if ps.verification_score > 0:
-                pillar_scores[pillar_id]['verified'] += score
-            else:
-                pillar_scores[pillar_id]['unverified'] += score
-
-        # Calculate weighted score
-        total_score = Decimal(0)
-        verified_score = Decimal(0)
-        unverified_score = Decimal(0)
-        breakdown = {}
-
-        for pillar_id, weight_info in self.pillar_weights.items():
-            pillar = weight_info['pillar']
-            weight = Decimal(weight_info['weight'])
-            
-            scores = pillar_scores[pillar_id]
-            if scores['count'] > 0:
-                avg_score = Decimal(scores['total']) / Decimal(scores['count'])
-                pillar_contribution = (avg_score * weight) / Decimal(100)
-                total_score += pillar_contribution
-                
-                if scores['verified'] > 0:
-                    verified_score += pillar_contribution
-                else:
-                    unverified_score += pillar_contribution
-                
-                breakdown[pillar.name] = {
-                    'score': float(avg_score),
-                    'weight': float(weight),
-                    'contribution': float(pillar_contribution),
-                }
-            else:
-                breakdown[pillar.name] = {
-                    'score': 0,
-                    'weight': float(weight),
-                    'contribution': 0,
-                }
-
-        # Apply company level multiplier
-        multipliers = {
-            CompanyLevel.STARTUP: Decimal('0.7'),
-            CompanyLevel.CORPORATE: Decimal('0.85'),
-            CompanyLevel.LEADING: Decimal('1.0'),
+﻿import logging
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from jobs.taxonomy import get_taxonomy, current_version
+from profiles.models import StudentProfile
+from readiness import calculation_engine
+from readiness.job_matrix import JobWeightMatrix
+from readiness.models import ReadinessScore, ReadinessRecompute, PillarScore, SubPillarScore, CompanyLevel
+from readiness.singleflight import single_flight
+from readiness.sketches import PILLAR_LEVEL, score_deltas, apply_deltas
+
+
+logger = logging.getLogger(__name__)
+
+COMPANY_LEVELS = CompanyLevel.values
+
+# calculate_iri output stored in ReadinessScore.details
+DETAIL_KEYS = ('verification_impact', 'company_multiplier', 'strengths', 'gaps', 'recommendations', 'error')
+
+SCORE_UPDATE_FIELDS = [
+    'score', 'base_score', 'pillar_breakdown', 'details', 'taxonomy_fingerprint', 'valid_until', 'revision',
+    'updated_at',
+]
+
+# Readiness responses are cached for an hour; the key moves on any change
+RESULT_CACHE_TIMEOUT = 3600
+
+
+def request_recompute(profile):
+    """Queue a recompute of the profile's stored scores once the transaction commits."""
+    profile_id = profile.pk
+
+    def enqueue():
+        ReadinessRecompute.objects.update_or_create(
+            profile_id=profile_id,
+            defaults={'requested_at': timezone.now()},
+        )
+
+    transaction.on_commit(enqueue)
+
+
+def request_recomputes(profile_ids, batch_size=500):
+    """request_recompute() for many profiles, queued with one bulk upsert."""
+    profile_ids = sorted(set(profile_ids))
+    if not profile_ids:
+        return
+    options = {}
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = ['profile']
+
+    def enqueue():
+        now = timezone.now()
+        ReadinessRecompute.objects.bulk_create(
+            [ReadinessRecompute(profile_id=profile_id, requested_at=now) for profile_id in profile_ids],
+            batch_size=batch_size,
+            update_conflicts=True,
+            update_fields=['requested_at'],
+            **options,
+        )
+
+    transaction.on_commit(enqueue)
+
+
+def _to_decimal(value):
+    return Decimal(str(round(value, 2)))
+
+
+def build_score_row(profile, job_role, company_level, result, fingerprint):
+    """Unsaved ReadinessScore holding one calculate_iri result."""
+    breakdown = result.get('breakdown')
+    if isinstance(breakdown, dict):
+        breakdown = list(breakdown.values())
+
+    return ReadinessScore(
+        profile=profile,
+        job_role=job_role,
+        company_level=company_level,
+        score=_to_decimal(result.get('iri_score', 0)),
+        base_score=_to_decimal(result.get('base_score', 0)),
+        pillar_breakdown=breakdown,
+        details={key: result[key] for key in DETAIL_KEYS if key in result},
+        taxonomy_fingerprint=fingerprint,
+        valid_until=result.get('valid_until'),
+        revision=profile.revision,
+    )
+
+
+def build_score_rows(profile, job_roles=None, company_levels=COMPANY_LEVELS, snapshot=None, calculator=None):
+    """Compute unsaved ReadinessScore rows for a profile over job roles x company levels."""
+    if calculator is None:
+        calculator = calculation_engine.ReadinessCalculator(profile.user, profile=profile, snapshot=snapshot)
+    taxonomy = calculator.snapshot.taxonomy
+    if job_roles is None:
+        job_roles = taxonomy.active_job_roles
+
+    rows = []
+    for job_role in job_roles:
+        results = calculator.calculate_iri_levels(job_role, company_levels)
+        for company_level, result in results.items():
+            rows.append(build_score_row(profile, job_role, company_level, result, taxonomy.fingerprint))
+    return rows
+
+
+def build_sub_pillar_rows(profile, calculator):
+    """Unsaved SubPillarScore rows (non-zero scores only) for a profile."""
+    rows = []
+    for sub_pillar_id, score in calculator.calculate_sub_pillar_scores().items():
+        score = _to_decimal(score)
+        if score > 0:
+            rows.append(SubPillarScore(profile=profile, sub_pillar_id=sub_pillar_id, score=score))
+    return rows
+
+
+def replace_sub_pillar_scores(profile_ids, rows, batch_size=500):
+    """Swap the stored sub-pillar scores of the given profiles for `rows`."""
+    with transaction.atomic():
+        SubPillarScore.objects.filter(profile_id__in=profile_ids).delete()
+        SubPillarScore.objects.bulk_create(rows, batch_size=batch_size)
+
+
+def build_pillar_rows(profile, calculator, job_role_ids=None):
+    """
+    Unsaved PillarScore rows of a profile for every active job role (or
+    only `job_role_ids`), from one jobs x pillars matrix product.
+    """
+    matrix = JobWeightMatrix.get()
+    scores = matrix.pillar_scores(calculator.calculate_sub_pillar_scores())
+    rows = []
+    for row, job_role_id in enumerate(matrix.job_ids):
+        if job_role_ids and job_role_id not in job_role_ids:
+            continue
+        for column, pillar_id in enumerate(matrix.pillar_ids):
+            rows.append(PillarScore(
+                profile=profile,
+                job_role_id=job_role_id,
+                pillar_id=pillar_id,
+                score=_to_decimal(scores[row, column]),
+            ))
+    return rows
+
+
+def lock_profiles(profile_ids):
+    """
+    Lock the profiles' rows until the transaction ends. Writers of the same
+    profile's scores take turns, so each reads the old scores the previous
+    one stored and moves them out of the sketches exactly once.
+    """
+    list(
+        StudentProfile.objects.select_for_update().filter(pk__in=profile_ids)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+
+
+def replace_pillar_scores(profile_ids, rows, job_role_ids=None, batch_size=500):
+    """
+    Swap the stored pillar scores of the given profiles (and job roles) for
+    `rows`, updating the pillar score sketches.
+    """
+    stored = PillarScore.objects.filter(profile_id__in=profile_ids)
+    if job_role_ids:
+        stored = stored.filter(job_role_id__in=job_role_ids)
+    with transaction.atomic():
+        lock_profiles(profile_ids)
+        old = {
+            (profile_id, job_role_id, pillar_id): score
+            for profile_id, job_role_id, pillar_id, score in stored.values_list(
+                'profile_id', 'job_role_id', 'pillar_id', 'score'
+            )
+        }
+        new = {(row.profile_id, row.job_role_id, row.pillar_id): row.score for row in rows}
+        stored.delete()
+        PillarScore.objects.bulk_create(rows, batch_size=batch_size)
+        apply_deltas(score_deltas(
+            ((key[1], PILLAR_LEVEL, key[2]), old.get(key), new.get(key))
+            for key in old.keys() | new.keys()
+        ))
+
+
+def bulk_upsert_scores(rows, batch_size=500):
+    """
+    Insert or update ReadinessScore rows on (profile, job_role, company_level)
+    and move the changed scores between their cohort sketches.
+    """
+    options = {}
+    # MySQL upserts on any unique key and rejects an explicit conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = ['profile', 'job_role', 'company_level']
+
+    profile_ids = {row.profile_id for row in rows}
+    with transaction.atomic():
+        lock_profiles(profile_ids)
+        old = {
+            (profile_id, job_role_id, company_level): score
+            for profile_id, job_role_id, company_level, score in ReadinessScore.objects.filter(
+                profile_id__in=profile_ids,
+                job_role_id__in={row.job_role_id for row in rows},
+            ).values_list('profile_id', 'job_role_id', 'company_level', 'score')
         }
-        
-        multiplier = multipliers.get(company_level, Decimal('1.0'))
-        final_score = total_score * multiplier
-        
-        # Cap at 100
-        final_score = min(final_score, Decimal(100))
-        verified_score = min(verified_score * multiplier, Decimal(100))
-        unverified_score = min(unverified_score * multiplier, Decimal(100))
+        ReadinessScore.objects.bulk_create(
+            rows,
+            batch_size=batch_size,
+            update_conflicts=True,
+            update_fields=SCORE_UPDATE_FIELDS,
+            **options,
+        )
+        apply_deltas(score_deltas(
+            (
+                (row.job_role_id, row.company_level, None),
+                old.get((row.profile_id, row.job_role_id, row.company_level)),
+                row.score,
+            )
+            for row in rows
+        ))
+
+
+def recompute_profile_scores(profile):
+    """Recompute and store every job role x company level score for a profile."""
+    calculator = calculation_engine.ReadinessCalculator(profile.user, profile=profile)
+    rows = build_score_rows(profile, calculator=calculator)
+    bulk_upsert_scores(rows)
+    replace_pillar_scores([profile.id], build_pillar_rows(profile, calculator))
+    replace_sub_pillar_scores([profile.id], build_sub_pillar_rows(profile, calculator))
+    return rows
+
+
+def drain_recompute_queue(batch_size=100):
+    """
+    Recompute the oldest queued profiles.
+
+    An entry is only removed if it was not re-requested while its profile
+    was being scored, so no mutation is lost. A profile that fails to score
+    is logged and moved to the back of the queue, so it cannot hold up the
+    profiles behind it.
+
+    Returns:
+        Number of profiles recomputed
+    """
+    entries = list(
+        ReadinessRecompute.objects.select_related('profile__user').order_by('requested_at')[:batch_size]
+    )
+    recomputed = 0
+    for entry in entries:
+        try:
+            recompute_profile_scores(entry.profile)
+        except Exception:
+            logger.exception('Readiness recompute of profile %s failed', entry.profile_id)
+            ReadinessRecompute.objects.filter(pk=entry.pk).update(requested_at=timezone.now())
+            continue
+        ReadinessRecompute.objects.filter(pk=entry.pk, requested_at=entry.requested_at).delete()
+        recomputed += 1
+    return recomputed
+
+
+def load_stored_scores(profile, company_levels, job_role=None):
+    """
+    Fetch materialized scores if they are fresh.
 
+    Fresh means no recompute is pending for the profile and every requested
+    row exists, was computed at the profile's current revision and against
+    the current taxonomy, and has not passed its valid_until day. The
+    revision check also catches edits that never queued a recompute.
+
+    Returns:
+        (rows or None, pending) - rows is None when the caller must compute live
+    """
+    pending = ReadinessRecompute.objects.filter(profile=profile).exists()
+    if pending:
+        return None, pending
+
+    taxonomy = get_taxonomy()
+    job_ids = [job_role.id] if job_role else [job.id for job in taxonomy.active_job_roles]
+    rows = list(
+        ReadinessScore.objects.filter(
+            profile=profile,
+            job_role_id__in=job_ids,
+            company_level__in=company_levels,
+            taxonomy_fingerprint=taxonomy.fingerprint,
+            revision=profile.revision,
+        ).select_related('job_role').order_by('job_role_id')
+    )
+    if len(rows) != len(job_ids) * len(company_levels):
+        return None, pending
+    today = timezone.now().date()
+    if any(row.valid_until and row.valid_until <= today for row in rows):
+        return None, pending
+    return rows, pending
+
+
+def stored_result(row):
+    """Rebuild a calculate_iri-shaped result from a stored ReadinessScore."""
+    result = {
+        'iri_score': float(row.score),
+        'base_score': float(row.base_score),
+        'breakdown': row.pillar_breakdown,
+        'company_level': row.company_level,
+        'valid_until': row.valid_until,
+    }
+    result.update(row.details)
+    return result
+
+
+def rows_valid_until(rows):
+    """Earliest valid_until of stored ReadinessScore rows (None if none drift)."""
+    return min((row.valid_until for row in rows if row.valid_until), default=None)
+
+
+def freshness(rows=None, pending=False):
+    """Staleness metadata attached to readiness responses."""
+    if rows:
         return {
-            'score': final_score,
-            'verified_score': verified_score,
-            'unverified_score': unverified_score,
-            'breakdown': breakdown,
+            'source': 'stored',
+            'computed_at': min(row.updated_at for row in rows).isoformat(),
+            'recompute_pending': pending,
         }
+    return {'source': 'live', 'computed_at': timezone.now().isoformat(), 'recompute_pending': pending}
 
-    def calculate_all_levels(self):
-        results = {}
-        for level in [CompanyLevel.STARTUP, CompanyLevel.CORPORATE, CompanyLevel.LEADING]:
-            result = self.calculate(level)
-            
-            # Save to database
-            ReadinessScore.objects.update_or_create(
-                profile=self.profile,
-                job_role=self.job_role,
-                company_level=level,
-                defaults={
-                    'score': result['score'],
-                    'verified_score': result['verified_score'],
-                    'unverified_score': result['unverified_score'],
-                    'pillar_breakdown': result['breakdown'],
-                }
-            )
-            
-            results[level] = result
-        
-        return results
+
+def result_cache_key(name, profile, *parts):
+    """
+    Cache key of a readiness response for a profile.
+
+    It embeds the profile revision and the taxonomy version, so any change
+    to the profile's content or to the jobs taxonomy yields a new key and
+    stale entries simply age out.
+    """
+    key_parts = ('readiness', name, profile.pk, profile.revision, current_version(), *parts)
+    return ':'.join(str(part) for part in key_parts)
+
+
+def result_timeout(result, timeout=RESULT_CACHE_TIMEOUT):
+    """
+    Cache timeout of a readiness result: `timeout`, but never past the
+    start of its valid_until day (a date or ISO date string), when scores
+    start to drift.
+    """
+    valid_until = result.get('valid_until') if isinstance(result, dict) else None
+    if not valid_until:
+        return timeout
+    if isinstance(valid_until, str):
+        valid_until = date.fromisoformat(valid_until)
+    # ProfileSnapshot.today is the UTC date
+    expires = datetime.combine(valid_until, time.min, tzinfo=dt_timezone.utc)
+    return max(0, min(timeout, int((expires - timezone.now()).total_seconds())))
+
+
+def cached_result(key, compute, timeout=RESULT_CACHE_TIMEOUT):
+    """
+    Read-through cache: return the cached value for `key` or compute and
+    store it. Concurrent misses on the same key share one computation.
+    Results carrying a valid_until are not cached past it.
+    """
+    return single_flight(key, compute, lambda result: result_timeout(result, timeout))
@@ -0,0 +1,194 @@
+"""
+What-if readiness simulation ("how much does my score move if I...").
+
+A simulation never touches the profile rows. The profile's kernel records
+and sub-pillar scores (the base) are cached under the profile revision, so
+repeated simulations on an unchanged profile load nothing from the
+database. Each simulation applies the hypothetical edits to the records
+(kernel.ProfileChanges), scores again only the sub-pillars those edits
+touch, and multiplies the before and after score vectors against the
+JobWeightMatrix for every requested job.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+
+from jobs.taxonomy import get_taxonomy
+from profiles.models import Experience, Project, Certification
+from .calculation_engine import ProfileSnapshot, taxonomy_records
+from .job_matrix import JobWeightMatrix
+from .kernel import (
+    ScoringKernel, ProfileChanges, ExperienceRecord, ProjectRecord, CertificationRecord, VerificationRecord,
+)
+from .keywords import index_item
+from .services import result_cache_key, cached_result
+
+
+# Part of the base's cache key. Bump it when the kernel records change shape,
+# so bases pickled by older code are never read back.
+BASE_VERSION = 2
+
+
+class SimulationError(ValueError):
+    """The requested changes do not fit the profile (e.g. unknown item ids)."""
+
+
+def simulation_base(profile):
+    """
+    Cached base of a profile's simulations.
+
+    Returns:
+        {'records': ProfileRecords, 'sub_pillar_scores': {id: score},
+         'valid_until': date or None, 'item_ids': {kind: [row ids in record order]}}
+    """
+    def compute():
+        snapshot = ProfileSnapshot(profile)
+        records = snapshot.records()
+        kernel = ScoringKernel(
+            records, taxonomy_records(snapshot.taxonomy), numeric_mode=settings.READINESS_NUMERIC_MODE
+        )
+        return {
+            'records': records,
+            'sub_pillar_scores': kernel.sub_pillar_scores(),
+            'valid_until': kernel.valid_until(),
+            'item_ids': {
+                kind: [item.id for item in getattr(snapshot, kind)] for kind in ProfileChanges.KINDS
+            },
+        }
+
+    return cached_result(result_cache_key('simulate_base', profile, BASE_VERSION), compute)
+
+
+def build_changes(data, item_ids, taxonomy):
+    """
+    ProfileChanges from validated SimulationRequestSerializer data.
+
+    Raises:
+        SimulationError: a skill has no sub-pillar or a removed item is not
+            part of the profile
+    """
+    skill_sub_pillar = taxonomy.skill_sub_pillar
+
+    def skill_pairs(skill_ids):
+        unknown = [skill_id for skill_id in skill_ids if skill_id not in skill_sub_pillar]
+        if unknown:
+            raise SimulationError(f'Skills without a sub-pillar: {unknown}')
+        return [(skill_sub_pillar[skill_id], skill_id) for skill_id in skill_ids]
+
+    remove = {}
+    for kind in ProfileChanges.KINDS:
+        indexes = {row_id: index for index, row_id in enumerate(item_ids[kind])}
+        unknown = [row_id for row_id in data[f'remove_{kind}'] if row_id not in indexes]
+        if unknown:
+            raise SimulationError(f'{kind.capitalize()} not in profile: {unknown}')
+        remove[kind] = [indexes[row_id] for row_id in data[f'remove_{kind}']]
+
+    sub_pillar_ids = {name: sub_pillar.id for name, sub_pillar in taxonomy.sub_pillar_by_name.items()}
+
+    def hits(item):
+        return index_item(item, sub_pillar_ids)
+
+    # Hypothetical items have no verifications yet
+    add = {
+        'experiences': [
+            ExperienceRecord(exp['company'], exp.get('start_date'), exp.get('end_date'),
+                             exp.get('is_current', False), hits(Experience(**exp)), Decimal('0'))
+            for exp in data['add_experiences']
+        ],
+        'projects': [
+            ProjectRecord(project.get('description', ''), project.get('github_link', ''),
+                          project.get('live_link', ''), hits(Project(**project)), Decimal('0'))
+            for project in data['add_projects']
+        ],
+        'certifications': [
+            CertificationRecord(
+                cert.get('issuer', ''), cert.get('expiry_date'), hits(Certification(**cert)), Decimal('0'),
+            )
+            for cert in data['add_certifications']
+        ],
+        'verifications': [
+            VerificationRecord(v['method'], v['status'], v['score'], v.get('skill_id'))
+            for v in data['add_verifications']
+        ],
+    }
+    unknown = [
+        v['skill_id'] for v in data['add_verifications']
+        if v.get('skill_id') is not None and v['skill_id'] not in skill_sub_pillar
+    ]
+    if unknown:
+        raise SimulationError(f'Skills without a sub-pillar: {unknown}')
+
+    return ProfileChanges(
+        add_skills=skill_pairs(data['add_skills']),
+        remove_skills=skill_pairs(data['remove_skills']),
+        add=add,
+        remove=remove,
+    )
+
+
+def simulate(profile, data):
+    """
+    Before/after scores of a profile under hypothetical changes.
+
+    Args:
+        profile: StudentProfile
+        data: Validated SimulationRequestSerializer data
+
+    Returns:
+        Response body of POST /api/readiness/simulate/
+
+    Raises:
+        SimulationError: see build_changes; also for unknown job role ids
+    """
+    taxonomy = get_taxonomy()
+    matrix = JobWeightMatrix.get()
+    base = simulation_base(profile)
+
+    job_indexes = {job_id: index for index, job_id in enumerate(matrix.job_ids)}
+    job_role_ids = data['job_role_ids'] or matrix.job_ids
+    unknown = [job_id for job_id in job_role_ids if job_id not in job_indexes]
+    if unknown:
+        raise SimulationError(f'Job roles not found: {unknown}')
+
+    kernel = ScoringKernel(
+        base['records'],
+        taxonomy_records(taxonomy),
+        numeric_mode=settings.READINESS_NUMERIC_MODE,
+        sub_pillar_scores=base['sub_pillar_scores'],
+    )
+    changes = build_changes(data, base['item_ids'], taxonomy)
+    simulated = kernel.with_changes(changes)
+
+    before_scores = base['sub_pillar_scores']
+    after_scores = simulated.sub_pillar_scores()
+    changed = sorted(
+        sub_pillar_id for sub_pillar_id, score in after_scores.items()
+        if score != before_scores.get(sub_pillar_id)
+    )
+
+    company_level = data['company_level']
+    multiplier = float(ScoringKernel.COMPANY_LEVEL_MULTIPLIERS.get(company_level, Decimal('1.0')))
+    before = matrix.base_scores(before_scores)
+    after = matrix.base_scores(after_scores)
+    before_iri = np.minimum(before * multiplier, 100.0)
+    after_iri = np.minimum(after * multiplier, 100.0)
+
+    results = []
+    for job_id in job_role_ids:
+        index = job_indexes[job_id]
+        results.append({
+            'id': job_id,
+            'name': matrix.job_names[index],
+            'before': {'iri_score': float(before_iri[index]), 'base_score': float(before[index])},
+            'after': {'iri_score': float(after_iri[index]), 'base_score': float(after[index])},
+            'delta': float(after_iri[index] - before_iri[index]),
+        })
+    results.sort(key=lambda result: result['delta'], reverse=True)
+
+    return {
+        'company_level': company_level,
+        'changed_sub_pillars': changed,
+        'results': results,
+    }
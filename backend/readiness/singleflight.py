@@ -0,0 +1,76 @@
+"""
+Single-flight coalescing of identical readiness computations.
+
+The dashboard fires calculate, all_jobs and summary together, often twice.
+single_flight() lets the first request for a key compute the value while
+concurrent requests for the same key wait for it to appear in the cache.
+
+The lock is a cache.add() on '<key>:lock', so it coordinates every worker
+process that shares the cache backend (with the default locmem cache only
+threads of one process). Waiters give up after WAIT_TIMEOUT seconds, or as
+soon as the lock disappears without a result (the leader failed), and
+compute the value themselves. A slow or crashed leader therefore never
+blocks a request for longer than that, and its lock expires after
+LOCK_TIMEOUT.
+"""
+
+import time
+import uuid
+
+from django.core.cache import cache
+
+
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 5.0
+POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+
+
+def single_flight(key, compute, timeout, wait=WAIT_TIMEOUT):
+    """
+    Return the cached value for `key`, computing it at most once across
+    concurrent callers.
+
+    Args:
+        key: Cache key of the result
+        compute: Zero-argument callable producing the result (never None)
+        timeout: Cache timeout of the result in seconds, or a callable
+            returning it for the computed result
+        wait: Longest time to wait for another caller's computation
+
+    Returns:
+        The cached or freshly computed result
+    """
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, LOCK_TIMEOUT):
+        try:
+            return _compute_and_store(key, compute, timeout)
+        finally:
+            # Only release our own lock; it may have expired and been retaken
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    deadline = time.monotonic() + wait
+    interval = POLL_INTERVAL
+    while (remaining := deadline - time.monotonic()) > 0:
+        time.sleep(min(interval, remaining))
+        result = cache.get(key)
+        if result is not None:
+            return result
+        if cache.get(lock_key) is None:
+            break
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+    # Leader failed or is too slow: compute directly rather than keep waiting
+    return _compute_and_store(key, compute, timeout)
+
+
+def _compute_and_store(key, compute, timeout):
+    result = compute()
+    cache.set(key, result, timeout(result) if callable(timeout) else timeout)
+    return result
@@ -0,0 +1,215 @@
+"""
+Cohort percentile ranks from mergeable score histograms.
+
+"Top 15% for Data Analyst" needs the rank of a score among every stored
+score of the cohort. Sorting the cohort per request is O(n log n); instead
+each cohort keeps a ScoreSketch, a histogram of its scores over fixed bins
+of BIN_WIDTH points on the 0-100 scale.
+
+Why a fixed-bin histogram rather than a t-digest or KLL sketch: scores are
+bounded and rewritten on every recompute, so the sketch must support
+deletes, which those sketches do not. A histogram does (decrement the old
+bin, increment the new one), merges by adding counts, stays a few hundred
+integers per cohort, and its rank error is bounded by the share of the
+cohort inside a single bin.
+
+bulk_upsert_scores() and replace_pillar_scores() apply the bin deltas of
+every write, locking only the sketches of the cohorts they touch. Rows
+removed by cascades (a deleted profile or job role) are
+not tracked; the rebuild_score_sketches command recounts every cohort from
+the score tables.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import ReadinessScore, PillarScore, ScoreSketch
+
+
+BIN_WIDTH = Decimal('0.5')
+BIN_COUNT = int(100 / BIN_WIDTH) + 1
+
+# company_level of pillar cohorts, which span every level
+PILLAR_LEVEL = ''
+
+# ScoreSketch.pillar_key of company level cohorts, which have no pillar
+LEVEL_PILLAR_KEY = 0
+
+
+def stored_key(key):
+    """A (job_role_id, company_level, pillar_id) cohort key as ScoreSketch stores it."""
+    job_role_id, company_level, pillar_id = key
+    return job_role_id, company_level, pillar_id or LEVEL_PILLAR_KEY
+
+
+def new_sketch(key, **fields):
+    """Unsaved ScoreSketch of a (job_role_id, company_level, pillar_id) cohort."""
+    job_role_id, company_level, pillar_id = key
+    return ScoreSketch(
+        job_role_id=job_role_id,
+        company_level=company_level,
+        pillar_id=pillar_id,
+        pillar_key=pillar_id or LEVEL_PILLAR_KEY,
+        **fields,
+    )
+
+
+class ScoreHistogram:
+    """Counts of scores per fixed-width bin over 0-100."""
+
+    __slots__ = ('counts',)
+
+    def __init__(self, counts=None):
+        self.counts = list(counts) if counts else [0] * BIN_COUNT
+
+    @staticmethod
+    def bin(score):
+        return min(max(int(Decimal(str(score)) / BIN_WIDTH), 0), BIN_COUNT - 1)
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def add(self, score, count=1):
+        self.counts[self.bin(score)] += count
+
+    def merge(self, other):
+        """Add another histogram's counts (or a {bin: delta} mapping) to this one."""
+        deltas = other.items() if isinstance(other, dict) else enumerate(other.counts)
+        for index, delta in deltas:
+            # A sketch created after its cohort was stored cannot go negative
+            self.counts[index] = max(self.counts[index] + delta, 0)
+        return self
+
+    def percentile(self, score):
+        """
+        Percentage of the cohort scoring below `score`, assuming scores are
+        spread evenly inside a bin. None for an empty cohort.
+        """
+        total = self.total
+        if not total:
+            return None
+        index = self.bin(score)
+        within = (float(score) - index * float(BIN_WIDTH)) / float(BIN_WIDTH)
+        below = sum(self.counts[:index]) + self.counts[index] * min(max(within, 0.0), 1.0)
+        return round(100 * below / total, 1)
+
+
+def score_deltas(changes):
+    """
+    Bin deltas per cohort of a batch of score writes.
+
+    Args:
+        changes: iterable of (cohort key, old score or None, new score or None)
+
+    Returns:
+        {cohort key: {bin: delta}} without zero deltas
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for key, old, new in changes:
+        old_bin = None if old is None else ScoreHistogram.bin(old)
+        new_bin = None if new is None else ScoreHistogram.bin(new)
+        if old_bin == new_bin:
+            continue
+        if old_bin is not None:
+            deltas[key][old_bin] -= 1
+        if new_bin is not None:
+            deltas[key][new_bin] += 1
+    return {key: dict(bins) for key, bins in deltas.items() if any(bins.values())}
+
+
+def apply_deltas(deltas):
+    """
+    Apply score_deltas() output to the stored sketches, creating missing ones.
+
+    Cohort keys are (job_role_id, company_level, pillar_id). Missing sketches
+    are inserted first, ignoring rows a concurrent writer inserted meanwhile.
+    Then only the touched sketches are locked, in id order, and updated, so
+    concurrent writers neither lose counts nor deadlock. Call it in the
+    transaction that wrote the scores.
+    """
+    if not deltas:
+        return
+    cohorts = {stored_key(key): key for key in deltas}
+    touched = ScoreSketch.objects.filter(
+        job_role_id__in={job_role_id for job_role_id, _, _ in cohorts},
+        company_level__in={company_level for _, company_level, _ in cohorts},
+        pillar_key__in={pillar_key for _, _, pillar_key in cohorts},
+    )
+    with transaction.atomic():
+        existing = set(touched.values_list('job_role_id', 'company_level', 'pillar_key'))
+        missing = sorted(cohorts.keys() - existing)
+        if missing:
+            ScoreSketch.objects.bulk_create(
+                [new_sketch(cohorts[key]) for key in missing], ignore_conflicts=True
+            )
+
+        now = timezone.now()
+        updated = []
+        for sketch in touched.select_for_update().order_by('id'):
+            key = cohorts.get((sketch.job_role_id, sketch.company_level, sketch.pillar_key))
+            if key is None:
+                continue
+            bins = deltas[key]
+            histogram = ScoreHistogram(sketch.counts).merge(bins)
+            sketch.counts = histogram.counts
+            sketch.total = histogram.total
+            sketch.updated_at = now
+            updated.append(sketch)
+        ScoreSketch.objects.bulk_update(updated, ['counts', 'total', 'updated_at'])
+
+
+def percentile_ranks(scores):
+    """
+    Percentile rank of each score within its cohort, one query in total.
+
+    Args:
+        scores: {(job_role_id, company_level, pillar_id): score}; pillar
+            cohorts use PILLAR_LEVEL as company_level
+
+    Returns:
+        {cohort key: percentile or None}
+    """
+    if not scores:
+        return {}
+    sketches = {
+        (sketch.job_role_id, sketch.company_level, sketch.pillar_key): sketch
+        for sketch in ScoreSketch.objects.filter(
+            job_role_id__in={key[0] for key in scores},
+            company_level__in={key[1] for key in scores},
+        )
+    }
+    ranks = {}
+    for key, score in scores.items():
+        sketch = sketches.get(stored_key(key))
+        ranks[key] = ScoreHistogram(sketch.counts).percentile(score) if sketch else None
+    return ranks
+
+
+def rebuild_sketches():
+    """
+    Recount every cohort from ReadinessScore and PillarScore.
+
+    Returns:
+        Number of sketches written
+    """
+    histograms = defaultdict(ScoreHistogram)
+    level_counts = ReadinessScore.objects.values_list('job_role_id', 'company_level', 'score').annotate(n=Count('id'))
+    for job_role_id, company_level, score, count in level_counts.order_by():
+        histograms[(job_role_id, company_level, None)].add(score, count)
+    pillar_counts = PillarScore.objects.values_list('job_role_id', 'pillar_id', 'score').annotate(n=Count('id'))
+    for job_role_id, pillar_id, score, count in pillar_counts.order_by():
+        histograms[(job_role_id, PILLAR_LEVEL, pillar_id)].add(score, count)
+
+    sketches = [
+        new_sketch(key, counts=histogram.counts, total=histogram.total)
+        for key, histogram in histograms.items()
+    ]
+    with transaction.atomic():
+        ScoreSketch.objects.all().delete()
+        ScoreSketch.objects.bulk_create(sketches, batch_size=500)
+    return len(sketches)
@@ -0,0 +1,156 @@
+"""
+Synthetic scoring inputs for the kernel's golden tests and benchmarks.
+
+Everything is generated from a seeded random.Random, so a given seed always
+yields the same taxonomy and profiles. Like the kernel, this module does not
+import Django.
+"""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .kernel import (
+    ProfileRecords, TaxonomyRecords, PillarRecord, SubPillarRecord, JobRecord,
+    ExperienceRecord, ProjectRecord, CertificationRecord, VerificationRecord, blend_confidence,
+    count_verifications,
+)
+from .keywords import EXPERIENCE_KEYWORDS
+
+
+PILLAR_SUB_PILLARS = {
+    'Technical Skills': list(EXPERIENCE_KEYWORDS)[:5],
+    'Cognitive Abilities': list(EXPERIENCE_KEYWORDS)[5:10],
+    'Behavioral Competencies': list(EXPERIENCE_KEYWORDS)[10:15],
+    'Domain Knowledge': ['Industry Awareness', 'Best Practices'],
+}
+
+COMPANIES = ['Google', 'Acme Labs', 'Initech', 'Meta', 'Small Startup', 'City Council']
+ISSUERS = ['AWS', 'Coursera', 'Oracle', 'Udacity', 'Local College', '']
+VERIFICATION_STATES = [
+    ('self', 'approved'), ('self', 'pending'),
+    ('referral', 'approved'), ('referral', 'pending'),
+    ('link', 'approved'), ('link', 'rejected'),
+]
+TODAY = date(2026, 1, 1)
+
+
+def make_taxonomy(seed=0, job_count=10):
+    """TaxonomyRecords with the seeded pillar layout and random job weights."""
+    rng = random.Random(seed)
+    pillars = []
+    sub_pillars_by_pillar = {}
+    sub_pillar_id = 0
+    for pillar_id, (name, sub_pillar_names) in enumerate(PILLAR_SUB_PILLARS.items(), start=1):
+        pillars.append(PillarRecord(pillar_id, name))
+        group = []
+        for sub_pillar_name in sub_pillar_names:
+            sub_pillar_id += 1
+            weight = Decimal(rng.randint(50, 300)) / 100
+            group.append(SubPillarRecord(sub_pillar_id, pillar_id, sub_pillar_name, weight))
+        sub_pillars_by_pillar[pillar_id] = group
+
+    job_pillar_weights = {}
+    job_sub_pillar_weights = {}
+    for job_id in range(1, job_count + 1):
+        job_pillar_weights[job_id] = {
+            pillar.id: Decimal(rng.randint(500, 4000)) / 100 for pillar in pillars
+        }
+        if rng.random() < 0.3:
+            group = sub_pillars_by_pillar[rng.choice(pillars).id]
+            job_sub_pillar_weights[job_id] = {
+                sp.id: Decimal(rng.randint(0, 5000)) / 100 for sp in rng.sample(group, 2)
+            }
+
+    return TaxonomyRecords(
+        pillars=pillars,
+        sub_pillars_by_pillar=sub_pillars_by_pillar,
+        job_pillar_weights=job_pillar_weights,
+        job_sub_pillar_weights=job_sub_pillar_weights,
+    )
+
+
+def make_jobs(taxonomy):
+    return [JobRecord(job_id, f'Job {job_id}') for job_id in sorted(taxonomy.job_pillar_weights)]
+
+
+def _keyword_hits(rng, sub_pillar_ids):
+    return {
+        str(sub_pillar_id): rng.randint(1, 4)
+        for sub_pillar_id in rng.sample(sub_pillar_ids, rng.randint(0, 4))
+    }
+
+
+def _confidence(rng):
+    """Blended verification score of an item; most items are unverified."""
+    return Decimal(rng.randint(0, 10000)) / 100 if rng.random() < 0.3 else Decimal('0')
+
+
+def make_profile(rng, taxonomy, size=None):
+    """ProfileRecords with `size` items of each kind (random when None)."""
+    size = rng.randint(0, 12) if size is None else size
+    sub_pillar_ids = [
+        sp.id for group in taxonomy.sub_pillars_by_pillar.values() for sp in group
+    ]
+
+    skills_by_sub_pillar = {}
+    for skill_id in range(size * 2):
+        skills_by_sub_pillar.setdefault(rng.choice(sub_pillar_ids), []).append(skill_id)
+
+    experiences = []
+    for _ in range(size):
+        start = TODAY - timedelta(days=rng.randint(30, 4000))
+        end = start + timedelta(days=rng.randint(0, 1500)) if rng.random() < 0.7 else None
+        experiences.append(ExperienceRecord(
+            rng.choice(COMPANIES), start if rng.random() < 0.95 else None, end,
+            end is None, _keyword_hits(rng, sub_pillar_ids), _confidence(rng),
+        ))
+
+    projects = [
+        ProjectRecord(
+            'x' * rng.randint(0, 1500),
+            'https://github.com/example/repo' if rng.random() < 0.5 else '',
+            'https://example.com' if rng.random() < 0.3 else '',
+            _keyword_hits(rng, sub_pillar_ids),
+            _confidence(rng),
+        )
+        for _ in range(size)
+    ]
+
+    certifications = [
+        CertificationRecord(
+            rng.choice(ISSUERS),
+            TODAY + timedelta(days=rng.randint(-1000, 1000)) if rng.random() < 0.6 else None,
+            _keyword_hits(rng, sub_pillar_ids),
+            _confidence(rng),
+        )
+        for _ in range(size)
+    ]
+
+    skill_ids = [skill_id for ids in skills_by_sub_pillar.values() for skill_id in ids]
+    verifications = [
+        VerificationRecord(
+            *rng.choice(VERIFICATION_STATES), Decimal(rng.randint(0, 10000)) / 100,
+            rng.choice(skill_ids) if skill_ids else None,
+        )
+        for _ in range(rng.randint(0, 3))
+    ]
+    skill_confidence = {}
+    for skill_id in {v.skill_id for v in verifications if v.skill_id is not None}:
+        skill_confidence[skill_id] = blend_confidence([v for v in verifications if v.skill_id == skill_id])
+
+    return ProfileRecords(
+        skills_by_sub_pillar=skills_by_sub_pillar,
+        skill_confidence=skill_confidence,
+        experiences=experiences,
+        projects=projects,
+        certifications=certifications,
+        verifications=verifications,
+        verification_counts=count_verifications(verifications),
+        today=TODAY,
+    )
+
+
+def make_profiles(taxonomy, count, seed=0, size=None):
+    rng = random.Random(seed)
+    return [make_profile(rng, taxonomy, size) for _ in range(count)]
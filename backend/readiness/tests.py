@@ -1,3 +1,641 @@
-from django.test import TestCase
+import pickle
+import random
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from jobs.models import JobRole, Skill, SubPillar
+from jobs.taxonomy import get_taxonomy
+from profiles.models import StudentProfile, Experience, Project, Certification, ProfileSkill
+from profiles.signals import bump_revision
+from verification.models import VerificationRequest
+from verification.services import ConfidenceService
+
+from . import synthetic
+from .calculation_engine import ReadinessCalculator
+from .candidates import top_candidates
+from .job_matrix import JobWeightMatrix
+from .models import ReadinessRecompute, ReadinessScore, PillarScore, ScoreSketch, SubPillarScore
+from .planner import candidate_actions
+from .services import COMPANY_LEVELS, drain_recompute_queue, load_stored_scores, recompute_profile_scores
+from .sketches import apply_deltas, percentile_ranks, rebuild_sketches
+from .kernel import (
+    ScoringKernel, ProfileRecords, TaxonomyRecords, PillarRecord, SubPillarRecord, JobRecord,
+    ExperienceRecord, ProjectRecord, CertificationRecord, VerificationRecord, count_verifications,
+)
+
+
+def seed_taxonomy():
+    call_command('seed_jobs', stdout=StringIO())
+    call_command('seed_pillars', stdout=StringIO())
+
+
+def make_profile(username, size, verification=None):
+    """A profile with `size` skills, experiences, projects and certifications."""
+    user = User.objects.create_user(username, password='x')
+    profile = StudentProfile.objects.create(user=user, full_name=username)
+    sub_pillars = list(SubPillar.objects.order_by('id'))
+    for i in range(size):
+        sub_pillar = sub_pillars[(i * 3) % len(sub_pillars)]
+        skill = Skill.objects.create(
+            name=f'{username} skill {i}', pillar=sub_pillar.pillar, sub_pillar=sub_pillar
+        )
+        ProfileSkill.objects.create(profile=profile, skill=skill, proficiency=3)
+        Experience.objects.create(
+            profile=profile,
+            role_title=f'Python developer {i}',
+            company='Google' if i % 2 else 'Acme Labs',
+            start_date=date(2019, 1 + i, 1),
+            end_date=date(2022, 6, 1),
+            is_current=i == 0,
+            description='Led a team building django and react services, analyzed metrics on aws',
+        )
+        Project.objects.create(
+            profile=profile,
+            title=f'Project {i}',
+            description='A react and django app backed by postgresql and docker. ' * i,
+            technologies='python, javascript, rest api',
+            github_link='https://github.com/example/repo' if i % 2 else '',
+            live_link='https://example.com' if i % 3 == 0 else '',
+        )
+        Certification.objects.create(
+            profile=profile,
+            name=f'Python on AWS {i}',
+            issuer='AWS' if i % 2 else 'Coursera',
+            expiry_date=date(2020, 1, 1) if i % 2 else date(2100, 1, 1),
+        )
+    if verification:
+        method, status, score = verification
+        verification = VerificationRequest.objects.create(
+            profile=profile,
+            content_type=ContentType.objects.get_for_model(ProfileSkill),
+            object_id=profile.profile_skills.first().id,
+            method=method,
+            status=status,
+            score=score,
+        )
+        ConfidenceService.refresh(verification)
+    return user, profile
+
+
+def hand_built_records(profile, today):
+    """ProfileRecords built straight from the rows, without ProfileSnapshot."""
+    skills_by_sub_pillar = {}
+    skill_confidence = {}
+    profile_skill_ids = {}
+    for profile_skill in profile.profile_skills.select_related('skill').order_by('id'):
+        skills_by_sub_pillar.setdefault(profile_skill.skill.sub_pillar_id, []).append(profile_skill.skill_id)
+        skill_confidence[profile_skill.skill_id] = profile_skill.verification_score
+        profile_skill_ids[profile_skill.id] = profile_skill.skill_id
+    skill_type = ContentType.objects.get_for_model(ProfileSkill)
+
+    return ProfileRecords(
+        skills_by_sub_pillar=skills_by_sub_pillar,
+        skill_confidence=skill_confidence,
+        experiences=[
+            ExperienceRecord(e.company, e.start_date, e.end_date, e.is_current, e.keyword_hits, e.verification_score)
+            for e in profile.experiences.order_by('id')
+        ],
+        projects=[
+            ProjectRecord(p.description, p.github_link, p.live_link, p.keyword_hits, p.verification_score)
+            for p in profile.projects.order_by('id')
+        ],
+        certifications=[
+            CertificationRecord(c.issuer, c.expiry_date, c.keyword_hits, c.verification_score)
+            for c in profile.certifications.order_by('id')
+        ],
+        verifications=[
+            VerificationRecord(
+                v.method, v.status, v.score,
+                profile_skill_ids.get(v.object_id) if v.content_type_id == skill_type.id else None,
+            )
+            for v in profile.verification_requests.order_by('id')
+        ],
+        verification_counts=count_verifications(profile.verification_requests.all()),
+        today=today,
+    )
+
+
+def hand_built_taxonomy():
+    taxonomy = get_taxonomy()
+    sub_pillars_by_pillar = {}
+    for sp in SubPillar.objects.order_by('id'):
+        sub_pillars_by_pillar.setdefault(sp.pillar_id, []).append(
+            SubPillarRecord(sp.id, sp.pillar_id, sp.name, sp.weight)
+        )
+    return TaxonomyRecords(
+        pillars=[PillarRecord(pillar.id, pillar.name) for pillar in taxonomy.pillars],
+        sub_pillars_by_pillar=sub_pillars_by_pillar,
+        job_pillar_weights={job_id: dict(w) for job_id, w in taxonomy.job_pillar_weights.items()},
+        job_sub_pillar_weights={job_id: dict(w) for job_id, w in taxonomy.job_sub_pillar_weights.items()},
+    )
+
+
+class ScoringKernelParityTests(TestCase):
+    """The ORM adapter and the bare kernel must produce identical results."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.profiles = [
+            make_profile('empty', 0),
+            make_profile('small', 2),
+            make_profile('self_quiz', 5, ('self', 'approved', Decimal('80'))),
+            make_profile('referral', 7, ('referral', 'pending', Decimal('0'))),
+            make_profile('link', 9, ('link', 'approved', Decimal('12'))),
+        ]
+        cls.job_roles = list(JobRole.objects.filter(is_active=True).order_by('id'))
+
+    def test_calculate_iri_matches_kernel(self):
+        taxonomy = hand_built_taxonomy()
+        for user, profile in self.profiles:
+            calculator = ReadinessCalculator(user)
+            kernel = ScoringKernel(hand_built_records(profile, calculator.snapshot.today), taxonomy)
+            for job_role in self.job_roles:
+                for level in ('startup', 'corporate', 'leading'):
+                    with self.subTest(profile=user.username, job=job_role.name, level=level):
+                        self.assertEqual(
+                            calculator.calculate_iri(job_role, level),
+                            kernel.calculate_iri(JobRecord(job_role.id, job_role.name), level),
+                        )
+
+    def test_sub_pillar_scores_match_kernel(self):
+        taxonomy = hand_built_taxonomy()
+        for user, profile in self.profiles:
+            calculator = ReadinessCalculator(user)
+            kernel = ScoringKernel(hand_built_records(profile, calculator.snapshot.today), taxonomy)
+            with self.subTest(profile=user.username):
+                self.assertEqual(calculator.calculate_sub_pillar_scores(), kernel.sub_pillar_scores())
+
+    def test_float_mode_adapter(self):
+        for user, profile in self.profiles:
+            exact = ReadinessCalculator(user)
+            fast = ReadinessCalculator(user, numeric_mode='float')
+            for job_role in self.job_roles:
+                with self.subTest(profile=user.username, job=job_role.name):
+                    self.assertAlmostEqual(
+                        exact.calculate_iri(job_role, 'leading')['iri_score'],
+                        fast.calculate_iri(job_role, 'leading')['iri_score'],
+                        places=2,
+                    )
+
+    def test_query_count_does_not_grow_with_the_profile(self):
+        small_user, _ = self.profiles[1]
+        large_user, _ = make_profile('large', 12, ('self', 'approved', Decimal('90')))
+        job_role = self.job_roles[0]
+        get_taxonomy()
+
+        with CaptureQueriesContext(connection) as small:
+            ReadinessCalculator(small_user).calculate_iri(job_role)
+        self.assertGreater(len(small), 0)
+        with self.assertNumQueries(len(small)):
+            ReadinessCalculator(large_user).calculate_iri(job_role)
+
+    def test_records_survive_pickling(self):
+        user, profile = self.profiles[-1]
+        calculator = ReadinessCalculator(user)
+        records = pickle.loads(pickle.dumps(calculator.snapshot.records()))
+        taxonomy = pickle.loads(pickle.dumps(hand_built_taxonomy()))
+        job_role = self.job_roles[0]
+
+        self.assertGreater(calculator.calculate_iri(job_role)['iri_score'], 0)
+        self.assertEqual(
+            ScoringKernel(records, taxonomy).calculate_iri(JobRecord(job_role.id, job_role.name)),
+            calculator.calculate_iri(job_role),
+        )
+
+
+class StoredScoreFreshnessTests(TestCase):
+    """Stored scores are only served for the profile revision they were computed at."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.user, cls.profile = make_profile('stored', 2)
+        cls.job_role = JobRole.objects.filter(is_active=True).order_by('id').first()
+
+    def setUp(self):
+        # Responses are cached under the revision, which tests share
+        cache.clear()
+        self.profile.refresh_from_db()
+        recompute_profile_scores(self.profile)
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def calculate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/readiness/calculate/', {'job_role_id': self.job_role.id, 'company_level': 'startup'},
+                content_type='application/json',
+            )
+        return response.json()['freshness']
+
+    def test_unchanged_profile_is_served_from_storage(self):
+        self.assertIsNotNone(load_stored_scores(self.profile, COMPANY_LEVELS)[0])
+        self.assertEqual(self.calculate()['source'], 'stored')
+
+    def test_edit_without_a_queued_recompute_is_computed_live(self):
+        # An ORM write bumps the revision but queues nothing
+        VerificationRequest.objects.create(
+            profile=self.profile,
+            content_type=ContentType.objects.get_for_model(ProfileSkill),
+            object_id=self.profile.profile_skills.first().id,
+            method='referral',
+        )
+        self.profile.refresh_from_db()
+        self.assertEqual(load_stored_scores(self.profile, COMPANY_LEVELS), (None, False))
+
+        self.assertEqual(self.calculate()['source'], 'live')
+        self.assertTrue(ReadinessRecompute.objects.filter(profile=self.profile).exists())
+
+    def test_requesting_a_verification_queues_a_recompute(self):
+        skill = self.profile.profile_skills.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/verification/self_verification/', {'item_type': 'skill', 'item_id': skill.id},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(ReadinessRecompute.objects.filter(profile=self.profile).exists())
+        freshness = self.calculate()
+        self.assertEqual(freshness['source'], 'live')
+        self.assertTrue(freshness['recompute_pending'])
+
+
+class ReindexKeywordsTests(TestCase):
+    """reindex_keywords bumps and queues only the profiles whose hits changed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.stale_user, cls.stale = make_profile('stale_hits', 2)
+        cls.fresh_user, cls.fresh = make_profile('fresh_hits', 2)
+
+    def reindex(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('reindex_keywords', stdout=StringIO())
+        return dict(StudentProfile.objects.filter(
+            pk__in=[self.stale.pk, self.fresh.pk]
+        ).values_list('pk', 'revision'))
+
+    def test_changed_hits_bump_the_revision_and_queue_a_recompute(self):
+        # A queryset update, like a keyword table change, leaves revisions alone
+        Experience.objects.filter(profile=self.stale).update(keyword_hits={})
+        before = dict(StudentProfile.objects.values_list('pk', 'revision'))
+
+        revisions = self.reindex()
+
+        self.assertEqual(revisions[self.stale.pk], before[self.stale.pk] + 1)
+        self.assertEqual(revisions[self.fresh.pk], before[self.fresh.pk])
+        self.assertEqual(list(ReadinessRecompute.objects.values_list('profile_id', flat=True)), [self.stale.pk])
+        self.assertEqual(self.reindex(), revisions)
+
+
+class RescoreSelectionTests(TestCase):
+    """The queue worker and score_all_profiles --only-stale find every stale profile."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.profiles = [make_profile(username, 2)[1] for username in ('first', 'failing', 'last')]
+
+    def setUp(self):
+        for profile in self.profiles:
+            profile.refresh_from_db()
+            recompute_profile_scores(profile)
+
+    def test_only_stale_rescores_profiles_whose_revision_moved(self):
+        edited = self.profiles[1]
+        bump_revision(edited.id)
+        edited.refresh_from_db()
+
+        out = StringIO()
+        call_command('score_all_profiles', '--only-stale', '--jobs', '1', stdout=out)
+
+        self.assertIn('Scoring 1 profile(s)', out.getvalue())
+        self.assertEqual(set(ReadinessScore.objects.filter(profile=edited).values_list('revision', flat=True)),
+                         {edited.revision})
+
+    def test_a_failing_profile_does_not_block_the_queue(self):
+        for profile in self.profiles:
+            ReadinessRecompute.objects.create(profile=profile, requested_at=timezone.now())
+        failing = self.profiles[1]
+
+        def recompute(profile):
+            if profile.id == failing.id:
+                raise ValueError('broken profile')
+            return recompute_profile_scores(profile)
+
+        with mock.patch('readiness.services.recompute_profile_scores', side_effect=recompute), \
+                self.assertLogs('readiness.services', 'ERROR'):
+            self.assertEqual(drain_recompute_queue(), 2)
+
+        self.assertEqual(list(ReadinessRecompute.objects.values_list('profile_id', flat=True)), [failing.id])
+
+
+class ScoreListingTests(TestCase):
+    """Students list their own stored scores; only staff query the whole cohort."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.user, cls.profile = make_profile('listed', 3)
+        cls.staff = User.objects.create_user('staff', password='x', is_staff=True)
+        recompute_profile_scores(cls.profile)
+        cls.job_role = JobRole.objects.filter(is_active=True).order_by('id').first()
+
+    def get(self, user, url):
+        client = Client()
+        client.force_login(user)
+        return client.get(url)
+
+    def test_the_list_is_scoped_to_the_user_even_for_staff(self):
+        own = self.get(self.user, '/api/scores/').json()
+        self.assertEqual(own['count'], ReadinessScore.objects.filter(profile=self.profile).count())
+        self.assertEqual(self.get(self.staff, '/api/scores/').json()['count'], 0)
+
+    def test_cohort_is_staff_only_and_filters_on_pillar_scores(self):
+        pillar_score = PillarScore.objects.filter(profile=self.profile, job_role=self.job_role, score__gt=0).first()
+        url = f'/api/scores/cohort/?job_role={self.job_role.id}&pillar={pillar_score.pillar_id}'
+
+        self.assertEqual(self.get(self.user, url).status_code, 403)
+        results = self.get(self.staff, f'{url}&pillar_min={pillar_score.score}').json()['results']
+        self.assertEqual({row['profile'] for row in results}, {self.profile.id})
+        self.assertEqual(len(results), len(COMPANY_LEVELS))
+        below = self.get(self.staff, f'{url}&pillar_max={pillar_score.score - Decimal("0.01")}')
+        self.assertEqual(below.json()['count'], 0)
+
+
+class ScoreSketchTests(TestCase):
+    """Incrementally maintained sketches match a recount and have one row per cohort."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.profiles = [make_profile(username, size)[1] for username, size in (('ranked', 2), ('peer', 4))]
+        cls.job_role = JobRole.objects.filter(is_active=True).order_by('id').first()
+
+    def stored(self):
+        return {
+            (sketch.job_role_id, sketch.company_level, sketch.pillar_key): sketch.counts
+            for sketch in ScoreSketch.objects.all()
+        }
+
+    def test_incremental_sketches_match_a_rebuild(self):
+        for profile in self.profiles:
+            recompute_profile_scores(profile)
+        Experience.objects.filter(profile=self.profiles[0]).delete()
+        self.profiles[0].refresh_from_db()
+        recompute_profile_scores(self.profiles[0])
+        incremental = self.stored()
+
+        rebuild_sketches()
+
+        self.assertEqual(self.stored(), incremental)
+        pillar = get_taxonomy().pillars[0]
+        ranks = percentile_ranks({(self.job_role.id, 'startup', None): 50, (self.job_role.id, '', pillar.id): 50})
+        self.assertTrue(all(rank is not None for rank in ranks.values()))
+
+    def test_a_level_cohort_has_one_sketch(self):
+        apply_deltas({(self.job_role.id, 'startup', None): {3: 1}})
+        apply_deltas({(self.job_role.id, 'startup', None): {4: 1}})
+
+        sketch = ScoreSketch.objects.get(job_role=self.job_role, company_level='startup')
+        self.assertEqual((sketch.total, sketch.pillar_key), (2, 0))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ScoreSketch.objects.create(job_role=self.job_role, company_level='startup')
+
+
+class VerificationConfidenceTests(TestCase):
+    """Verifications score the item they target, through its stored verification_score."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.user, cls.profile = make_profile('verified', 2)
+
+    def verify(self, item, method, status, score):
+        verification = VerificationRequest.objects.create(
+            profile=self.profile,
+            content_type=ContentType.objects.get_for_model(item),
+            object_id=item.id,
+            method=method,
+            status=status,
+            score=score,
+        )
+        return ConfidenceService.refresh(verification)
+
+    def test_blend_keeps_the_best_approved_score_per_method(self):
+        first, second = self.profile.profile_skills.order_by('id')
+        self.assertEqual(self.verify(first, 'self', 'approved', Decimal('50')), Decimal('30.00'))
+        self.assertEqual(self.verify(first, 'self', 'approved', Decimal('80')), Decimal('48.00'))
+        self.assertEqual(self.verify(first, 'self', 'pending', Decimal('100')), Decimal('48.00'))
+        self.assertEqual(self.verify(first, 'referral', 'approved', Decimal('100')), Decimal('78.00'))
+        self.assertEqual(self.verify(first, 'link', 'approved', Decimal('70')), Decimal('85.00'))
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.verification_score, Decimal('85.00'))
+        self.assertEqual(second.verification_score, Decimal('0'))
+
+        experience = self.profile.experiences.first()
+        self.verify(experience, 'referral', 'approved', Decimal('100'))
+        experience.refresh_from_db()
+        self.assertEqual(experience.verification_score, Decimal('30.00'))
+
+    def test_only_the_verified_skill_scores_higher(self):
+        first, second = self.profile.profile_skills.select_related('skill').order_by('id')
+        before = ReadinessCalculator(self.user).calculate_sub_pillar_scores()
+        self.verify(first, 'self', 'approved', Decimal('100'))
+        after = ReadinessCalculator(self.user).calculate_sub_pillar_scores()
+
+        changed = {sub_pillar_id for sub_pillar_id in before if before[sub_pillar_id] != after[sub_pillar_id]}
+        self.assertEqual(changed, {first.skill.sub_pillar_id})
+        self.assertNotEqual(first.skill.sub_pillar_id, second.skill.sub_pillar_id)
+
+    def test_a_verified_experience_scores_its_sub_pillars_higher(self):
+        experience = self.profile.experiences.order_by('id').first()
+        before = ReadinessCalculator(self.user).calculate_sub_pillar_scores()
+        self.verify(experience, 'referral', 'approved', Decimal('100'))
+        after = ReadinessCalculator(self.user).calculate_sub_pillar_scores()
+
+        changed = {sub_pillar_id for sub_pillar_id in before if before[sub_pillar_id] != after[sub_pillar_id]}
+        self.assertEqual(changed, {int(sub_pillar_id) for sub_pillar_id in experience.keyword_hits})
+        for sub_pillar_id in changed:
+            self.assertGreater(after[sub_pillar_id], before[sub_pillar_id])
+
+    def test_plans_only_verify_skills_by_quiz(self):
+        records = ReadinessCalculator(self.user).snapshot.records()
+        actions = candidate_actions(records, get_taxonomy(), {}, {})
+        verify = [action for action in actions if action.kind.startswith('verify_')]
+
+        self.assertEqual(len(verify), 2)
+        self.assertEqual({action.details['method'] for action in verify}, {'self'})
+
+
+class TopJobsTests(TestCase):
+    """top_k returns exactly the head of a full sort of every job's score."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        cls.users = [make_profile(username, size)[0] for username, size in (('lean', 1), ('broad', 6))]
+
+    def full_sort(self, scores):
+        """Job indexes best first; ties keep the lower index first."""
+        return [int(index) for index in np.argsort(-np.asarray(scores), kind='stable')]
+
+    def test_top_jobs_match_score_all_jobs(self):
+        for user in self.users:
+            calculator = ReadinessCalculator(user)
+            ranked = sorted(calculator.score_all_jobs('corporate'), key=lambda job: -job['base_score'])
+            for k in range(1, len(ranked) + 3):
+                top, evaluated = calculator.top_jobs(k, 'corporate')
+                with self.subTest(profile=user.username, k=k):
+                    self.assertEqual([job['id'] for job in top], [job['id'] for job in ranked[:k]])
+                    for job, expected in zip(top, ranked):
+                        self.assertAlmostEqual(job['iri_score'], expected['iri_score'])
+                    self.assertLessEqual(evaluated, len(ranked))
+
+    def test_ties_and_k_beyond_the_catalog(self):
+        # Jobs 0 and 2 and jobs 1 and 3 have identical weights
+        pillar_weights = np.array([[60.0, 40.0], [20.0, 80.0], [60.0, 40.0], [20.0, 80.0], [50.0, 50.0]])
+        sub_weights = np.array([
+            [0.5, 0.5, 1.0], [1.0, 0.0, 1.0], [0.5, 0.5, 1.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0],
+        ])
+        matrix = JobWeightMatrix(
+            job_ids=[10, 11, 12, 13, 14], job_names=['a', 'b', 'c', 'd', 'e'],
+            pillar_ids=[1, 2], sub_pillar_ids=[101, 102, 201],
+            sub_pillar_pillar=np.array([0, 0, 1], dtype=np.intp),
+            pillar_weights=pillar_weights, sub_weights=sub_weights,
+        )
+        for sub_pillar_scores in ({101: 80, 102: 40, 201: 60}, {101: 50, 102: 50, 201: 50}, {}):
+            scores = matrix.base_scores(sub_pillar_scores)
+            expected = self.full_sort(scores)
+            for k in range(1, 8):
+                top, _ = matrix.top_k(sub_pillar_scores, k)
+                with self.subTest(scores=sub_pillar_scores, k=k):
+                    self.assertEqual([index for index, _ in top], expected[:k])
+                    self.assertEqual([score for _, score in top], [scores[index] for index in expected[:k]])
+
+
+class CandidateRankingTests(TestCase):
+    """The threshold algorithm ranks exactly like scoring every stored SubPillarScore row."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_taxonomy()
+        sub_pillars = list(SubPillar.objects.order_by('id')[:4])
+        # Dyadic weights and whole scores keep every sum exact, so ties are exact
+        cls.weights = dict(zip((sp.id for sp in sub_pillars), (0.5, 0.25, 0.125, 0.125)))
+        users = User.objects.bulk_create([User(username=f'candidate{i}') for i in range(40)])
+        profiles = StudentProfile.objects.bulk_create([StudentProfile(user=user) for user in users])
+        rng = random.Random(7)
+        rows = []
+        for i, profile in enumerate(profiles):
+            # Groups of five profiles share their scores
+            if i % 5 == 0:
+                scores = {sp.id: rng.choice([0, 20, 40, 60, 80, 100]) for sp in sub_pillars}
+            rows.extend(
+                SubPillarScore(profile=profile, sub_pillar_id=sub_pillar_id, score=Decimal(score))
+                for sub_pillar_id, score in scores.items() if score
+            )
+        SubPillarScore.objects.bulk_create(rows)
+
+    def brute_force(self, weights, limit):
+        totals = {}
+        for profile_id, sub_pillar_id, score in SubPillarScore.objects.values_list(
+            'profile_id', 'sub_pillar_id', 'score'
+        ):
+            if sub_pillar_id in weights:
+                totals[profile_id] = totals.get(profile_id, 0.0) + weights[sub_pillar_id] * float(score)
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def test_matches_brute_force_with_ties(self):
+        profiles = len(set(SubPillarScore.objects.values_list('profile_id', flat=True)))
+        for batch_size in (1, 3, 100):
+            for limit in (1, 2, 5, 10, profiles, profiles + 5):
+                ranked, stats = top_candidates(self.weights, limit, batch_size=batch_size)
+                with self.subTest(batch_size=batch_size, limit=limit):
+                    self.assertEqual(ranked, self.brute_force(self.weights, limit))
+                    self.assertLessEqual(stats['profiles_seen'], profiles)
+
+    def test_weights_without_stored_scores(self):
+        empty = SubPillar.objects.exclude(id__in=self.weights).order_by('id').first()
+        weights = {**self.weights, empty.id: 0.5}
+
+        self.assertEqual(top_candidates(weights, 7, batch_size=4)[0], self.brute_force(weights, 7))
+        self.assertEqual(top_candidates({empty.id: 1.0}, 3)[0], [])
+
+
+class FloatModeGoldenTests(SimpleTestCase):
+    """
+    Golden parity for numeric_mode='float': on a fixed corpus of generated
+    profiles every score must match the Decimal (reference) mode to 2 dp.
+    """
+
+    PROFILE_COUNT = 150
+    LEVELS = ('startup', 'corporate', 'leading')
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.taxonomy = synthetic.make_taxonomy(seed=7)
+        cls.jobs = synthetic.make_jobs(cls.taxonomy)
+        cls.profiles = synthetic.make_profiles(cls.taxonomy, cls.PROFILE_COUNT, seed=7)
+
+    def assertResultsMatch(self, golden, fast):
+        self.assertAlmostEqual(golden['iri_score'], fast['iri_score'], places=2)
+        self.assertAlmostEqual(golden['base_score'], fast['base_score'], places=2)
+        self.assertEqual(golden['breakdown'].keys(), fast['breakdown'].keys())
+        for pillar_id, expected in golden['breakdown'].items():
+            actual = fast['breakdown'][pillar_id]
+            self.assertAlmostEqual(expected['score'], actual['score'], places=2)
+            self.assertAlmostEqual(expected['weighted_contribution'], actual['weighted_contribution'], places=2)
+            self.assertEqual(expected['weight_percent'], actual['weight_percent'])
+        self.assertEqual(golden['verification_impact'], fast['verification_impact'])
+        self.assertEqual(golden['company_multiplier'], fast['company_multiplier'])
+
+    def test_corpus_is_not_trivial(self):
+        scores = [
+            ScoringKernel(profile, self.taxonomy).calculate_iri(self.jobs[0])['iri_score']
+            for profile in self.profiles
+        ]
+        self.assertGreater(sum(1 for score in scores if score > 0), self.PROFILE_COUNT // 2)
+
+    def test_float_mode_matches_decimal_mode(self):
+        for index, profile in enumerate(self.profiles):
+            golden = ScoringKernel(profile, self.taxonomy)
+            fast = ScoringKernel(profile, self.taxonomy, numeric_mode='float')
+            for job in self.jobs:
+                for level in self.LEVELS:
+                    with self.subTest(profile=index, job=job.id, level=level):
+                        self.assertResultsMatch(
+                            golden.calculate_iri(job, level), fast.calculate_iri(job, level)
+                        )
+
+    def test_float_mode_sub_pillar_scores(self):
+        for index, profile in enumerate(self.profiles):
+            golden = ScoringKernel(profile, self.taxonomy).sub_pillar_scores()
+            fast = ScoringKernel(profile, self.taxonomy, numeric_mode='float').sub_pillar_scores()
+            with self.subTest(profile=index):
+                self.assertEqual(golden.keys(), fast.keys())
+                for sub_pillar_id, score in golden.items():
+                    self.assertIsInstance(fast[sub_pillar_id], float)
+                    self.assertAlmostEqual(float(score), fast[sub_pillar_id], places=2)
+
+    def test_unknown_numeric_mode(self):
+        with self.assertRaises(ValueError):
+            ScoringKernel(self.profiles[0], self.taxonomy, numeric_mode='fixed')
@@ -1,17 +1,38 @@
-﻿from rest_framework import viewsets, permissions, status
+﻿from django.db.models import Exists, OuterRef
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.core.cache import cache
 
 from profiles.models import StudentProfile
-from jobs.models import JobRole
-from .models import ReadinessScore
+from jobs.taxonomy import get_taxonomy
+from .models import ReadinessScore, PillarScore
 from .serializers import (
     ReadinessScoreSerializer,
+    CohortScoreSerializer,
+    ReadinessScoreFilterSerializer,
     ReadinessCalculationRequestSerializer,
-    ReadinessResultSerializer
+    CandidateRankingRequestSerializer,
+    SimulationRequestSerializer,
+    PlanRequestSerializer,
+    ReadinessResultSerializer,
+    ReadinessAllLevelsResultSerializer
 )
 from .calculation_engine import ReadinessCalculator
+from .candidates import job_weights, top_candidates
+from .kernel import ALL_LEVELS, combine_levels
+from .sketches import PILLAR_LEVEL, percentile_ranks
+from .simulation import SimulationError, simulate as simulate_changes
+from .planner import plan as plan_actions
+from .services import (
+    COMPANY_LEVELS,
+    load_stored_scores,
+    stored_result,
+    freshness,
+    request_recompute,
+    result_cache_key,
+    cached_result,
+    rows_valid_until,
+)
 
 
 class ReadinessViewSet(viewsets.ViewSet):
@@ -28,8 +49,15 @@ class ReadinessViewSet(viewsets.ViewSet):
         POST /api/readiness/calculate/
         {
             "job_role_id": 1,
-            "company_level": "startup"  // optional: startup, corporate, leading
+            "company_level": "startup"  // optional: startup, corporate, leading, all
         }
+        
+        company_level "all" returns one breakdown with the adjusted score of
+        every level under "levels", computed from a single base score.
+        
+        "percentile" (on the result, each level and each pillar) is the
+        share of students scoring below this one for the job role, read
+        from the cohort score sketches (see readiness/sketches.py).
         """
         serializer = ReadinessCalculationRequestSerializer(data=request.data)
         if not serializer.is_valid():
@@ -38,10 +66,12 @@ class ReadinessViewSet(viewsets.ViewSet):
         job_role_id = serializer.validated_data.get('job_role_id')
         company_level = serializer.validated_data.get('company_level', 'startup')
         
-        # Get job role
-        try:
-            job_role = JobRole.objects.get(id=job_role_id, is_active=True)
-        except JobRole.DoesNotExist:
+        # Get job role from the shared taxonomy snapshot
+        job_role = next(
+            (job for job in get_taxonomy().active_job_roles if job.id == job_role_id),
+            None
+        )
+        if job_role is None:
             return Response(
                 {'error': f'Job role {job_role_id} not found'},
                 status=status.HTTP_404_NOT_FOUND
@@ -56,20 +86,63 @@ class ReadinessViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Calculate readiness
-        calculator = ReadinessCalculator(request.user)
-        result = calculator.calculate_iri(job_role, company_level)
+        # Repeat requests for an unchanged profile are served from the cache
+        cache_key = result_cache_key('calculate', profile, job_role.id, company_level)
+        data = cached_result(
+            cache_key,
+            lambda: self._calculate_result(request, profile, job_role, company_level)
+        )
+        # Percentiles move with the cohort, so they are added after the cache
+        self._add_calculate_percentiles(data, job_role, company_level)
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _add_calculate_percentiles(self, data, job_role, company_level):
+        """Set cohort percentile ranks on a calculate response in place."""
+        pillar_ids = {pillar.name: pillar.id for pillar in get_taxonomy().pillars}
+        if company_level == ALL_LEVELS:
+            targets = {(job_role.id, level, None): item for level, item in data['levels'].items()}
+        else:
+            targets = {(job_role.id, company_level, None): data}
+        for item in data['breakdown']:
+            if item['name'] in pillar_ids:
+                targets[(job_role.id, PILLAR_LEVEL, pillar_ids[item['name']])] = item
+        
+        ranks = percentile_ranks({
+            key: item['score'] if key[1] == PILLAR_LEVEL else item['iri_score']
+            for key, item in targets.items()
+        })
+        for key, item in targets.items():
+            item['percentile'] = ranks[key]
+
+    def _calculate_result(self, request, profile, job_role, company_level):
+        """Serialized calculate response (materialized score if fresh, else live)."""
+        company_levels = COMPANY_LEVELS if company_level == ALL_LEVELS else [company_level]
+        
+        # Serve the materialized score when it is fresh, else calculate live
+        rows, pending = load_stored_scores(profile, company_levels, job_role)
+        if rows and company_level == ALL_LEVELS:
+            rows_by_level = {row.company_level: row for row in rows}
+            result = combine_levels({
+                level: stored_result(rows_by_level[level]) for level in company_levels
+            })
+        elif rows:
+            result = stored_result(rows[0])
+        else:
+            calculator = ReadinessCalculator(request.user, profile=profile)
+            result = calculator.calculate_iri(job_role, company_level)
+            if not pending:
+                request_recompute(profile)
+        result['freshness'] = freshness(rows, pending)
 
         if isinstance(result.get('breakdown'), dict):
             result['breakdown'] = list(result['breakdown'].values())
         
-        # Cache result for 1 hour
-        cache_key = f"readiness_{request.user.id}_{job_role_id}_{company_level}"
-        cache.set(cache_key, result, 3600)
-        
-        # Serialize and return result
-        response_serializer = ReadinessResultSerializer(result)
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
+        # Serialize result
+        if company_level == ALL_LEVELS:
+            response_serializer = ReadinessAllLevelsResultSerializer(result)
+        else:
+            response_serializer = ReadinessResultSerializer(result)
+        return response_serializer.data
 
     @action(detail=False, methods=['get'])
     def all_jobs(self, request):
@@ -77,6 +150,10 @@ class ReadinessViewSet(viewsets.ViewSet):
         Calculate readiness for all job roles.
         
         GET /api/readiness/all_jobs/?company_level=startup
+        GET /api/readiness/all_jobs/?company_level=startup&top_k=3
+        
+        With top_k only the k best-fit roles are returned; evaluated_roles
+        reports how many roles were scored (0 when served from stored scores).
         """
         company_level = request.query_params.get('company_level', 'startup')
         
@@ -86,6 +163,18 @@ class ReadinessViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        top_k = request.query_params.get('top_k')
+        if top_k is not None:
+            try:
+                top_k = int(top_k)
+            except ValueError:
+                top_k = 0
+            if top_k < 1:
+                return Response(
+                    {'error': 'top_k must be a positive integer'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
         try:
             profile = StudentProfile.objects.get(user=request.user)
         except StudentProfile.DoesNotExist:
@@ -94,18 +183,43 @@ class ReadinessViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Calculate for all active job roles
-        job_roles = JobRole.objects.filter(is_active=True)
+        data = cached_result(
+            result_cache_key('all_jobs', profile, company_level, top_k),
+            lambda: self._all_jobs_result(request, profile, company_level, top_k)
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _all_jobs_result(self, request, profile, company_level, top_k=None):
+        """all_jobs response body for one company level (optionally top k only)."""
         results = {}
-        calculator = ReadinessCalculator(request.user)
-        
-        for job_role in job_roles:
-            result = calculator.calculate_iri(job_role, company_level)
-            results[job_role.name] = {
-                'id': job_role.id,
-                'iri_score': result.get('iri_score', 0),
-                'base_score': result.get('base_score', 0)
-            }
+        evaluated = 0
+        rows, pending = load_stored_scores(profile, [company_level])
+        if rows:
+            valid_until = rows_valid_until(rows)
+            for row in rows:
+                results[row.job_role.name] = {
+                    'id': row.job_role_id,
+                    'iri_score': float(row.score),
+                    'base_score': float(row.base_score)
+                }
+        else:
+            calculator = ReadinessCalculator(request.user, profile=profile)
+            if top_k:
+                # One pass over the weight matrix; only the best k are sorted
+                job_results, evaluated = calculator.top_jobs(top_k, company_level)
+            else:
+                # Score all active job roles in one pass over the weight matrix
+                job_results = calculator.score_all_jobs(company_level)
+                evaluated = len(job_results)
+            valid_until = calculator.valid_until()
+            for job_result in job_results:
+                results[job_result['name']] = {
+                    'id': job_result['id'],
+                    'iri_score': job_result['iri_score'],
+                    'base_score': job_result['base_score']
+                }
+            if not pending:
+                request_recompute(profile)
         
         # Sort by IRI score descending
         sorted_results = sorted(
@@ -114,10 +228,17 @@ class ReadinessViewSet(viewsets.ViewSet):
             reverse=True
         )
         
-        return Response({
+        data = {
             'company_level': company_level,
-            'results': dict(sorted_results)
-        }, status=status.HTTP_200_OK)
+            'results': dict(sorted_results[:top_k]),
+            'valid_until': valid_until,
+            'freshness': freshness(rows, pending)
+        }
+        if top_k:
+            data['top_k'] = top_k
+            data['evaluated_roles'] = evaluated
+            data['total_roles'] = len(get_taxonomy().active_job_roles)
+        return data
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
@@ -125,6 +246,8 @@ class ReadinessViewSet(viewsets.ViewSet):
         Get readiness summary for user across all job roles.
         
         GET /api/readiness/summary/
+        
+        Each top role carries its cohort "percentile" (see calculate).
         """
         try:
             profile = StudentProfile.objects.get(user=request.user)
@@ -134,9 +257,27 @@ class ReadinessViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        calculator = ReadinessCalculator(request.user)
-        job_roles = JobRole.objects.filter(is_active=True)
+        data = cached_result(
+            result_cache_key('summary', profile),
+            lambda: self._summary_result(request, profile)
+        )
         
+        targets = [
+            (company_level, role)
+            for company_level, level_data in data['company_levels'].items()
+            for role in level_data['top_3']
+        ]
+        if data['best_fit_role']:
+            targets.append(('startup', data['best_fit_role']))
+        ranks = percentile_ranks({
+            (role['id'], company_level, None): role['score'] for company_level, role in targets
+        })
+        for company_level, role in targets:
+            role['percentile'] = ranks[(role['id'], company_level, None)]
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _summary_result(self, request, profile):
+        """summary response body across all job roles and company levels."""
         summary_data = {
             'overall_average': 0,
             'best_fit_role': None,
@@ -144,18 +285,35 @@ class ReadinessViewSet(viewsets.ViewSet):
             'company_levels': {}
         }
         
-        for company_level in ['startup', 'corporate', 'leading']:
+        rows, pending = load_stored_scores(profile, COMPANY_LEVELS)
+        if rows:
+            summary_data['valid_until'] = rows_valid_until(rows)
+            level_scores = {company_level: [] for company_level in COMPANY_LEVELS}
+            for row in rows:
+                level_scores[row.company_level].append({
+                    'id': row.job_role_id,
+                    'name': row.job_role.name,
+                    'iri_score': float(row.score)
+                })
+        else:
+            # Every level from one sub-pillar score vector and matrix product
+            calculator = ReadinessCalculator(request.user, profile=profile)
+            level_scores = calculator.score_all_jobs_levels(COMPANY_LEVELS)
+            summary_data['valid_until'] = calculator.valid_until()
+            if not pending:
+                request_recompute(profile)
+        
+        for company_level in COMPANY_LEVELS:
             scores = []
             level_results = []
             
-            for job_role in job_roles:
-                result = calculator.calculate_iri(job_role, company_level)
-                score = result.get('iri_score', 0)
+            for job_result in level_scores[company_level]:
+                score = job_result['iri_score']
                 scores.append(score)
                 level_results.append({
-                    'role': job_role.name,
+                    'role': job_result['name'],
                     'score': score,
-                    'id': job_role.id
+                    'id': job_result['id']
                 })
             
             # Sort and get top 3
@@ -181,15 +339,214 @@ class ReadinessViewSet(viewsets.ViewSet):
         if startup_top:
             summary_data['best_fit_role'] = startup_top[0]
         
-        return Response(summary_data, status=status.HTTP_200_OK)
+        summary_data['freshness'] = freshness(rows, pending)
+        
+        return summary_data
+
+
+    @action(detail=False, methods=['post'])
+    def simulate(self, request):
+        """
+        What-if scores for hypothetical profile changes; nothing is saved.
+        
+        POST /api/readiness/simulate/
+        {
+            "job_role_ids": [1, 2],  // optional, default every active role
+            "company_level": "startup",
+            "add_skills": [12],
+            "remove_skills": [],
+            "add_experiences": [{"role_title": "...", "company": "...", ...}],
+            "remove_experiences": [3],
+            "add_projects": [], "remove_projects": [],
+            "add_certifications": [], "remove_certifications": [],
+            "add_verifications": [{"method": "link", "status": "approved", "score": 40, "skill_id": 12}],
+            "remove_verifications": []
+        }
+        
+        Returns before/after scores and the delta per job role, largest
+        gain first. Only the sub-pillars the changes touch are scored again
+        (see readiness/simulation.py), so this is cheap enough to call on
+        every edit in the UI.
+        """
+        serializer = SimulationRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            profile = StudentProfile.objects.get(user=request.user)
+        except StudentProfile.DoesNotExist:
+            return Response(
+                {'error': 'User profile not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            data = simulate_changes(profile, serializer.validated_data)
+        except SimulationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def plan(self, request):
+        """
+        Cheapest ordered actions found to reach a target score for a job role.
+        
+        POST /api/readiness/plan/
+        {
+            "job_role_id": 1,
+            "company_level": "startup",
+            "target_score": 60,
+            "max_actions": 10  // optional
+        }
+        
+        Actions are verifying an existing skill, adding a skill in a weak
+        sub-pillar or adding a certification (see readiness/planner.py).
+        "reached" tells whether the plan gets to the target; "complete" is
+        false when the time budget cut the search short.
+        """
+        serializer = PlanRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = serializer.validated_data
+        job_role = next(
+            (job for job in get_taxonomy().active_job_roles if job.id == params['job_role_id']),
+            None
+        )
+        if job_role is None:
+            return Response(
+                {'error': f'Job role {params["job_role_id"]} not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            profile = StudentProfile.objects.get(user=request.user)
+        except StudentProfile.DoesNotExist:
+            return Response(
+                {'error': 'User profile not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        data = plan_actions(
+            profile, job_role, params['company_level'], params['target_score'], params['max_actions']
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def candidates(self, request):
+        """
+        Rank students by readiness for a job role (staff only).
+        
+        GET /api/readiness/candidates/?job_role_id=1&company_level=corporate&page=1&page_size=20
+        
+        Ranked from the stored SubPillarScore rows with the threshold
+        algorithm (see readiness/candidates.py), so only as many profiles
+        are read as the requested page needs. Students with no stored score
+        above zero are not listed.
+        """
+        serializer = CandidateRankingRequestSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = serializer.validated_data
+        job_role = next(
+            (job for job in get_taxonomy().active_job_roles if job.id == params['job_role_id']),
+            None
+        )
+        if job_role is None:
+            return Response(
+                {'error': f'Job role {params["job_role_id"]} not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        page, page_size = params['page'], params['page_size']
+        ranked, stats = top_candidates(job_weights(job_role.id), page * page_size)
+        page_rows = ranked[(page - 1) * page_size:]
+        
+        profiles = StudentProfile.objects.select_related('user').in_bulk(
+            [profile_id for profile_id, _ in page_rows]
+        )
+        multiplier = float(ReadinessCalculator.COMPANY_LEVEL_MULTIPLIERS[params['company_level']])
+        
+        results = [
+            {
+                'rank': rank,
+                'profile_id': profile_id,
+                'full_name': profiles[profile_id].full_name,
+                'username': profiles[profile_id].user.username,
+                'iri_score': min(base_score * multiplier, 100.0),
+                'base_score': base_score
+            }
+            for rank, (profile_id, base_score) in enumerate(page_rows, start=(page - 1) * page_size + 1)
+            if profile_id in profiles
+        ]
+        
+        return Response({
+            'job_role': {'id': job_role.id, 'name': job_role.name},
+            'company_level': params['company_level'],
+            'page': page,
+            'page_size': page_size,
+            'results': results,
+            'stats': stats
+        }, status=status.HTTP_200_OK)
 
 
 class ReadinessScoreViewSet(viewsets.ReadOnlyModelViewSet):
-    """Legacy viewset for persisted readiness scores."""
+    """
+    Legacy viewset for persisted readiness scores, scoped to the user's own
+    profile. Optional query parameters of the list (and of cohort):
+        job_role, company_level: exact match
+        min_score, max_score: range on the IRI score
+        pillar, pillar_min, pillar_max: range on one pillar's score for the
+            row's job role (via the indexed PillarScore table)
+    """
     serializer_class = ReadinessScoreSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return ReadinessScore.objects.filter(
+        queryset = ReadinessScore.objects.filter(
             profile__user=self.request.user
         ).select_related('job_role').order_by('-updated_at')
+        if self.action != 'list':
+            return queryset
+        return self._filter_scores(queryset)
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def cohort(self, request):
+        """
+        Every student's stored scores matching the filters (staff only).
+        
+        GET /api/scores/cohort/?job_role=3&pillar=1&pillar_min=70
+        """
+        queryset = self._filter_scores(
+            ReadinessScore.objects.select_related('job_role', 'profile').order_by('-score', 'id')
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(CohortScoreSerializer(page, many=True).data)
+
+    def _filter_scores(self, queryset):
+        """Apply the list query parameters to a ReadinessScore queryset."""
+        params = ReadinessScoreFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        if 'job_role' in filters:
+            queryset = queryset.filter(job_role_id=filters['job_role'])
+        if 'company_level' in filters:
+            queryset = queryset.filter(company_level=filters['company_level'])
+        if 'min_score' in filters:
+            queryset = queryset.filter(score__gte=filters['min_score'])
+        if 'max_score' in filters:
+            queryset = queryset.filter(score__lte=filters['max_score'])
+        if 'pillar' in filters:
+            pillar_scores = PillarScore.objects.filter(
+                profile=OuterRef('profile'),
+                job_role=OuterRef('job_role'),
+                pillar_id=filters['pillar'],
+            )
+            if 'pillar_min' in filters:
+                pillar_scores = pillar_scores.filter(score__gte=filters['pillar_min'])
+            if 'pillar_max' in filters:
+                pillar_scores = pillar_scores.filter(score__lte=filters['pillar_max'])
+            queryset = queryset.filter(Exists(pillar_scores))
+        return queryset
@@ -0,0 +1,158 @@
+"""
+Quiz grading with keyword relevance.
+
+Word counts alone let 40 words of filler pass a quiz. Text answers are now
+also checked against the terms their item is about:
+
+- a skill: its name, its sub-pillar's name and readiness keywords, and the
+  names of the other skills in that sub-pillar. This index covers every
+  skill and is built once per taxonomy version.
+- an experience: its role title, company and description
+- a project: its title, technologies and description
+
+Answers and item texts go through readiness.keywords.tokenize, so 'deployed'
+matches 'deploy'. QuizGrader grades a whole batch: the items are loaded with
+one query per item type, and each distinct answer or item text is tokenized
+once, however many quizzes share it.
+"""
+
+import threading
+
+from django.contrib.contenttypes.models import ContentType
+
+from jobs.taxonomy import get_taxonomy
+from profiles.models import ProfileSkill, Experience, Project
+from readiness.keywords import EXPERIENCE_KEYWORDS, PROJECT_KEYWORDS, CERTIFICATION_KEYWORDS, tokenize
+from .services import QuizGenerator, QuizEvaluator
+
+
+# Tokens too common to show an answer is about anything
+STOPWORDS = frozenset('''
+    a an and are as at be been but by can did do for from had has have how i in into is it its my of on
+    or our so that the their them then there they this to use used using was we were what when where which
+    while who will with would you your also very more most some such than other about over just like
+    work worked working team project skill
+'''.split())
+
+MIN_TERM_LENGTH = 2
+
+# Relevant terms an answer needs for full relevance credit
+RELEVANT_TERMS_FOR_FULL = 3
+
+
+def terms_of(text):
+    """tokenize() without stopwords and one-letter tokens."""
+    return frozenset(
+        token for token in tokenize(text) if len(token) >= MIN_TERM_LENGTH and token not in STOPWORDS
+    )
+
+
+class SkillTermIndex:
+    """{skill id: relevance terms} for every skill of one taxonomy version."""
+
+    _lock = threading.Lock()
+    _current = None
+
+    def __init__(self, taxonomy):
+        self.version = taxonomy.version
+        sub_pillars = {sp.id: sp for sp in taxonomy.sub_pillars}
+
+        names_by_sub_pillar = {}
+        for skill in taxonomy.skills:
+            names_by_sub_pillar.setdefault(skill.sub_pillar_id, []).append(skill.name)
+
+        sub_pillar_terms = {}
+        for sub_pillar_id, sub_pillar in sub_pillars.items():
+            keywords = (
+                EXPERIENCE_KEYWORDS.get(sub_pillar.name, [])
+                + PROJECT_KEYWORDS.get(sub_pillar.name, [])
+                + CERTIFICATION_KEYWORDS.get(sub_pillar.name, [])
+            )
+            sub_pillar_terms[sub_pillar_id] = terms_of(
+                ' '.join([sub_pillar.name, *keywords, *names_by_sub_pillar.get(sub_pillar_id, [])])
+            )
+
+        self.terms = {
+            skill.id: terms_of(skill.name) | sub_pillar_terms.get(skill.sub_pillar_id, frozenset())
+            for skill in taxonomy.skills
+        }
+
+    @classmethod
+    def get(cls):
+        """The index of the current taxonomy, rebuilt when the version moves."""
+        taxonomy = get_taxonomy()
+        index = cls._current
+        if index is None or index.version != taxonomy.version:
+            with cls._lock:
+                if cls._current is None or cls._current.version != taxonomy.version:
+                    cls._current = cls(taxonomy)
+                index = cls._current
+        return index
+
+
+class QuizGrader:
+    """Grades a batch of self-verification quizzes."""
+
+    # item type: (model, related fields, text fields)
+    ITEM_MODELS = {
+        'skill': (ProfileSkill, ['skill'], ()),
+        'experience': (Experience, [], ('role_title', 'company', 'description')),
+        'project': (Project, [], ('title', 'technologies', 'description')),
+    }
+
+    def __init__(self):
+        self.answer_terms = {}
+        self.items = {}
+        self.item_terms = {}
+
+    def load_items(self, verifications):
+        """Load the items of the verifications, one query per item type."""
+        ids_by_type = {}
+        for verification in verifications:
+            ids_by_type.setdefault(verification.content_type_id, set()).add(verification.object_id)
+
+        skill_index = None
+        for item_type, (model, related, text_fields) in self.ITEM_MODELS.items():
+            content_type_id = ContentType.objects.get_for_model(model).id
+            ids = ids_by_type.get(content_type_id)
+            if not ids:
+                continue
+            for item in model.objects.filter(id__in=ids).select_related(*related):
+                if item_type == 'skill':
+                    skill_index = skill_index or SkillTermIndex.get()
+                    terms = skill_index.terms.get(item.skill_id) or terms_of(item.skill.name)
+                else:
+                    terms = terms_of(' '.join(getattr(item, field) or '' for field in text_fields))
+                self.items[content_type_id, item.id] = (item_type, item)
+                self.item_terms[content_type_id, item.id] = terms
+
+    def questions(self, verification):
+        """
+        The questions a verification was issued; quizzes issued before they
+        were stored fall back to the fixed question set of the loaded item.
+
+        Returns:
+            Questions, or None if the item is gone
+        """
+        if verification.quiz:
+            return QuizGenerator.stored_questions(verification.quiz)
+        loaded = self.items.get((verification.content_type_id, verification.object_id))
+        if loaded is None:
+            return None
+        return QuizGenerator._legacy_quiz(*loaded)
+
+    def relevance(self, answer, terms):
+        """0-1: how many of the item's terms the answer uses, capped at RELEVANT_TERMS_FOR_FULL."""
+        answer_terms = self.answer_terms.get(answer)
+        if answer_terms is None:
+            answer_terms = self.answer_terms[answer] = terms_of(answer)
+        return min(len(answer_terms & terms) / RELEVANT_TERMS_FOR_FULL, 1.0)
+
+    def grade(self, verification, questions, answers):
+        """Score (0-100) of one quiz; load_items() must have loaded its item."""
+        terms = self.item_terms.get((verification.content_type_id, verification.object_id))
+        if terms is None:
+            return QuizEvaluator.evaluate_answers(questions, answers)
+        return QuizEvaluator.evaluate_answers(
+            questions, answers, relevance=lambda answer: self.relevance(answer, terms)
+        )
@@ -0,0 +1,20 @@
+"""
+Django management command to recount the per-profile verification counters.
+
+VerificationCounter rows are kept current by signals on VerificationRequest
+saves and deletes. Queryset updates and bulk writes skip those signals, so
+this recounts every profile from VerificationRequest with a single GROUP BY
+and replaces the counter rows.
+"""
+from django.core.management.base import BaseCommand
+
+from verification.services import CounterService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-profile verification counts by method and status'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO('Rebuilding verification counters...'))
+        count = CounterService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt counters for {count} profile(s)'))
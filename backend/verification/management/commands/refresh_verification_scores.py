@@ -0,0 +1,59 @@
+"""
+Django management command to recompute every item's verification_score.
+
+The verification views keep ProfileSkill, Experience, Project and
+Certification.verification_score current as verifications complete. This
+blends them again from all VerificationRequests, which is needed once
+after deploying the column onto existing verifications. Profiles with a
+changed item are queued for a readiness recompute.
+"""
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from profiles.models import ProfileSkill, Experience, Project, Certification
+from profiles.signals import bump_revision, deferred_revision_bumps
+from readiness.kernel import blend_confidence
+from readiness.services import request_recomputes
+from verification.models import VerificationRequest
+
+
+class Command(BaseCommand):
+    help = 'Recompute the blended verification score of every verified profile item'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO('Blending verification scores...'))
+        models = {ContentType.objects.get_for_model(model).id: model for model in (
+            ProfileSkill, Experience, Project, Certification,
+        )}
+
+        by_item = defaultdict(list)
+        for verification in VerificationRequest.objects.filter(content_type_id__in=models).order_by('id'):
+            by_item[verification.content_type_id, verification.object_id].append(verification)
+
+        changed = 0
+        profile_ids = set()
+        with transaction.atomic(), deferred_revision_bumps():
+            for content_type_id, model in models.items():
+                items = list(model.objects.filter(verification_score__gt=0).union(
+                    model.objects.filter(id__in=[
+                        object_id for type_id, object_id in by_item if type_id == content_type_id
+                    ])
+                ))
+                updated = []
+                for item in items:
+                    score = blend_confidence(by_item.get((content_type_id, item.id), []))
+                    if item.verification_score != score:
+                        item.verification_score = score
+                        updated.append(item)
+                        bump_revision(item.profile_id)
+                        profile_ids.add(item.profile_id)
+                model.objects.bulk_update(updated, ['verification_score'], batch_size=500)
+                changed += len(updated)
+            request_recomputes(profile_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Updated {changed} item(s), queued {len(profile_ids)} profile(s) for recompute'
+        ))
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def count_existing(apps, schema_editor):
+    VerificationRequest = apps.get_model('verification', 'VerificationRequest')
+    VerificationCounter = apps.get_model('verification', 'VerificationCounter')
+    counters = {}
+    grouped = VerificationRequest.objects.values_list('profile_id', 'method', 'status').annotate(n=Count('id'))
+    for profile_id, method, status, count in grouped.order_by():
+        counter = counters.setdefault(profile_id, VerificationCounter(profile_id=profile_id))
+        if hasattr(counter, f'{method}_{status}'):
+            setattr(counter, f'{method}_{status}', count)
+    VerificationCounter.objects.bulk_create(counters.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_verification_score'),
+        ('verification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerificationCounter',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='verification_counter', serialize=False, to='profiles.studentprofile')),
+                ('self_pending', models.PositiveIntegerField(default=0)),
+                ('self_approved', models.PositiveIntegerField(default=0)),
+                ('self_rejected', models.PositiveIntegerField(default=0)),
+                ('self_expired', models.PositiveIntegerField(default=0)),
+                ('referral_pending', models.PositiveIntegerField(default=0)),
+                ('referral_approved', models.PositiveIntegerField(default=0)),
+                ('referral_rejected', models.PositiveIntegerField(default=0)),
+                ('referral_expired', models.PositiveIntegerField(default=0)),
+                ('link_pending', models.PositiveIntegerField(default=0)),
+                ('link_approved', models.PositiveIntegerField(default=0)),
+                ('link_rejected', models.PositiveIntegerField(default=0)),
+                ('link_expired', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+    ]
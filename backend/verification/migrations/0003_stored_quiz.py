@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verification', '0002_verification_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificationrequest',
+            name='quiz',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
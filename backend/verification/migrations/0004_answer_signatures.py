@@ -0,0 +1,69 @@
+# Generated by Django 4.2.28 on 2026-10-17 07:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verification', '0003_stored_quiz'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificationcounter',
+            name='link_review',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='verificationcounter',
+            name='referral_review',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='verificationcounter',
+            name='self_review',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='verificationrequest',
+            name='similar_to',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='verificationrequest',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('expired', 'Expired'), ('review', 'Manual review')], default='pending', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='AnswerSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question', models.PositiveSmallIntegerField()),
+                ('signature', models.BinaryField()),
+                ('verification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_signatures', to='verification.verificationrequest')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnswerBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question', models.PositiveSmallIntegerField()),
+                ('key', models.BigIntegerField()),
+                ('verification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='verification.verificationrequest')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='answersignature',
+            constraint=models.UniqueConstraint(fields=('verification', 'question'), name='unique_answer_signature'),
+        ),
+        migrations.AddConstraint(
+            model_name='answerband',
+            constraint=models.UniqueConstraint(fields=('verification', 'question', 'key'), name='unique_answer_band'),
+        ),
+        migrations.AddIndex(
+            model_name='answerband',
+            index=models.Index(fields=['key'], name='verificatio_key_c91639_idx'),
+        ),
+    ]
@@ -17,6 +17,8 @@ class VerificationStatus(models.TextChoices):
     APPROVED = "approved", "Approved"
     REJECTED = "rejected", "Rejected"
     EXPIRED = "expired", "Expired"
+    # Passed, but with answers that near-duplicate another verification's
+    REVIEW = "review", "Manual review"
 
 
 class VerificationRequest(models.Model):
@@ -36,6 +38,10 @@ class VerificationRequest(models.Model):
     referral_email = models.EmailField(blank=True)
     evidence_url = models.URLField(blank=True)
     token = models.CharField(max_length=64, blank=True)
+    # Self-verification question set: {"subject": ..., "questions": [bank template keys]}
+    quiz = models.JSONField(default=dict, blank=True)
+    # Verifications whose answers this one's near-duplicate (status REVIEW)
+    similar_to = models.JSONField(default=list, blank=True)
     expires_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -45,3 +51,83 @@ class VerificationRequest(models.Model):
 
     def __str__(self):
         return f"{self.profile} - {self.method} - {self.status}"
+
+
+class VerificationCounter(models.Model):
+    """
+    Verification counts of one profile by method and status, one column
+    per pair (named "<method>_<status>").
+
+    Maintained with F() updates by verification/signals.py whenever a
+    VerificationRequest is created, changes method or status, or is
+    deleted. Queryset update() and bulk writes bypass those signals; the
+    rebuild_verification_counters command recounts everything.
+    """
+
+    profile = models.OneToOneField(
+        StudentProfile, on_delete=models.CASCADE, primary_key=True, related_name="verification_counter"
+    )
+    self_pending = models.PositiveIntegerField(default=0)
+    self_approved = models.PositiveIntegerField(default=0)
+    self_rejected = models.PositiveIntegerField(default=0)
+    self_expired = models.PositiveIntegerField(default=0)
+    self_review = models.PositiveIntegerField(default=0)
+    referral_pending = models.PositiveIntegerField(default=0)
+    referral_approved = models.PositiveIntegerField(default=0)
+    referral_rejected = models.PositiveIntegerField(default=0)
+    referral_expired = models.PositiveIntegerField(default=0)
+    referral_review = models.PositiveIntegerField(default=0)
+    link_pending = models.PositiveIntegerField(default=0)
+    link_approved = models.PositiveIntegerField(default=0)
+    link_rejected = models.PositiveIntegerField(default=0)
+    link_expired = models.PositiveIntegerField(default=0)
+    link_review = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.profile} - verification counts"
+
+    @staticmethod
+    def field_name(method, status):
+        return f"{method}_{status}"
+
+    def count(self, method=None, status=None):
+        """Number of verifications, optionally of one method and/or status."""
+        methods = [method] if method else VerificationMethod.values
+        statuses = [status] if status else VerificationStatus.values
+        return sum(getattr(self, self.field_name(m, s)) for m in methods for s in statuses)
+
+
+class AnswerSignature(models.Model):
+    """
+    MinHash signature of one graded self-verification answer, NUM_PERM
+    little-endian uint32 values (see verification/similarity.py).
+    """
+
+    verification = models.ForeignKey(VerificationRequest, on_delete=models.CASCADE, related_name="answer_signatures")
+    question = models.PositiveSmallIntegerField()
+    signature = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["verification", "question"], name="unique_answer_signature"),
+        ]
+
+    def __str__(self):
+        return f"{self.verification_id} - question {self.question}"
+
+
+class AnswerBand(models.Model):
+    """One LSH band key of an AnswerSignature; answers sharing a key are duplicate candidates."""
+
+    verification = models.ForeignKey(VerificationRequest, on_delete=models.CASCADE, related_name="+")
+    question = models.PositiveSmallIntegerField()
+    key = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["key"])]
+        constraints = [
+            models.UniqueConstraint(fields=["verification", "question", "key"], name="unique_answer_band"),
+        ]
+
+    def __str__(self):
+        return f"{self.verification_id} - question {self.question} - {self.key}"
@@ -0,0 +1,157 @@
+"""
+Self-verification question bank.
+
+Question templates are grouped into one pool per item type (skill,
+experience, project) and compiled once per process. The questions for one
+subject (a skill name, a company, a project title) are rendered once and
+cached, so issuing a quiz is a random sample of indexes into that pool with
+no database access.
+
+An issued quiz is stored on its VerificationRequest as
+{"subject": ..., "questions": [template keys]} (see QuestionBank.issue),
+so grading reads that one row and renders the same questions again without
+regenerating anything. Template keys are stored with issued quizzes: add new
+templates freely, but never rename or delete a key.
+"""
+
+import random
+from functools import lru_cache
+
+
+QUESTIONS_PER_QUIZ = 4
+
+# (key, question with {subject}, type, extra fields)
+TEMPLATES = {
+    'skill': [
+        ('skill.proficiency', 'What is your proficiency level with {subject}?', 'multiple_choice', {
+            'options': ['Beginner', 'Intermediate', 'Advanced', 'Expert'],
+            'correct_answer': 'Intermediate',  # Will be validated against proficiency
+        }),
+        ('skill.duration', 'How many months/years have you been using {subject}?', 'text', {
+            'validation': 'numeric',
+        }),
+        ('skill.project', 'Describe a practical project where you applied {subject}', 'text', {
+            'min_words': 20,
+        }),
+        ('skill.related', 'What related skills do you use alongside {subject}?', 'text', {
+            'min_words': 10,
+        }),
+        ('skill.debugging', 'Describe a problem with {subject} you had to debug and how you solved it', 'text', {
+            'min_words': 25,
+        }),
+        ('skill.practices', 'Which best practices do you follow when working with {subject}?', 'text', {
+            'min_words': 15,
+        }),
+        ('skill.tradeoffs', 'When would you choose not to use {subject}, and what would you use instead?', 'text', {
+            'min_words': 20,
+        }),
+        ('skill.learning', 'How do you keep your {subject} knowledge up to date?', 'text', {
+            'min_words': 10,
+        }),
+    ],
+    'experience': [
+        ('experience.responsibilities', 'What were your primary responsibilities at {subject}?', 'text', {
+            'min_words': 30,
+        }),
+        ('experience.tools', 'Which technologies/tools did you use daily?', 'text', {
+            'min_words': 15,
+        }),
+        ('experience.challenge', 'Describe a significant challenge you overcame', 'text', {
+            'min_words': 40,
+        }),
+        ('experience.team_size', 'What was the team size you worked with?', 'multiple_choice', {
+            'options': ['Solo', '2-5 people', '6-15 people', '15+ people'],
+        }),
+        ('experience.impact', 'What measurable impact did your work at {subject} have?', 'text', {
+            'min_words': 20,
+        }),
+        ('experience.process', 'How did your team at {subject} plan, review and ship work?', 'text', {
+            'min_words': 20,
+        }),
+    ],
+    'project': [
+        ('project.architecture', 'Explain the main technical architecture of {subject}', 'text', {
+            'min_words': 40,
+        }),
+        ('project.role', 'What was your specific role and contribution?', 'text', {
+            'min_words': 30,
+        }),
+        ('project.challenge', 'What was the biggest technical challenge?', 'text', {
+            'min_words': 30,
+        }),
+        ('project.duration', 'How long did the project take from start to completion?', 'text', {
+            'validation': 'numeric',
+        }),
+        ('project.testing', 'How was {subject} tested and deployed?', 'text', {
+            'min_words': 20,
+        }),
+        ('project.retrospective', 'What would you change if you rebuilt {subject} today?', 'text', {
+            'min_words': 20,
+        }),
+    ],
+}
+
+# The fixed question sets quizzes had before the bank; also used to grade
+# quizzes issued without a stored question set
+LEGACY_KEYS = {
+    'skill': ['skill.proficiency', 'skill.duration', 'skill.project', 'skill.related'],
+    'experience': ['experience.responsibilities', 'experience.tools', 'experience.challenge', 'experience.team_size'],
+    'project': ['project.architecture', 'project.role', 'project.challenge', 'project.duration'],
+}
+
+
+class QuestionBank:
+    """Compiled question pools; use QuestionBank.get() for the shared instance."""
+
+    _instance = None
+
+    def __init__(self, templates=TEMPLATES):
+        self.pools = {item_type: tuple(pool) for item_type, pool in templates.items()}
+        self.item_types = {key: item_type for item_type, pool in templates.items() for key, *_ in pool}
+        self.indexes = {
+            key: index for pool in templates.values() for index, (key, *_) in enumerate(pool)
+        }
+        # Bound per instance so each bank keeps its own rendered pools
+        self.rendered = lru_cache(maxsize=2048)(self._render)
+
+    @classmethod
+    def get(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _render(self, item_type, subject):
+        return tuple(
+            {'key': key, 'question': text.format(subject=subject), 'type': question_type, **extra}
+            for key, text, question_type, extra in self.pools[item_type]
+        )
+
+    def issue(self, item_type, subject, count=QUESTIONS_PER_QUIZ, rng=random):
+        """
+        A random quiz for one item.
+
+        Returns:
+            (stored quiz {'subject', 'questions': [template keys]}, questions)
+        """
+        pool = self.rendered(item_type, subject)
+        picked = sorted(rng.sample(range(len(pool)), min(count, len(pool))))
+        quiz = {'subject': subject, 'questions': [pool[index]['key'] for index in picked]}
+        return quiz, self.questions(quiz)
+
+    def questions(self, quiz):
+        """
+        The questions of a stored quiz, numbered from 1 as answers are keyed.
+
+        Raises:
+            KeyError: a template key is not in the bank
+        """
+        keys = quiz['questions']
+        if not keys:
+            return []
+        pool = self.rendered(self.item_types[keys[0]], quiz['subject'])
+        questions = []
+        for number, key in enumerate(keys, start=1):
+            question = {'id': number, **pool[self.indexes[key]]}
+            del question['key']
+            questions.append(question)
+        return questions
@@ -42,6 +42,32 @@ class QuizSubmissionSerializer(serializers.Serializer):
     answers = serializers.DictField()  # question_id: answer
 
 
+class QuizBatchSubmissionSerializer(serializers.Serializer):
+    """Serializer for grading many quizzes in one request."""
+    MAX_SUBMISSIONS = 100
+    
+    submissions = serializers.DictField(child=serializers.DictField())  # verification_id: answers
+    
+    def validate_submissions(self, value):
+        if not value:
+            raise serializers.ValidationError('Submit at least one quiz.')
+        if len(value) > self.MAX_SUBMISSIONS:
+            raise serializers.ValidationError(f'At most {self.MAX_SUBMISSIONS} quizzes per request.')
+        submissions = {}
+        for verification_id, answers in value.items():
+            try:
+                submissions[int(verification_id)] = answers
+            except (TypeError, ValueError):
+                raise serializers.ValidationError(f'Invalid verification id: {verification_id}')
+        return submissions
+
+
+class QuizReviewSerializer(serializers.Serializer):
+    """Staff decision on a quiz held for manual review."""
+    verification_id = serializers.IntegerField()
+    approved = serializers.BooleanField()
+
+
 class ReferralVerificationRequestSerializer(serializers.Serializer):
     """Request serializer for referral verification."""
     item_type = serializers.ChoiceField(choices=['experience', 'project'])
@@ -58,11 +84,18 @@ class LinkVerificationRequestSerializer(serializers.Serializer):
     evidence_url = serializers.URLField()
 
 
+class ReferralConfirmationSerializer(serializers.Serializer):
+    """Referrer's answer to a referral verification email."""
+    token = serializers.CharField(max_length=64)
+    approved = serializers.BooleanField(default=True)
+
+
 class VerificationStatusSerializer(serializers.Serializer):
     """Serializer for verification status summary."""
     total_verifications = serializers.IntegerField()
     pending = serializers.IntegerField()
     approved = serializers.IntegerField()
     rejected = serializers.IntegerField()
+    in_review = serializers.IntegerField()
     by_method = serializers.DictField()
     recent_verifications = VerificationRequestSerializer(many=True)
@@ -8,125 +8,77 @@ from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import VerificationRequest, VerificationMethod, VerificationStatus
+from django.db import transaction
+from django.db.models import Count
+from readiness.kernel import blend_confidence
+from .models import VerificationRequest, VerificationMethod, VerificationStatus, VerificationCounter
+from .question_bank import QuestionBank, LEGACY_KEYS
 
 
 class QuizGenerator:
-    """Generate quiz questions based on profile items."""
+    """Generate quiz questions based on profile items (see question_bank.py)."""
+    
+    @staticmethod
+    def quiz_subject(item_type, item):
+        """The name a quiz for this item is about."""
+        if item_type == 'skill':
+            return item.skill.name if hasattr(item, 'skill') else str(item)
+        if item_type == 'experience':
+            return item.company
+        return item.title
+    
+    @staticmethod
+    def issue_quiz(item_type, item):
+        """
+        Pick a random question set for an item from the question bank.
+        
+        Returns:
+            (quiz to store on the VerificationRequest, questions to send)
+        """
+        return QuestionBank.get().issue(item_type, QuizGenerator.quiz_subject(item_type, item))
+    
+    @staticmethod
+    def stored_questions(quiz):
+        """Questions of a quiz stored by issue_quiz()."""
+        return QuestionBank.get().questions(quiz)
+    
+    @staticmethod
+    def _legacy_quiz(item_type, item):
+        quiz = {'subject': QuizGenerator.quiz_subject(item_type, item), 'questions': LEGACY_KEYS[item_type]}
+        return QuestionBank.get().questions(quiz)
     
     @staticmethod
     def generate_skill_quiz(skill_obj):
-        """Generate quiz questions for a skill."""
-        skill_name = skill_obj.skill.name if hasattr(skill_obj, 'skill') else str(skill_obj)
-        
-        # Generate contextual questions based on skill type
-        questions = [
-            {
-                'id': 1,
-                'question': f'What is your proficiency level with {skill_name}?',
-                'type': 'multiple_choice',
-                'options': ['Beginner', 'Intermediate', 'Advanced', 'Expert'],
-                'correct_answer': 'Intermediate'  # Will be validated against proficiency
-            },
-            {
-                'id': 2,
-                'question': f'How many months/years have you been using {skill_name}?',
-                'type': 'text',
-                'validation': 'numeric'
-            },
-            {
-                'id': 3,
-                'question': f'Describe a practical project where you applied {skill_name}',
-                'type': 'text',
-                'min_words': 20
-            },
-            {
-                'id': 4,
-                'question': f'What related skills do you use alongside {skill_name}?',
-                'type': 'text',
-                'min_words': 10
-            }
-        ]
-        
-        return questions
+        """Generate the fixed quiz questions for a skill."""
+        return QuizGenerator._legacy_quiz('skill', skill_obj)
     
     @staticmethod
     def generate_experience_quiz(experience):
-        """Generate quiz questions for work experience."""
-        questions = [
-            {
-                'id': 1,
-                'question': f'What were your primary responsibilities at {experience.company}?',
-                'type': 'text',
-                'min_words': 30
-            },
-            {
-                'id': 2,
-                'question': 'Which technologies/tools did you use daily?',
-                'type': 'text',
-                'min_words': 15
-            },
-            {
-                'id': 3,
-                'question': 'Describe a significant challenge you overcame',
-                'type': 'text',
-                'min_words': 40
-            },
-            {
-                'id': 4,
-                'question': 'What was the team size you worked with?',
-                'type': 'multiple_choice',
-                'options': ['Solo', '2-5 people', '6-15 people', '15+ people']
-            }
-        ]
-        
-        return questions
+        """Generate the fixed quiz questions for work experience."""
+        return QuizGenerator._legacy_quiz('experience', experience)
     
     @staticmethod
     def generate_project_quiz(project):
-        """Generate quiz questions for a project."""
-        questions = [
-            {
-                'id': 1,
-                'question': f'Explain the main technical architecture of {project.title}',
-                'type': 'text',
-                'min_words': 40
-            },
-            {
-                'id': 2,
-                'question': 'What was your specific role and contribution?',
-                'type': 'text',
-                'min_words': 30
-            },
-            {
-                'id': 3,
-                'question': 'What was the biggest technical challenge?',
-                'type': 'text',
-                'min_words': 30
-            },
-            {
-                'id': 4,
-                'question': 'How long did the project take from start to completion?',
-                'type': 'text',
-                'validation': 'numeric'
-            }
-        ]
-        
-        return questions
+        """Generate the fixed quiz questions for a project."""
+        return QuizGenerator._legacy_quiz('project', project)
 
 
 class QuizEvaluator:
     """Evaluate quiz answers and calculate scores."""
     
+    # Share of a text question's points kept by an answer with no relevant term
+    IRRELEVANT_SHARE = 0.4
+    
     @staticmethod
-    def evaluate_answers(questions, answers):
+    def evaluate_answers(questions, answers, relevance=None):
         """
         Evaluate quiz answers and return score (0-100).
         
         Scoring criteria:
         - Completeness: All questions answered
         - Detail level: Sufficient word count
-        - Relevance: Keywords matching expected content
+        - Relevance: Keywords matching expected content, when `relevance`
+          (answer -> 0-1, see grading.QuizGrader) is given
         """
         total_questions = len(questions)
         score = 0
@@ -150,6 +102,11 @@ class QuizEvaluator:
                     question_score += 10  # Bonus for sufficient detail
                 elif word_count >= min_words * 0.7:
                     question_score += 5   # Partial credit
+                
+                # Long answers that never mention the item earn little
+                if relevance is not None:
+                    share = QuizEvaluator.IRRELEVANT_SHARE
+                    question_score *= share + (1 - share) * relevance(answer)
             
             score += question_score
         
@@ -251,3 +208,68 @@ class LinkVerifier:
         # - Content quality
         
         return min(score, 100)
+
+
+class ConfidenceService:
+    """Keep the blended verification_score of verified profile items current."""
+    
+    @staticmethod
+    def refresh_item(content_type, object_id):
+        """
+        Blend the verifications of one item and store the result on it.
+        
+        Call inside the transaction that changed the verification. The item
+        row is locked first, so concurrent verifications of the same item
+        are blended one after the other.
+        
+        Returns:
+            The new score, or None if the item is gone or has no score field
+        """
+        model = content_type.model_class()
+        if model is None or 'verification_score' not in {field.name for field in model._meta.fields}:
+            return None
+        if not model.objects.select_for_update().filter(pk=object_id).exists():
+            return None
+        
+        score = blend_confidence(
+            VerificationRequest.objects.filter(content_type=content_type, object_id=object_id)
+        )
+        # update() skips save(): no keyword re-indexing, and the verification
+        # save already bumped the profile revision
+        model.objects.filter(pk=object_id).update(verification_score=score)
+        return score
+    
+    @staticmethod
+    def refresh(verification):
+        """refresh_item() for the item a VerificationRequest targets."""
+        # get_for_id() is served from the ContentType cache
+        content_type = ContentType.objects.get_for_id(verification.content_type_id)
+        return ConfidenceService.refresh_item(content_type, verification.object_id)
+
+
+class CounterService:
+    """Rebuild the per-profile VerificationCounter rows."""
+    
+    @staticmethod
+    def rebuild():
+        """
+        Recount every profile's verifications with one GROUP BY query and
+        replace all counter rows.
+        
+        Returns:
+            Number of counter rows written
+        """
+        counters = {}
+        grouped = VerificationRequest.objects.values_list('profile_id', 'method', 'status').annotate(n=Count('id'))
+        for profile_id, method, status, count in grouped.order_by():
+            counter = counters.get(profile_id)
+            if counter is None:
+                counter = counters[profile_id] = VerificationCounter(profile_id=profile_id)
+            field = VerificationCounter.field_name(method, status)
+            if hasattr(counter, field):
+                setattr(counter, field, count)
+        
+        with transaction.atomic():
+            VerificationCounter.objects.all().delete()
+            VerificationCounter.objects.bulk_create(counters.values(), batch_size=500)
+        return len(counters)
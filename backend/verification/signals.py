@@ -0,0 +1,62 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_init, post_save
+
+from profiles.signals import bump_profile_revision
+from .models import VerificationRequest, VerificationCounter
+
+
+post_save.connect(bump_profile_revision, sender=VerificationRequest, dispatch_uid='revision_save_VerificationRequest')
+post_delete.connect(bump_profile_revision, sender=VerificationRequest, dispatch_uid='revision_delete_VerificationRequest')
+
+
+def adjust_counter(profile_id, deltas, create=True):
+    """
+    Apply {(method, status): delta} to a profile's VerificationCounter in
+    one UPDATE, creating the row first if `create` is set.
+    """
+    changes = {}
+    for (method, status), delta in deltas.items():
+        if delta:
+            field = VerificationCounter.field_name(method, status)
+            # Never below 0, e.g. for rows counted before the counter existed
+            changes[field] = Greatest(F(field) + delta, 0)
+    if not changes:
+        return
+    updated = VerificationCounter.objects.filter(pk=profile_id).update(**changes)
+    if not updated and create:
+        # First verification of the profile; a concurrent first one may win the insert
+        VerificationCounter.objects.bulk_create([VerificationCounter(profile_id=profile_id)], ignore_conflicts=True)
+        VerificationCounter.objects.filter(pk=profile_id).update(**changes)
+
+
+def remember_counted_state(sender, instance, **kwargs):
+    # What the counter holds for this row, so a later save knows what to move
+    instance._counted = (instance.profile_id, instance.method, instance.status) if instance.pk else None
+
+
+def count_saved_verification(sender, instance, created, **kwargs):
+    current = (instance.profile_id, instance.method, instance.status)
+    previous = None if created else getattr(instance, '_counted', None)
+    if previous == current:
+        return
+    if previous is not None and previous[0] != current[0]:
+        adjust_counter(previous[0], {previous[1:]: -1}, create=False)
+        previous = None
+    deltas = {current[1:]: 1}
+    if previous is not None:
+        deltas[previous[1:]] = deltas.get(previous[1:], 0) - 1
+    adjust_counter(current[0], deltas)
+    instance._counted = current
+
+
+def count_deleted_verification(sender, instance, **kwargs):
+    counted = getattr(instance, '_counted', None)
+    if counted is not None:
+        # No create: the counter may already be gone with a deleted profile
+        adjust_counter(counted[0], {counted[1:]: -1}, create=False)
+
+
+post_init.connect(remember_counted_state, sender=VerificationRequest, dispatch_uid='counter_init_VerificationRequest')
+post_save.connect(count_saved_verification, sender=VerificationRequest, dispatch_uid='counter_save_VerificationRequest')
+post_delete.connect(count_deleted_verification, sender=VerificationRequest, dispatch_uid='counter_delete_VerificationRequest')
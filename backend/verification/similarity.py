@@ -0,0 +1,184 @@
+"""
+Near-duplicate detection for self-verification quiz answers.
+
+Each graded text answer is reduced to a MinHash signature over its word
+shingles. The signature is stored packed as uint32 values in AnswerSignature,
+which is 512 bytes for NUM_PERM = 128. It is also cut into BANDS bands of
+ROWS values, and each band is stored as one 64-bit key in AnswerBand.
+
+Two answers that share any band key are candidates. Their signatures are
+then compared, and a pair whose estimated Jaccard similarity reaches
+SIMILARITY_THRESHOLD is a near-duplicate. Finding the candidates for a
+submission is one indexed key__in lookup however many answers are stored.
+With 32 bands of 4 rows, a pair at the threshold is practically always a
+candidate. A pair 0.3 similar is a candidate about a quarter of the time,
+and unrelated answers (under 0.1) rarely are.
+
+The hash constants come from a fixed seed, so signatures stay comparable
+across processes and deploys. Changing NUM_PERM, BANDS, ROWS or SEED
+invalidates every stored signature.
+"""
+
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+from .models import AnswerSignature, AnswerBand
+
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SEED = 1
+SHINGLE_SIZE = 3
+
+# Shorter answers (numbers, multiple choice picks) are too alike to compare
+MIN_WORDS = 10
+SIMILARITY_THRESHOLD = 0.75
+
+# Band keys per lookup query, well under database parameter limits
+LOOKUP_BATCH = 900
+
+WORD_RE = re.compile(r"[a-z0-9#+]+")
+
+# Universal hashing (a * x + b) mod PRIME over 32-bit shingle hashes
+PRIME = np.uint64(4294967291)  # largest prime below 2**32
+_rng = np.random.RandomState(SEED)
+_A = _rng.randint(1, 2 ** 32 - 5, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 32 - 5, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text):
+    """32-bit hashes of the answer's overlapping SHINGLE_SIZE-word windows."""
+    words = WORD_RE.findall((text or '').lower())
+    if len(words) < MIN_WORDS:
+        return None
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode())
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(text):
+    """MinHash signature (NUM_PERM uint32 values), or None for short answers."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    # a * x stays below 2**64; reducing before adding b keeps the sum there too
+    permuted = ((_A[:, None] * x[None, :]) % PRIME + _B[:, None]) % PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def pack(values):
+    return values.astype('<u4').tobytes()
+
+
+def unpack(data):
+    return np.frombuffer(bytes(data), dtype='<u4')
+
+
+def band_keys(values):
+    """One signed 64-bit key per band; the band index is part of the key."""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(
+            bytes([band]) + pack(values[band * ROWS:(band + 1) * ROWS]), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(first == second))
+
+
+class DuplicateFinder:
+    """
+    Checks a batch of graded quizzes against each other and against every
+    stored answer, then stores the batch's signatures.
+
+    Answers that repeat the same student's earlier answers for the same item
+    (a retake) are not duplicates.
+    """
+
+    def __init__(self):
+        # (verification, question number, signature, band keys)
+        self.entries = []
+
+    def add(self, verification, questions, answers):
+        """Sign the text answers of one graded quiz."""
+        for question in questions:
+            if question['type'] != 'text' or 'min_words' not in question:
+                continue
+            values = signature(answers.get(str(question['id']), ''))
+            if values is not None:
+                self.entries.append((verification, question['id'], values, band_keys(values)))
+
+    def find(self):
+        """
+        Returns:
+            {verification id: sorted ids of verifications with a near-duplicate answer}
+        """
+        keys = list({key for *_, entry_keys in self.entries for key in entry_keys})
+        stored = {}
+        for start in range(0, len(keys), LOOKUP_BATCH):
+            for key, verification_id, question in AnswerBand.objects.filter(
+                key__in=keys[start:start + LOOKUP_BATCH]
+            ).values_list('key', 'verification_id', 'question'):
+                stored.setdefault(key, set()).add((verification_id, question))
+
+        candidates = {pair for pairs in stored.values() for pair in pairs}
+        signatures = {}
+        if candidates:
+            rows = AnswerSignature.objects.filter(
+                verification_id__in={verification_id for verification_id, _ in candidates}
+            ).values_list(
+                'verification_id', 'question', 'signature',
+                'verification__profile_id', 'verification__content_type_id', 'verification__object_id',
+            )
+            for verification_id, question, data, *source in rows:
+                if (verification_id, question) in candidates:
+                    signatures[verification_id, question] = (unpack(data), tuple(source))
+
+        duplicates = {}
+        batch_bands = {}
+        for index, (verification, question, values, entry_keys) in enumerate(self.entries):
+            source = (verification.profile_id, verification.content_type_id, verification.object_id)
+            matches = duplicates.setdefault(verification.id, set())
+
+            for pair in {pair for key in entry_keys for pair in stored.get(key, ())}:
+                other = signatures.get(pair)
+                if other is None or pair[0] == verification.id or other[1] == source:
+                    continue
+                if similarity(values, other[0]) >= SIMILARITY_THRESHOLD:
+                    matches.add(pair[0])
+
+            # Earlier answers of this batch
+            for other_index in {i for key in entry_keys for i in batch_bands.get(key, ())}:
+                other, _, other_values, _ = self.entries[other_index]
+                other_source = (other.profile_id, other.content_type_id, other.object_id)
+                if other.id == verification.id or other_source == source:
+                    continue
+                if similarity(values, other_values) >= SIMILARITY_THRESHOLD:
+                    matches.add(other.id)
+                    duplicates.setdefault(other.id, set()).add(verification.id)
+            for key in entry_keys:
+                batch_bands.setdefault(key, []).append(index)
+
+        return {verification_id: sorted(ids) for verification_id, ids in duplicates.items() if ids}
+
+    def save(self):
+        """Store the batch's signatures and band keys; call after the verifications are saved."""
+        AnswerSignature.objects.bulk_create([
+            AnswerSignature(verification_id=verification.id, question=question, signature=pack(values))
+            for verification, question, values, _ in self.entries
+        ], ignore_conflicts=True)
+        AnswerBand.objects.bulk_create([
+            AnswerBand(verification_id=verification.id, question=question, key=key)
+            for verification, question, _, entry_keys in self.entries
+            for key in entry_keys
+        ], batch_size=1000, ignore_conflicts=True)
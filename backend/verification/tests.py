@@ -1,3 +1,292 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth.models import User
+from django.test import Client, SimpleTestCase, TestCase
+from django.utils import timezone
+
+from profiles.models import ProfileSkill
+from readiness import tests as readiness_tests
+from readiness.models import ReadinessRecompute
+from .grading import QuizGrader
+from .models import VerificationRequest, VerificationCounter, AnswerSignature, AnswerBand
+from .services import CounterService
+from . import similarity
+from .similarity import DuplicateFinder, BANDS
+
+
+def counts(profile):
+    """Non-zero {field: count} of a profile's VerificationCounter."""
+    counter = VerificationCounter.objects.filter(pk=profile.pk).first()
+    if counter is None:
+        return {}
+    return {
+        field.name: getattr(counter, field.name)
+        for field in VerificationCounter._meta.fields
+        if not field.primary_key and getattr(counter, field.name)
+    }
+
+
+def project_quiz(profile, **fields):
+    """A pending quiz on the profile's first project."""
+    project = profile.projects.order_by('id').first()
+    return VerificationRequest.objects.create(
+        profile=profile,
+        content_type=ContentType.objects.get_for_model(project),
+        object_id=project.id,
+        method='self',
+        quiz={'subject': project.title, 'questions': ['project.architecture', 'project.role']},
+        **fields,
+    )
+
+
+RELEVANT_ANSWER = 'The python backend exposes a rest api that the javascript client calls. ' * 4
+
+
+class VerificationCounterTests(TestCase):
+    """The signal-maintained counters match a full recount."""
+
+    @classmethod
+    def setUpTestData(cls):
+        readiness_tests.seed_taxonomy()
+        cls.user, cls.profile = readiness_tests.make_profile('counted', 2)
+
+    def create(self, method='self', status='pending'):
+        return VerificationRequest.objects.create(
+            profile=self.profile,
+            content_type=ContentType.objects.get_for_model(ProfileSkill),
+            object_id=self.profile.profile_skills.first().id,
+            method=method,
+            status=status,
+        )
+
+    def assert_matches_rebuild(self):
+        incremental = counts(self.profile)
+        CounterService.rebuild()
+        self.assertEqual(counts(self.profile), incremental)
+
+    def test_create_status_change_and_delete(self):
+        verification = self.create()
+        self.create('referral')
+        self.assertEqual(counts(self.profile), {'self_pending': 1, 'referral_pending': 1})
+
+        verification.status = 'approved'
+        verification.save()
+        verification.save()
+        self.assertEqual(counts(self.profile), {'self_approved': 1, 'referral_pending': 1})
+
+        VerificationRequest.objects.get(pk=verification.pk).delete()
+        self.assertEqual(counts(self.profile), {'referral_pending': 1})
+        self.assert_matches_rebuild()
+
+    def test_a_quiz_is_only_counted_once(self):
+        skill = self.profile.profile_skills.first()
+        client = Client()
+        client.force_login(self.user)
+        issued = client.post(
+            '/api/verification/self_verification/', {'item_type': 'skill', 'item_id': skill.id},
+            content_type='application/json',
+        ).json()
+        answers = {str(question['id']): 'Intermediate' for question in issued['questions']}
+        submission = {'verification_id': issued['verification_id'], 'answers': answers}
+
+        first = client.post('/api/verification/submit_quiz/', submission, content_type='application/json')
+        second = client.post('/api/verification/submit_quiz/', submission, content_type='application/json')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 404)
+        self.assertEqual(counts(self.profile), {'self_rejected': 1})
+        self.assert_matches_rebuild()
+
+
+class QuizRelevanceTests(TestCase):
+    """Quiz answers only earn full points when they are about the verified item."""
+
+    @classmethod
+    def setUpTestData(cls):
+        readiness_tests.seed_taxonomy()
+        cls.user, cls.profile = readiness_tests.make_profile('quizzed', 2)
+
+    def grade(self, answer):
+        project = self.profile.projects.order_by('id').first()
+        verification = VerificationRequest(
+            profile=self.profile,
+            content_type=ContentType.objects.get_for_model(project),
+            object_id=project.id,
+            method='self',
+            quiz={'subject': project.title, 'questions': ['project.architecture', 'project.role']},
+        )
+        grader = QuizGrader()
+        grader.load_items([verification])
+        questions = grader.questions(verification)
+        return grader.grade(verification, questions, {'1': answer, '2': answer})
+
+    def test_filler_fails_and_relevant_answers_pass(self):
+        self.assertEqual(self.grade('lorem ipsum ' * 25), 40.0)
+        self.assertEqual(self.grade(RELEVANT_ANSWER), 100.0)
+
+
+class GradeQuizzesTests(TestCase):
+    """grade_quizzes answers every submitted id and only grades the caller's pending quizzes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        readiness_tests.seed_taxonomy()
+        cls.user, cls.profile = readiness_tests.make_profile('batched', 1)
+        cls.other_user, cls.other_profile = readiness_tests.make_profile('bystander', 1)
+
+    def test_unknown_expired_and_valid_ids(self):
+        valid = project_quiz(self.profile)
+        expired = project_quiz(self.profile, expires_at=timezone.now() - timedelta(days=1))
+        foreign = project_quiz(self.other_profile)
+        answers = {'1': RELEVANT_ANSWER, '2': RELEVANT_ANSWER}
+        client = Client()
+        client.force_login(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/verification/grade_quizzes/', {'submissions': {
+                '999999': answers, str(expired.id): answers, str(valid.id): answers, str(foreign.id): answers,
+            }}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([result['verification_id'] for result in results], [999999, expired.id, valid.id, foreign.id])
+        self.assertIn('not found', results[0]['error'])
+        self.assertIn('expired', results[1]['error'])
+        self.assertEqual((results[2]['status'], results[2]['score']), ('approved', 100.0))
+        self.assertIn('not found', results[3]['error'])
+
+        statuses = dict(VerificationRequest.objects.values_list('id', 'status'))
+        self.assertEqual(
+            [statuses[expired.id], statuses[valid.id], statuses[foreign.id]], ['expired', 'approved', 'pending']
+        )
+        self.assertTrue(ReadinessRecompute.objects.filter(profile=self.profile).exists())
+        self.assertFalse(ReadinessRecompute.objects.filter(profile=self.other_profile).exists())
+
+
+class DuplicateFinderTests(TestCase):
+    """Stored answer signatures and band keys."""
+
+    @classmethod
+    def setUpTestData(cls):
+        readiness_tests.seed_taxonomy()
+        cls.user, cls.profile = readiness_tests.make_profile('signed', 1)
+
+    def test_saving_a_quiz_twice_stores_its_bands_once(self):
+        verification = VerificationRequest.objects.create(
+            profile=self.profile,
+            content_type=ContentType.objects.get_for_model(ProfileSkill),
+            object_id=self.profile.profile_skills.first().id,
+            method='self',
+        )
+        questions = [{'id': 1, 'type': 'text', 'min_words': 10}]
+        answers = {'1': 'I wrote the python service that imports the nightly sales files and reports failures'}
+        for _ in range(2):
+            finder = DuplicateFinder()
+            finder.add(verification, questions, answers)
+            finder.save()
+
+        self.assertEqual(AnswerSignature.objects.count(), 1)
+        self.assertEqual(AnswerBand.objects.count(), BANDS)
+
+
+class AnswerSimilarityTests(SimpleTestCase):
+    """MinHash signatures find reworded copies and ignore unrelated or short answers."""
+
+    ANSWER = (
+        'I designed the django models and the rest api for the booking service, wrote the celery tasks '
+        'that send reminders, and set up the docker compose stack we used for local development and ci'
+    )
+
+    def test_copies_share_bands_and_unrelated_answers_do_not(self):
+        original = similarity.signature(self.ANSWER)
+        copy = similarity.signature(self.ANSWER.replace('booking', 'reservation'))
+        unrelated = similarity.signature(
+            'Our mobile team shipped a kotlin app that synced offline notes through graphql subscriptions '
+            'and we tracked crash rates on a weekly dashboard with the product manager'
+        )
+
+        self.assertEqual(len(similarity.pack(original)), similarity.NUM_PERM * 4)
+        self.assertGreaterEqual(similarity.similarity(original, copy), similarity.SIMILARITY_THRESHOLD)
+        self.assertTrue(set(similarity.band_keys(original)) & set(similarity.band_keys(copy)))
+        self.assertLess(similarity.similarity(original, unrelated), 0.2)
+        self.assertIsNone(similarity.signature('Twelve months'))
+
+
+class NearDuplicateQuizTests(TestCase):
+    """Passing quizzes that copy another student's answers wait for staff review."""
+
+    @classmethod
+    def setUpTestData(cls):
+        readiness_tests.seed_taxonomy()
+        cls.user, cls.profile = readiness_tests.make_profile('original', 1)
+        cls.copier, cls.copier_profile = readiness_tests.make_profile('copier', 1)
+        cls.staff = User.objects.create_user('reviewer', password='x', is_staff=True)
+
+    def submit(self, user, verification, answer=RELEVANT_ANSWER):
+        client = Client()
+        client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return client.post('/api/verification/submit_quiz/', {
+                'verification_id': verification.id, 'answers': {'1': answer, '2': answer},
+            }, content_type='application/json').json()
+
+    def review(self, verification, approved, user=None):
+        client = Client()
+        client.force_login(user or self.staff)
+        with self.captureOnCommitCallbacks(execute=True):
+            return client.post('/api/verification/review_quiz/', {
+                'verification_id': verification.id, 'approved': approved,
+            }, content_type='application/json')
+
+    def copied_quiz(self):
+        """An approved quiz and a copy of its answers by another student, held for review."""
+        original = project_quiz(self.profile)
+        self.assertEqual(self.submit(self.user, original)['status'], 'approved')
+        copy = project_quiz(self.copier_profile)
+        self.assertEqual(self.submit(self.copier, copy)['status'], 'review')
+        copy.refresh_from_db()
+        self.assertEqual(copy.similar_to, [original.id])
+        return copy
+
+    def test_students_do_not_see_whose_answers_matched(self):
+        copy = self.copied_quiz()
+        client = Client()
+        client.force_login(self.copier)
+
+        listed = client.get('/api/verification/').json()['results']
+        recent = client.get('/api/verification/status/').json()['recent_verifications']
+
+        self.assertEqual([item['id'] for item in listed], [copy.id])
+        self.assertNotIn('similar_to', listed[0])
+        self.assertNotIn('similar_to', recent[0])
+        self.assertEqual(self.review(copy, False).json()['similar_to'], copy.similar_to)
+
+    def test_a_retake_of_the_same_item_is_not_flagged(self):
+        first = project_quiz(self.profile)
+        retake = project_quiz(self.profile)
+
+        self.assertEqual(self.submit(self.user, first)['status'], 'approved')
+        self.assertEqual(self.submit(self.user, retake)['status'], 'approved')
+
+    def test_approving_a_reviewed_quiz(self):
+        copy = self.copied_quiz()
+
+        self.assertEqual(self.review(copy, True, user=self.copier).status_code, 403)
+        response = self.review(copy, True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'approved')
+        copy.refresh_from_db()
+        self.assertEqual((copy.status, float(copy.score)), ('approved', 100.0))
+        self.assertEqual(counts(self.copier_profile), {'self_approved': 1})
+        self.assertEqual(self.review(copy, True).status_code, 404)
+
+    def test_rejecting_a_reviewed_quiz(self):
+        copy = self.copied_quiz()
+
+        response = self.review(copy, False)
+
+        self.assertEqual(response.json()['status'], 'rejected')
+        self.assertEqual(counts(self.copier_profile), {'self_rejected': 1})
+        self.assertTrue(ReadinessRecompute.objects.filter(profile=self.copier_profile).exists())
@@ -4,23 +4,31 @@ Verification API Views
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
 from profiles.models import StudentProfile, ProfileSkill, Experience, Project, Certification
-from .models import VerificationRequest, VerificationMethod, VerificationStatus
+from profiles.signals import deferred_revision_bumps
+from readiness.services import request_recompute, request_recomputes
+from .models import VerificationRequest, VerificationMethod, VerificationStatus, VerificationCounter
 from .serializers import (
     VerificationRequestSerializer,
     SelfVerificationRequestSerializer,
     SelfVerificationResponseSerializer,
     QuizSubmissionSerializer,
+    QuizBatchSubmissionSerializer,
+    QuizReviewSerializer,
     ReferralVerificationRequestSerializer,
     LinkVerificationRequestSerializer,
+    ReferralConfirmationSerializer,
     VerificationStatusSerializer
 )
-from .services import QuizGenerator, QuizEvaluator, ReferralService, LinkVerifier
+from .services import QuizGenerator, ReferralService, LinkVerifier, ConfidenceService
+from .grading import QuizGrader
+from .similarity import DuplicateFinder
 
 
 class VerificationViewSet(viewsets.ModelViewSet):
@@ -30,8 +38,11 @@ class VerificationViewSet(viewsets.ModelViewSet):
     Endpoints:
     - POST /api/verification/self-verification/ - Request self-verification quiz
     - POST /api/verification/submit-quiz/ - Submit quiz answers
+    - POST /api/verification/grade_quizzes/ - Submit many quizzes' answers at once
+    - POST /api/verification/review_quiz/ - Staff approve or reject a quiz held for review
     - POST /api/verification/referral-verification/ - Request referral verification
     - POST /api/verification/link-verification/ - Request link verification
+    - POST /api/verification/confirm_referral/ - Referrer approves or declines (no login)
     - GET /api/verification/status/ - Get verification status summary
     - GET /api/verification/ - List all verifications
     """
@@ -80,17 +91,12 @@ class VerificationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Generate quiz questions
-        if item_type == 'skill':
-            questions = QuizGenerator.generate_skill_quiz(item)
-        elif item_type == 'experience':
-            questions = QuizGenerator.generate_experience_quiz(item)
-        elif item_type == 'project':
-            questions = QuizGenerator.generate_project_quiz(item)
-        else:
+        # Pick quiz questions from the question bank
+        if item_type not in ('skill', 'experience', 'project'):
             return Response({'error': 'Invalid item type'}, status=status.HTTP_400_BAD_REQUEST)
+        quiz, questions = QuizGenerator.issue_quiz(item_type, item)
         
-        # Create verification request
+        # Create verification request with the issued question set
         content_type = ContentType.objects.get_for_model(item)
         verification = VerificationRequest.objects.create(
             profile=profile,
@@ -98,8 +104,11 @@ class VerificationViewSet(viewsets.ModelViewSet):
             object_id=item.id,
             method=VerificationMethod.SELF,
             status=VerificationStatus.PENDING,
+            quiz=quiz,
             expires_at=timezone.now() + timezone.timedelta(hours=1)
         )
+        # A pending verification changes the profile's verification impact
+        request_recompute(profile)
         
         response_data = {
             'verification_id': verification.id,
@@ -129,55 +138,199 @@ class VerificationViewSet(viewsets.ModelViewSet):
         verification_id = serializer.validated_data['verification_id']
         answers = serializer.validated_data['answers']
         
-        # Get verification request
-        try:
-            profile = StudentProfile.objects.get(user=request.user)
-            verification = VerificationRequest.objects.get(
+        # Lock the request so a concurrent submit of the same quiz waits and
+        # then finds it completed, instead of grading and counting it twice
+        with transaction.atomic():
+            verification = VerificationRequest.objects.select_for_update().select_related('profile').filter(
                 id=verification_id,
-                profile=profile,
+                profile__user=request.user,
                 method=VerificationMethod.SELF,
                 status=VerificationStatus.PENDING
-            )
-        except VerificationRequest.DoesNotExist:
-            return Response(
-                {'error': 'Verification request not found or already completed'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Check if expired
-        if verification.expires_at and verification.expires_at < timezone.now():
-            verification.status = VerificationStatus.EXPIRED
+            ).first()
+            if not verification:
+                return Response(
+                    {'error': 'Verification request not found or already completed'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            profile = verification.profile
+            
+            # Check if expired
+            if verification.expires_at and verification.expires_at < timezone.now():
+                verification.status = VerificationStatus.EXPIRED
+                verification.save()
+                request_recompute(profile)
+                return Response(
+                    {'error': 'Verification has expired. Please request a new one.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Questions issued with this request, graded for relevance to the item
+            grader = QuizGrader()
+            grader.load_items([verification])
+            questions = grader.questions(verification)
+            if questions is None:
+                return Response({'error': 'Invalid item type'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Evaluate answers and look for near-duplicates of stored answers
+            score = grader.grade(verification, questions, answers)
+            duplicates = DuplicateFinder()
+            duplicates.add(verification, questions, answers)
+            self._complete_quiz(verification, score, duplicates.find().get(verification.id))
+            
+            # Update verification, its answer signatures and the item's blended confidence together
             verification.save()
-            return Response(
-                {'error': 'Verification has expired. Please request a new one.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            duplicates.save()
+            ConfidenceService.refresh(verification)
+            request_recompute(profile)
         
-        # Retrieve original questions (in production, store these in DB)
-        item = verification.content_object
-        if isinstance(item, ProfileSkill):
-            questions = QuizGenerator.generate_skill_quiz(item)
-        elif isinstance(item, Experience):
-            questions = QuizGenerator.generate_experience_quiz(item)
-        elif isinstance(item, Project):
-            questions = QuizGenerator.generate_project_quiz(item)
-        else:
-            return Response({'error': 'Invalid item type'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self._quiz_result(verification), status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'])
+    def grade_quizzes(self, request):
+        """
+        Grade many quiz submissions at once.
         
-        # Evaluate answers
-        score = QuizEvaluator.evaluate_answers(questions, answers)
+        POST /api/verification/grade_quizzes/
+        Body: {
+            "submissions": {
+                "123": {"1": "answer to question 1", "2": "answer to question 2"},
+                "124": {"1": "..."}
+            }
+        }
         
-        # Update verification
+        Returns one result per submitted verification id, with "error" for
+        ids that are unknown, already completed or expired.
+        """
+        serializer = QuizBatchSubmissionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        submissions = serializer.validated_data['submissions']
+        
+        # One transaction: the requests stay locked until graded (see
+        # submit_quiz), each profile's revision is bumped once
+        with transaction.atomic(), deferred_revision_bumps():
+            verifications = list(VerificationRequest.objects.select_for_update().filter(
+                id__in=submissions,
+                profile__user=request.user,
+                method=VerificationMethod.SELF,
+                status=VerificationStatus.PENDING
+            ).order_by('id'))
+            found = {verification.id: verification for verification in verifications}
+            
+            grader = QuizGrader()
+            grader.load_items(verifications)
+            duplicates = DuplicateFinder()
+            now = timezone.now()
+            results = {}
+            graded = []
+            scores = {}
+            for verification_id in submissions:
+                verification = found.get(verification_id)
+                if verification is None:
+                    results[verification_id] = {'error': 'Verification request not found or already completed'}
+                    continue
+                if verification.expires_at and verification.expires_at < now:
+                    verification.status = VerificationStatus.EXPIRED
+                    graded.append(verification)
+                    results[verification_id] = {'error': 'Verification has expired. Please request a new one.'}
+                    continue
+                questions = grader.questions(verification)
+                if questions is None:
+                    results[verification_id] = {'error': 'Invalid item type'}
+                    continue
+                scores[verification_id] = grader.grade(verification, questions, submissions[verification_id])
+                duplicates.add(verification, questions, submissions[verification_id])
+                graded.append(verification)
+            
+            # Near-duplicates among the batch and against stored answers
+            similar = duplicates.find()
+            for verification_id, score in scores.items():
+                verification = found[verification_id]
+                self._complete_quiz(verification, score, similar.get(verification_id))
+                results[verification_id] = self._quiz_result(verification)
+            
+            # Each item's confidence is blended once
+            for verification in graded:
+                verification.save()
+            duplicates.save()
+            for content_type_id, object_id in {
+                (verification.content_type_id, verification.object_id)
+                for verification in graded if verification.status == VerificationStatus.APPROVED
+            }:
+                ConfidenceService.refresh_item(ContentType.objects.get_for_id(content_type_id), object_id)
+            request_recomputes(verification.profile_id for verification in graded)
+        
+        return Response({
+            'results': [
+                {'verification_id': verification_id, **results[verification_id]} for verification_id in submissions
+            ]
+        }, status=status.HTTP_200_OK)
+    
+    @staticmethod
+    def _complete_quiz(verification, score, similar_to=None):
+        """Record a quiz score; a pass with near-duplicate answers waits for manual review."""
         verification.score = score
-        verification.status = VerificationStatus.APPROVED if score >= 60 else VerificationStatus.REJECTED
+        if score < 60:
+            verification.status = VerificationStatus.REJECTED
+        elif similar_to:
+            verification.status = VerificationStatus.REVIEW
+            verification.similar_to = similar_to
+        else:
+            verification.status = VerificationStatus.APPROVED
         verification.completed_at = timezone.now()
-        verification.save()
+    
+    QUIZ_MESSAGES = {
+        VerificationStatus.APPROVED: 'Quiz passed! Verification approved.',
+        VerificationStatus.REVIEW: 'Your answers closely match another submission and will be reviewed manually.',
+        VerificationStatus.REJECTED: 'Score too low. Please try again.',
+    }
+    
+    @staticmethod
+    def _quiz_result(verification):
+        return {
+            'verification_id': verification.id,
+            'score': float(verification.score),
+            'status': verification.status,
+            'message': VerificationViewSet.QUIZ_MESSAGES[verification.status]
+        }
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def review_quiz(self, request):
+        """
+        Approve or reject a quiz held for manual review (staff only).
+        
+        POST /api/verification/review_quiz/
+        Body: {
+            "verification_id": 123,
+            "approved": true
+        }
+        """
+        serializer = QuizReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        approved = serializer.validated_data['approved']
+        
+        with transaction.atomic():
+            verification = VerificationRequest.objects.select_for_update().filter(
+                id=serializer.validated_data['verification_id'],
+                method=VerificationMethod.SELF,
+                status=VerificationStatus.REVIEW
+            ).first()
+            if not verification:
+                return Response(
+                    {'error': 'No quiz awaiting review with this id'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            # An approved quiz keeps the score it was graded with
+            verification.status = VerificationStatus.APPROVED if approved else VerificationStatus.REJECTED
+            verification.save()
+            ConfidenceService.refresh(verification)
+        request_recompute(verification.profile)
         
         return Response({
             'verification_id': verification.id,
-            'score': float(score),
             'status': verification.status,
-            'message': 'Quiz passed! Verification approved.' if score >= 60 else 'Score too low. Please try again.'
+            'similar_to': verification.similar_to
         }, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['post'])
@@ -231,6 +384,7 @@ class VerificationViewSet(viewsets.ModelViewSet):
             referral_name=referral_name,
             referral_email=referral_email
         )
+        request_recompute(profile)
         
         # Send email
         email_sent = ReferralService.send_referral_request(verification, custom_message)
@@ -289,18 +443,21 @@ class VerificationViewSet(viewsets.ModelViewSet):
         else:
             score = LinkVerifier.verify_portfolio_link(evidence_url)
         
-        # Create verification request
+        # Create verification request and update the item's blended confidence
         content_type = ContentType.objects.get_for_model(item)
-        verification = VerificationRequest.objects.create(
-            profile=profile,
-            content_type=content_type,
-            object_id=item.id,
-            method=VerificationMethod.LINK,
-            status=VerificationStatus.APPROVED if score >= 50 else VerificationStatus.PENDING,
-            evidence_url=evidence_url,
-            score=score,
-            completed_at=timezone.now() if score >= 50 else None
-        )
+        with transaction.atomic():
+            verification = VerificationRequest.objects.create(
+                profile=profile,
+                content_type=content_type,
+                object_id=item.id,
+                method=VerificationMethod.LINK,
+                status=VerificationStatus.APPROVED if score >= 50 else VerificationStatus.PENDING,
+                evidence_url=evidence_url,
+                score=score,
+                completed_at=timezone.now() if score >= 50 else None
+            )
+            ConfidenceService.refresh(verification)
+        request_recompute(profile)
         
         return Response({
             'verification_id': verification.id,
@@ -309,6 +466,58 @@ class VerificationViewSet(viewsets.ModelViewSet):
             'message': 'Link verified successfully!' if score >= 50 else 'Link verification pending review.'
         }, status=status.HTTP_201_CREATED)
     
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    def confirm_referral(self, request):
+        """
+        Record the referrer's answer to a referral verification email.
+        
+        POST /api/verification/confirm_referral/
+        Body: {
+            "token": "token from the emailed link",
+            "approved": true
+        }
+        """
+        serializer = ReferralConfirmationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        approved = serializer.validated_data['approved']
+        
+        with transaction.atomic():
+            verification = VerificationRequest.objects.select_for_update().filter(
+                token=serializer.validated_data['token'],
+                method=VerificationMethod.REFERRAL,
+                status=VerificationStatus.PENDING
+            ).first()
+            if not verification:
+                return Response(
+                    {'error': 'Verification request not found or already completed'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            if verification.expires_at and verification.expires_at < timezone.now():
+                verification.status = VerificationStatus.EXPIRED
+                verification.save()
+                request_recompute(verification.profile)
+                return Response(
+                    {'error': 'This verification link has expired.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # A referral is all or nothing: a confirmation scores 100
+            verification.status = VerificationStatus.APPROVED if approved else VerificationStatus.REJECTED
+            verification.score = 100 if approved else 0
+            verification.completed_at = timezone.now()
+            verification.token = ''
+            verification.save()
+            ConfidenceService.refresh(verification)
+        request_recompute(verification.profile)
+        
+        return Response({
+            'verification_id': verification.id,
+            'status': verification.status,
+            'message': 'Thank you for confirming.' if approved else 'Thank you, your answer was recorded.'
+        }, status=status.HTTP_200_OK)
+    
     @action(detail=False, methods=['get'])
     def status(self, request):
         """
@@ -324,27 +533,33 @@ class VerificationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        verifications = VerificationRequest.objects.filter(profile=profile)
-        
-        # Calculate summary
-        total = verifications.count()
-        pending = verifications.filter(status=VerificationStatus.PENDING).count()
-        approved = verifications.filter(status=VerificationStatus.APPROVED).count()
-        rejected = verifications.filter(status=VerificationStatus.REJECTED).count()
+        # Calculate summary from the denormalized counters (one lookup)
+        counter = (
+            VerificationCounter.objects.filter(pk=profile.pk).first()
+            or VerificationCounter(profile=profile)
+        )
+        total = counter.count()
+        pending = counter.count(status=VerificationStatus.PENDING)
+        approved = counter.count(status=VerificationStatus.APPROVED)
+        rejected = counter.count(status=VerificationStatus.REJECTED)
+        in_review = counter.count(status=VerificationStatus.REVIEW)
         
         by_method = {
-            'self': verifications.filter(method=VerificationMethod.SELF).count(),
-            'referral': verifications.filter(method=VerificationMethod.REFERRAL).count(),
-            'link': verifications.filter(method=VerificationMethod.LINK).count(),
+            'self': counter.count(method=VerificationMethod.SELF),
+            'referral': counter.count(method=VerificationMethod.REFERRAL),
+            'link': counter.count(method=VerificationMethod.LINK),
         }
         
-        recent = verifications.order_by('-created_at')[:5]
+        recent = VerificationRequest.objects.filter(profile=profile).select_related(
+            'content_type'
+        ).order_by('-created_at')[:5]
         
         return Response({
             'total_verifications': total,
             'pending': pending,
             'approved': approved,
             'rejected': rejected,
+            'in_review': in_review,
             'by_method': by_method,
             'recent_verifications': VerificationRequestSerializer(recent, many=True).data
         }, status=status.HTTP_200_OK)